@@ -1,23 +1,140 @@
+import re
+import time
+
+
+class RunningConfig(object):
+    """ Index of FRR running configuration: route-maps, prefix-lists, community-lists and neighbor bindings """
+    RE_ROUTE_MAP = re.compile(r'^route-map (\S+) (permit|deny) (\d+)$')
+    RE_PREFIX_LIST = re.compile(r'^(ip|ipv6) prefix-list (\S+) seq (\d+) (.*)$')
+    RE_COMMUNITY_LIST = re.compile(r'^bgp community-list (standard|expanded) (\S+) (.*)$')
+    RE_PEER_GROUP = re.compile(r'^\s*neighbor\s+(\S+)\s+peer-group\s*$')
+    RE_NEIGHBOR_ROUTE_MAP = re.compile(r'^\s*neighbor (\S+) route-map (\S+) (in|out)$')
+
+    def __init__(self, lines):
+        """
+        Constructor
+        :param lines: running configuration lines without comments
+        """
+        self.route_maps = {}           # name -> { seq: { 'action': action, 'lines': [lines of the entry] } }
+        self.prefix_lists = {}         # (family, name) -> { seq: rule }
+        self.community_lists = {}      # (type, name) -> [rules]
+        self.peer_groups = []          # peer-group names in order of appearance
+        self.neighbor_route_maps = {}  # (neighbor, direction) -> [route-map names]
+        self.bound_route_maps = {'in': set(), 'out': set()}
+        self.parse(lines)
+
+    def parse(self, lines):
+        entry_lines = None
+        for line in lines:
+            s_line = line.strip()
+            if s_line == '':
+                continue
+            if not line[0].isspace():
+                entry_lines = None
+                m = self.RE_ROUTE_MAP.match(s_line)
+                if m:
+                    entry_lines = []
+                    entry = {'action': m.group(2), 'lines': entry_lines}
+                    self.route_maps.setdefault(m.group(1), {})[int(m.group(3))] = entry
+                    continue
+                m = self.RE_PREFIX_LIST.match(s_line)
+                if m:
+                    self.prefix_lists.setdefault((m.group(1), m.group(2)), {})[int(m.group(3))] = m.group(4).strip()
+                    continue
+                m = self.RE_COMMUNITY_LIST.match(s_line)
+                if m:
+                    self.community_lists.setdefault((m.group(1), m.group(2)), []).append(m.group(3))
+                    continue
+            elif entry_lines is not None:
+                entry_lines.append(s_line)
+                continue
+            m = self.RE_PEER_GROUP.match(line)
+            if m:
+                self.peer_groups.append(m.group(1))
+                continue
+            m = self.RE_NEIGHBOR_ROUTE_MAP.match(line)
+            if m:
+                self.neighbor_route_maps.setdefault((m.group(1), m.group(3)), []).append(m.group(2))
+                self.bound_route_maps[m.group(3)].add(m.group(2))
+
+    def get_route_map(self, name):
+        """
+        Get entries of a route-map
+        :param name: route-map name
+        :return: a dictionary: key - sequence number, value - dictionary with 'action' and 'lines' of the entry
+        """
+        return self.route_maps.get(name, {})
+
+    def get_prefix_list(self, family, name):
+        """
+        Get rules of a prefix-list
+        :param family: 'ip' or 'ipv6'
+        :param name: prefix-list name
+        :return: a dictionary: key - sequence number, value - rule following the sequence number
+        """
+        return self.prefix_lists.get((family, name), {})
+
+    def get_community_list(self, name, list_type='standard'):
+        """
+        Get rules of a community-list
+        :param name: community-list name
+        :param list_type: 'standard' or 'expanded'
+        :return: a list of rules following the community-list name
+        """
+        return self.community_lists.get((list_type, name), [])
+
+    def get_neighbor_route_map(self, neighbor, direction):
+        """
+        Get the first route-map bound to a neighbor or a peer-group
+        :param neighbor: neighbor address or peer-group name
+        :param direction: 'in' or 'out'
+        :return: route-map name, None if no route-map is bound
+        """
+        route_maps = self.neighbor_route_maps.get((neighbor, direction))
+        return route_maps[0] if route_maps else None
+
+
 class ConfigMgr(object):
     """ The class represents frr configuration """
+    MAX_CONFIG_AGE = 1.0  # seconds the running config read from FRR is reused for. FRR could be changed by others
+
     def __init__(self, frr):
         self.frr = frr
         self.current_config = None
         self.current_config_raw = None
+        self.current_index = None
+        self.current_config_time = 0.0
         self.changes = ""
+        self.section = None
+        self.pushed_once = {}
         self.peer_groups_to_restart = []
+        self.generation = 0
 
     def reset(self):
         """ Reset stored config """
-        self.current_config = None
-        self.current_config_raw = None
+        self.invalidate()
         self.changes = ""
+        self.section = None
+        self.pushed_once = {}
         self.peer_groups_to_restart = []
 
-    def update(self):
-        """ Read current config from FRR """
+    def invalidate(self):
+        """ Drop stored running config, so the next update() reads it from FRR again """
         self.current_config = None
         self.current_config_raw = None
+        self.current_index = None
+        self.generation += 1
+
+    def update(self):
+        """
+        Read current config from FRR. The config read last time is reused until
+        the next commit(), invalidate() or for MAX_CONFIG_AGE seconds at most,
+        so changes made outside of bgpcfgd (vtysh, frrcfgd, TSA scripts) are seen
+        """
+        if self.current_config_raw is not None:
+            if time.monotonic() - self.current_config_time < self.MAX_CONFIG_AGE:
+                return
+            self.invalidate()
         out = self.frr.get_config()
         text = []
         for line in out.split('\n'):
@@ -27,6 +144,7 @@ class ConfigMgr(object):
         text += ["     "]  # Add empty line to have something to work on, if there is no text
         self.current_config_raw = text
         self.current_config = self.to_canonical(out)  # FIXME: use text as an input
+        self.current_config_time = time.monotonic()
 
     def push_list(self, cmdlist):
         """
@@ -34,6 +152,7 @@ class ConfigMgr(object):
         :param cmdlist: configuration change for FRR. Type: List of Strings
         """
         self.changes += "\n".join(cmdlist) + "\n"
+        self.section = None
 
     def push(self, cmd):
         """
@@ -41,8 +160,34 @@ class ConfigMgr(object):
         :param cmd: configuration change for FRR. Type: String
         """
         self.changes += cmd + "\n"
+        self.section = None
         return True
 
+    def push_section(self, section, cmd):
+        """
+        Prepare new changes for FRR inside of a configuration section, e.g. 'router bgp 65100'.
+        Consecutive changes for the same section are pushed under one section header
+        :param section: configuration section header. Type: String
+        :param cmd: configuration change inside of the section. Type: String
+        """
+        if self.section != section:
+            self.changes += section + "\n"
+            self.section = section
+        self.changes += cmd + "\n"
+        return True
+
+    def push_once(self, key, cmd):
+        """
+        Prepare new changes for FRR, unless they are the changes last prepared for the same key in this commit
+        :param key: what the changes configure, e.g. a peer-group. Type: hashable
+        :param cmd: configuration change for FRR. Type: String
+        :return: True if the changes were added, False if they were already prepared
+        """
+        if self.pushed_once.get(key) == cmd:
+            return False
+        self.pushed_once[key] = cmd
+        return self.push(cmd)
+
     def restart_peer_groups(self, peer_groups):
         """
         Schedule peer_groups for restart on commit
@@ -56,6 +201,8 @@ class ConfigMgr(object):
         :return: True if change was applied successfully, False otherwise
         """
         if self.changes.strip() == "":
+            # the next events could follow changes made outside of bgpcfgd
+            self.invalidate()
             return True
         rc_write = self.frr.write(self.changes)
         rc_restart = self.frr.restart_peer_groups(self.peer_groups_to_restart)
@@ -65,6 +212,12 @@ class ConfigMgr(object):
     def get_text(self):
         return self.current_config_raw
 
+    def get_index(self):
+        """ Get index of the running config read by update() """
+        if self.current_index is None:
+            self.current_index = RunningConfig(self.current_config_raw or [])
+        return self.current_index
+
     @staticmethod
     def to_canonical(raw_config):
         """
@@ -9,6 +9,9 @@ class Directory(object):
     def __init__(self):
         self.data = defaultdict(dict)  # storage. A key is a slot name, a value is a dictionary with data
         self.notify = defaultdict(lambda: defaultdict(list))  # registered callbacks: slot -> path -> handlers[]
+        # registered paths indexed by their first key: slot -> key -> [(subscription order, path, path keys)]
+        # the paths of the whole slot are indexed with key ''
+        self.notify_index = defaultdict(lambda: defaultdict(list))
 
     @staticmethod
     def get_slot_name(db, table):
@@ -31,8 +34,17 @@ class Directory(object):
             return False, None
         elif path == '':
             return True, self.data[slot]
-        d = self.data[slot]
-        for p in path.split("/"):
+        return self.keys_traverse(self.data[slot], path.split("/"))
+
+    @staticmethod
+    def keys_traverse(d, keys):
+        """
+        Traverse a list of keys in a dictionary
+        :param d: dictionary to traverse
+        :param keys: list of keys
+        :return: a pair: True if the keys were found, object if it was found
+        """
+        for p in keys:
             if p not in d:
                 return False, None
             d = d[p]
@@ -71,9 +83,11 @@ class Directory(object):
         """
         slot = self.get_slot_name(db, table)
         self.data[slot][key] = value
-        if slot in self.notify:
-            for path in self.notify[slot].keys():
-                if self.path_exist(db, table, path):
+        if slot in self.notify_index:
+            # only the paths below the key and the paths of the whole slot could be changed
+            index = self.notify_index[slot]
+            for _, path, keys in sorted(index.get(key, []) + index.get('', [])):
+                if self.keys_traverse(self.data[slot], keys)[0]:
                     for handler in self.notify[slot][path]:
                         handler()
 
@@ -156,4 +170,16 @@ class Directory(object):
         """
         for db, table, path in deps:
             slot = self.get_slot_name(db, table)
-            self.notify[slot][path].append(handler)
\ No newline at end of file
+            if path not in self.notify[slot]:
+                keys = path.split("/") if path != '' else []
+                first_key = keys[0] if keys else ''
+                self.notify_index[slot][first_key].append((len(self.notify[slot]), path, keys))
+            self.notify[slot][path].append(handler)
+
+    def missing_deps(self, deps):
+        """
+        Find dependencies which are not available in the storage
+        :param deps: list of dependencies
+        :return: list of missing dependencies
+        """
+        return [(db, table, path) for db, table, path in deps if not self.path_exist(db, table, path)]
\ No newline at end of file
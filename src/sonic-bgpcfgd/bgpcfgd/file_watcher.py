@@ -0,0 +1,104 @@
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+
+
+class FileWatcher(object):
+    """ Watch directories for file changes with inotify """
+    IN_MODIFY = 0x00000002
+    IN_ATTRIB = 0x00000004
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    IN_NONBLOCK = 0o4000
+    IN_CLOEXEC = 0o2000000
+    DEFAULT_MASK = IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_DELETE
+    EVENT_HEADER = struct.Struct('iIII')  # struct inotify_event: wd, mask, cookie, len
+
+    libc = None
+
+    def __init__(self, paths, mask=DEFAULT_MASK):
+        """
+        Constructor. Raises OSError if inotify can't be used
+        :param paths: list of directories to watch
+        :param mask: inotify events to watch
+        """
+        libc = self.get_libc()
+        self.fd = libc.inotify_init1(self.IN_NONBLOCK | self.IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.watches = {}  # watch descriptor -> directory
+        try:
+            for path in paths:
+                wd = libc.inotify_add_watch(self.fd, path.encode('utf-8'), mask)
+                if wd < 0:
+                    errno = ctypes.get_errno()
+                    raise OSError(errno, "inotify_add_watch failed: %s" % os.strerror(errno), path)
+                self.watches[wd] = path
+        except OSError:
+            self.close()
+            raise
+
+    @classmethod
+    def get_libc(cls):
+        if cls.libc is None:
+            libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+            if not hasattr(libc, 'inotify_init1'):
+                raise OSError("inotify isn't supported")
+            cls.libc = libc
+        return cls.libc
+
+    def fileno(self):
+        return self.fd
+
+    def close(self):
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+    def read_events(self):
+        """
+        Read pending events without blocking
+        :return: list of tuples (directory, file name, event mask)
+        """
+        events = []
+        while True:
+            try:
+                buf = os.read(self.fd, 65536)
+            except BlockingIOError:
+                break
+            offset = 0
+            while offset < len(buf):
+                wd, mask, _, name_len = self.EVENT_HEADER.unpack_from(buf, offset)
+                offset += self.EVENT_HEADER.size
+                name = buf[offset:offset + name_len].rstrip(b'\0').decode('utf-8', 'replace')
+                offset += name_len
+                events.append((self.watches.get(wd), name, mask))
+        return events
+
+    def wait(self, timeout):
+        """
+        Wait for events
+        :param timeout: maximum time to wait in seconds
+        :return: list of tuples (directory, file name, event mask). Empty list on timeout
+        """
+        readable, _, _ = select.select([self.fd], [], [], max(timeout, 0))
+        if not readable:
+            return []
+        return self.read_events()
+
+
+def create_watcher(paths, mask=FileWatcher.DEFAULT_MASK):
+    """
+    Create a watcher of the directories
+    :param paths: list of directories to watch
+    :param mask: inotify events to watch
+    :return: FileWatcher object, None if the directories can't be watched
+    """
+    try:
+        return FileWatcher(paths, mask)
+    except (OSError, AttributeError):
+        return None
@@ -1,23 +1,111 @@
 import os
+import re
 import datetime
+import socket
+import threading
 import time
 import tempfile
 
-from bgpcfgd.log import log_err, log_info, log_warn, log_crit
+from bgpcfgd.log import log_debug, log_err, log_info, log_warn, log_crit
+from .file_watcher import FileWatcher, create_watcher
 from .vars import g_debug
 from .utils import run_command
 
 
+class VtyClient(object):
+    """ Persistent connection to the vty unix socket of a FRR daemon """
+    def __init__(self, daemon, path, timeout):
+        """
+        Constructor
+        :param daemon: name of the FRR daemon
+        :param path: path to the daemon's vty socket
+        :param timeout: socket timeout in seconds
+        """
+        self.daemon = daemon
+        self.path = path
+        self.timeout = timeout
+        self.sock = None
+
+    def connect(self):
+        """ Open the connection and enter the enable node """
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        try:
+            sock.connect(self.path)
+        except (socket.error, OSError):
+            sock.close()
+            raise
+        self.sock = sock
+        ret_code, out = self.execute("enable")
+        if ret_code != 0:
+            self.close()
+            raise socket.error("can't enable vty of '%s': rc=%d out='%s'" % (self.daemon, ret_code, out))
+
+    def close(self):
+        """ Close the connection. It will be opened again by the next command """
+        if self.sock is not None:
+            self.sock.close()
+            self.sock = None
+
+    def execute(self, command):
+        """
+        Execute the command in the current node of the daemon
+        :param command: command to execute
+        :return: Tuple: return code of the command, output of the command
+        """
+        if self.sock is None:
+            self.connect()
+        try:
+            self.sock.sendall(command.encode('utf-8') + b'\0')
+            return self.read_reply()
+        except (socket.error, OSError):
+            self.close()
+            raise
+
+    def read_reply(self):
+        """ Read the command output, which is terminated by three zero bytes and the return code """
+        reply = bytearray()
+        while len(reply) < 4 or reply[-4:-1] != b'\0\0\0':
+            data = self.sock.recv(16384)
+            if not data:
+                raise socket.error("vty connection to '%s' was closed" % self.daemon)
+            reply += data
+        return reply[-1], reply[:-4].decode('utf-8', 'replace')
+
+
 class FRR(object):
     """Proxy object with FRR"""
+    VTY_SOCKET_PATH = '/run/frr/%s.vty'
+    VTY_TIMEOUT = 30  # seconds
+    VTY_WAIT_INTERVAL = 1.0  # seconds between checks of the vty sockets without inotify events
+    RUNNING_CONFIG_DAEMON = 'bgpd'
+    # Daemons receiving a top-level configuration command and the lines below it.
+    # Every line has to be accepted by at least one of the daemons, the same way as vtysh
+    # sends a command to all daemons which implement it
+    CONFIG_DAEMONS = [
+        (re.compile(r'(no )?router bgp\b'), ['bgpd']),
+        (re.compile(r'(no )?bgp (as-path access-list|community-list|extcommunity-list|large-community-list)\b'), ['bgpd']),
+        (re.compile(r'(no )?(ip|ipv6) prefix-list\b'), ['bgpd', 'zebra']),
+        (re.compile(r'(no )?route-map\b'), ['bgpd', 'zebra']),
+        (re.compile(r'(no )?(ip|ipv6) (protocol|nht)\b'), ['zebra']),
+        (re.compile(r'(no )?(ip|ipv6) route\b'), ['staticd']),
+        (re.compile(r'(no )?vrf\b'), ['zebra', 'staticd']),
+    ]
+
     def __init__(self, daemons):
         self.daemons = daemons
+        self.vty_clients = {}
+        self.lock = threading.Lock()
 
     def wait_for_daemons(self, seconds):
         """
         Wait until FRR daemons are ready for requests
         :param seconds: number of seconds to wait, until raise an error
         """
+        vty_dir = os.path.dirname(self.VTY_SOCKET_PATH)
+        if os.path.isdir(vty_dir):
+            self.wait_for_vty_sockets(vty_dir, seconds)
+            return
         stop_time = datetime.datetime.now() + datetime.timedelta(seconds=seconds)
         log_info("Start waiting for FRR daemons: %s" % str(datetime.datetime.now()))
         while datetime.datetime.now() < stop_time:
@@ -30,16 +118,100 @@ class FRR(object):
             time.sleep(0.1)  # sleep 100 ms
         raise RuntimeError("FRR daemons hasn't been started in %d seconds" % seconds)
 
-    @staticmethod
-    def get_config():
-        ret_code, out, err = run_command(["vtysh", "-c", "show running-config"])
+    def wait_for_vty_sockets(self, vty_dir, seconds):
+        """
+        Wait until vty sockets of all FRR daemons accept connections.
+        The vty socket directory is watched with inotify, so the daemons are checked again as soon as
+        their sockets are created. They are checked at least every VTY_WAIT_INTERVAL seconds, as a socket
+        could be created before the daemon listens to it
+        :param vty_dir: directory of the vty sockets
+        :param seconds: number of seconds to wait, until raise an error
+        """
+        stop_time = time.time() + seconds
+        log_info("Start waiting for FRR daemons: %s" % str(datetime.datetime.now()))
+        watcher = create_watcher([vty_dir], FileWatcher.IN_CREATE | FileWatcher.IN_MOVED_TO)
+        try:
+            while True:
+                with self.lock:
+                    missing = [daemon for daemon in self.daemons if self.get_vty(daemon) is None]
+                if not missing:
+                    log_info("All required daemons accept vty connections: %s" % str(datetime.datetime.now()))
+                    return
+                timeout = min(stop_time - time.time(), self.VTY_WAIT_INTERVAL)
+                if timeout <= 0:
+                    break
+                log_debug("Waiting for FRR daemons: %s" % str(missing))
+                if watcher is not None:
+                    watcher.wait(timeout)
+                else:
+                    time.sleep(min(timeout, 0.1))
+        finally:
+            if watcher is not None:
+                watcher.close()
+        raise RuntimeError("FRR daemons hasn't been started in %d seconds" % seconds)
+
+    def get_vty(self, daemon):
+        """
+        Get the connection to the daemon's vty socket
+        :param daemon: name of the FRR daemon
+        :return: connected VtyClient, or None if the daemon can't be reached through its vty socket
+        """
+        if daemon not in self.daemons:
+            return None
+        vty = self.vty_clients.get(daemon)
+        if vty is None:
+            vty = VtyClient(daemon, self.VTY_SOCKET_PATH % daemon, self.VTY_TIMEOUT)
+            self.vty_clients[daemon] = vty
+        if vty.sock is None:
+            try:
+                vty.connect()
+            except (socket.error, OSError) as e:
+                log_debug("Can't connect to vty socket of '%s': %s. Fall back to vtysh" % (daemon, str(e)))
+                return None
+        return vty
+
+    def vty_command(self, daemon, command):
+        """
+        Execute a command in the enable node of the daemon. The command is retried once,
+        if the persistent connection was broken
+        :param daemon: name of the FRR daemon
+        :param command: command to execute
+        :return: Tuple: return code, output. None if the daemon can't be reached through its vty socket
+        """
+        for _ in range(2):
+            vty = self.get_vty(daemon)
+            if vty is None:
+                return None
+            try:
+                return vty.execute(command)
+            except (socket.error, OSError) as e:
+                log_warn("vty connection to '%s' failed: %s" % (daemon, str(e)))
+        return None
+
+    def close(self):
+        """ Close all vty connections """
+        with self.lock:
+            for vty in self.vty_clients.values():
+                vty.close()
+
+    def get_config(self):
+        with self.lock:
+            res = self.vty_command(self.RUNNING_CONFIG_DAEMON, "show running-config")
+        if res is not None:
+            ret_code, out = res
+            err = ""
+        else:
+            ret_code, out, err = run_command(["vtysh", "-c", "show running-config"])
         if ret_code != 0:
             log_crit("can't update running config: rc=%d out='%s' err='%s'" % (ret_code, out, err))
             return ""
         return out
 
-    @staticmethod
-    def write(config_text):
+    def write(self, config_text):
+        with self.lock:
+            res = self.write_vty(config_text)
+        if res is not None:
+            return res
         fd, tmp_filename = tempfile.mkstemp(dir='/tmp')
         os.close(fd)
         with open(tmp_filename, 'w') as fp:
@@ -55,14 +227,95 @@ class FRR(object):
         return ret_code == 0
 
     @staticmethod
-    def restart_peer_groups(peer_groups):
+    def split_config(config_text):
+        """
+        Split configuration text into blocks of a top-level command and the lines below it
+        :param config_text: configuration text
+        :return: list of tuples (list of daemons, list of lines), None if any top-level command is unknown.
+                 'end', which leaves the configuration mode, is returned as a block of its own with None daemons
+        """
+        blocks = []
+        for line in config_text.split('\n'):
+            s_line = line.strip()
+            if s_line == '' or s_line.startswith('!'):
+                continue
+            if s_line == 'end':
+                blocks.append((None, [s_line]))
+                continue
+            if line[0] != ' ' and s_line != 'exit':
+                for regex, daemons in FRR.CONFIG_DAEMONS:
+                    if regex.match(s_line):
+                        blocks.append((daemons, []))
+                        break
+                else:
+                    return None
+            if not blocks or blocks[-1][0] is None:
+                return None
+            blocks[-1][1].append(s_line)
+        return blocks
+
+    def write_vty(self, config_text):
+        """
+        Push configuration text through the vty sockets of the daemons
+        :param config_text: configuration text
+        :return: True if every line was applied successfully, False otherwise.
+                 None if the text can't be pushed through the vty sockets
+        """
+        blocks = self.split_config(config_text)
+        if blocks is None:
+            return None
+        vtys = {}
+        for daemons, _ in blocks:
+            for daemon in daemons or []:
+                if daemon not in vtys:
+                    vtys[daemon] = self.get_vty(daemon)
+                    if vtys[daemon] is None:
+                        return None
+        res = True
+        in_config = []
+        try:
+            for daemons, lines in blocks:
+                if daemons is None:
+                    # the daemons leave the configuration mode, the following blocks enter it again
+                    for daemon in in_config:
+                        vtys[daemon].execute("end")
+                    in_config = []
+                    continue
+                for daemon in daemons:
+                    if daemon not in in_config:
+                        vtys[daemon].execute("configure terminal")
+                        in_config.append(daemon)
+                for line in lines:
+                    replies = [(daemon, vtys[daemon].execute(line)) for daemon in daemons]
+                    if all(ret_code != 0 for _, (ret_code, _) in replies):
+                        res = False
+                        for daemon, (ret_code, out) in replies:
+                            err_tuple = line, daemon, ret_code, out
+                            log_err("ConfigMgr::commit(): can't push configuration line '%s' to '%s', rc='%d', output='%s'" % err_tuple)
+            for daemon in in_config:
+                vtys[daemon].execute("end")
+        except (socket.error, OSError) as e:
+            log_err("ConfigMgr::commit(): vty connection failed while pushing configuration: %s" % str(e))
+            for vty in vtys.values():
+                vty.close()
+            return False
+        return res
+
+    def restart_peer_groups(self, peer_groups):
         """ Restart peer-groups which support BBR
         :param peer_groups: List of peer_groups to restart
         :return: True if restart of all peer-groups was successful, False otherwise
         """
         res = True
         for peer_group in sorted(peer_groups):
-            rc, out, err = run_command(["vtysh", "-c", "clear bgp peer-group %s soft in" % peer_group])
+            command = "clear bgp peer-group %s soft in" % peer_group
+            with self.lock:
+                vty_res = self.vty_command("bgpd", command)
+            if vty_res is not None:
+                rc, out = vty_res
+                err = ""
+            else:
+                rc, out, err = run_command(["vtysh", "-c", command])
             if rc != 0:
                 log_value = peer_group, rc, out, err
                 log_crit("Can't restart bgp peer-group '%s'. rc='%d', out='%s', err='%s'" % log_value)
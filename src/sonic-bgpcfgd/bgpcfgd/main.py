@@ -6,7 +6,7 @@ import threading
 import traceback
 
 from swsscommon import swsscommon
-from sonic_py_common import device_info
+from sonic_py_common import device_info, template_env
 
 from .config import ConfigMgr
 from .directory import Directory
@@ -40,7 +40,7 @@ def do_work():
     common_objs = {
         'directory': Directory(),
         'cfg_mgr':   ConfigMgr(frr),
-        'tf':        TemplateFabric(),
+        'tf':        TemplateFabric(cache_dir=template_env.BYTECODE_CACHE_DIR),
         'constants': read_constants(),
     }
     managers = [
@@ -80,7 +80,10 @@ def do_work():
     if device_info.is_chassis():
         managers.append(ChassisAppDbMgr(common_objs, "CHASSIS_APP_DB", "BGP_DEVICE_GLOBAL"))
 
-    runner = Runner(common_objs['cfg_mgr'])
+    coalesce = common_objs['constants'].get('bgp', {}).get('coalesce', {})
+    runner = Runner(common_objs['cfg_mgr'],
+                    coalesce_window=coalesce.get('window_ms', Runner.COALESCE_WINDOW),
+                    coalesce_max_events=coalesce.get('max_events', Runner.COALESCE_MAX_EVENTS))
     for mgr in managers:
         runner.add_manager(mgr)
     runner.run()
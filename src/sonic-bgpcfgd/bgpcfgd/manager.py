@@ -1,3 +1,4 @@
+from collections import OrderedDict
 from swsscommon import swsscommon
 
 from .log import log_debug, log_err
@@ -19,8 +20,10 @@ class Manager(object):
         self.deps = deps
         self.db_name = database
         self.table_name = table_name
-        self.set_queue = []
-        self.directory.subscribe(deps, self.on_deps_change)  # subscribe this class method on directory changes
+        self.set_queue = []  # entries which set handler returned NOT_READY for
+        self.deps_queues = OrderedDict()  # dependency -> entries waiting for the dependency
+        for dep in deps:  # subscribe on changes of each dependency
+            self.directory.subscribe([dep], lambda dep=dep: self.on_dep_change(dep))
 
     def get_database(self):
         """ Return associated database """
@@ -38,23 +41,42 @@ class Manager(object):
         :param data: associated data of the event. Empty for 'DEL' operation.
         """
         if op == swsscommon.SET_COMMAND:
-            if self.directory.available_deps(self.deps):  # all required dependencies are set in the Directory?
+            missing_deps = self.directory.missing_deps(self.deps)
+            if not missing_deps:  # all required dependencies are set in the Directory?
                 res = self.set_handler(key, data)
                 if not res:  # set handler returned False, which means it is not ready to process is. Save it for later.
                     log_debug("'SET' handler returned NOT_READY for the Manager: %s" % self.__class__)
                     self.set_queue.append((key, data))
             else:
                 log_debug("Not all dependencies are met for the Manager: %s" % self.__class__)
-                self.set_queue.append((key, data))
+                self.deps_queues.setdefault(missing_deps[0], []).append((key, data))
         elif op == swsscommon.DEL_COMMAND:
             self.del_handler(key)
         else:
             log_err("Invalid operation '%s' for key '%s'" % (op, key))
 
+    def on_dep_change(self, dep):
+        """
+        This method is being executed on every change of the dependency.
+        Entries waiting for the dependency are moved to the queue of the next missing dependency,
+        or processed if all dependencies are available
+        :param dep: changed dependency
+        """
+        missing_deps = self.directory.missing_deps(self.deps)
+        if missing_deps:
+            queue = self.deps_queues.pop(dep, None)
+            if queue:
+                self.deps_queues.setdefault(missing_deps[0], []).extend(queue)
+            return
+        self.on_deps_change()
+
     def on_deps_change(self):
-        """ This method is being executed on every dependency change """
+        """ This method is being executed when all dependencies are available """
         if not self.directory.available_deps(self.deps):
             return
+        if self.deps_queues:  # entries waiting for dependencies were received before the NOT_READY entries
+            self.set_queue = [entry for queue in self.deps_queues.values() for entry in queue] + self.set_queue
+            self.deps_queues.clear()
         new_queue = []
         for key, data in self.set_queue:
             res = self.set_handler(key, data)
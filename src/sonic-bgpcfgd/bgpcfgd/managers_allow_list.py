@@ -263,28 +263,82 @@ class BGPAllowListMgr(Manager):
         """
         assert af == self.V4 or af == self.V6
         constant_list = self.__get_constant_list(af)
-        allow_list = self.__to_prefix_list(af, allow_list)
+        allow_list = self.__aggregate_prefix_list(af, self.__to_prefix_list(af, allow_list))
         log_debug("BGPAllowListMgr::__update_prefix_list. af='%s' prefix-list name=%s" % (af, pl_name))
         '''
             Need to check exist and equality of the allowed prefix list.
             A. If exist and equal, no operation needed.
-            B. If exist but not equal, first delete then add prefix based on the data from condig db and constants.
-            C. If non-exist, directly add prefix based on the data from condig db and constants.
+            B. If exist and the constant entries are on top of it, remove and add changed "allow" entries only.
+            C. If exist but the constant entries are changed, first delete then add prefix based on the data from condig db and constants.
+            D. If non-exist, directly add prefix based on the data from condig db and constants.
         '''
-        exist, correct = self.__is_prefix_list_valid(af, pl_name, allow_list, constant_list)
-        if correct:
-            log_debug("BGPAllowListMgr::__update_prefix_list. the prefix-list '%s' exists and correct" % pl_name)
-            return []
         family = self.__af_to_family(af)
+        rules = self.cfg_mgr.get_index().get_prefix_list(family, pl_name)
+        if rules:
+            cmds = self.__update_prefix_list_entries(af, pl_name, rules, allow_list, constant_list)
+            if cmds is not None:
+                if not cmds:
+                    log_debug("BGPAllowListMgr::__update_prefix_list. the prefix-list '%s' exists and correct" % pl_name)
+                return cmds
         cmds = []
         seq_no = 10
-        if exist:
+        if rules:
             cmds.append('no %s prefix-list %s' % (family, pl_name))
         for entry in self.__normalize_ipnetwork(af, constant_list + allow_list):
             cmds.append('%s prefix-list %s seq %d %s' % (family, pl_name, seq_no, entry))
             seq_no += 10
         return cmds
 
+    def __update_prefix_list_entries(self, af, pl_name, rules, allow_list, constant_list):
+        """
+        Generate commands which remove and add changed "allow" entries of an existing prefix-list.
+        :param af: address family of the prefix-list
+        :param pl_name: prefix-list name
+        :param rules: current prefix-list entries. A dictionary: key - sequence number, value - rule
+        :param allow_list: "allow" entries which must follow the constant entries
+        :param constant_list: constant entries which must be on top of the prefix-list
+        :return: list of commands, None if the prefix-list must be created again
+        """
+        family = self.__af_to_family(af)
+        n_constants = len(constant_list)
+        for seq_no, rule in enumerate(constant_list, start=1):
+            expected = self.__parse_prefix_list_rule(af, rule)
+            if expected is None or self.__parse_prefix_list_rule(af, rules.get(seq_no * 10, '')) != expected:
+                return None
+        current = {}  # parsed "allow" entry -> (sequence number, rule)
+        for seq_no, rule in rules.items():
+            if seq_no <= n_constants * 10:
+                if seq_no % 10 != 0:
+                    return None
+                continue
+            entry = self.__parse_prefix_list_rule(af, rule)
+            if entry is None or entry[0] != 'permit' or entry in current:
+                return None
+            current[entry] = seq_no, rule
+        expected = {}
+        for rule in allow_list:
+            entry = self.__parse_prefix_list_rule(af, rule)
+            if entry is None:
+                return None
+            expected[entry] = rule
+        cmds = []
+        free_seq_numbers = []
+        for entry, (seq_no, rule) in sorted(current.items(), key=lambda item: item[1][0]):
+            if entry not in expected:
+                cmds.append('no %s prefix-list %s seq %d %s' % (family, pl_name, seq_no, rule))
+                free_seq_numbers.append(seq_no)
+        next_seq_no = max(rules.keys()) + 10
+        for entry, rule in expected.items():
+            if entry in current:
+                continue
+            if free_seq_numbers:
+                seq_no = free_seq_numbers.pop(0)
+            else:
+                seq_no = next_seq_no
+                next_seq_no += 10
+            cmds.append('%s prefix-list %s seq %d %s' % (family, pl_name, seq_no, rule))
+        return cmds
+
     def __remove_prefix_list(self, af, pl_name):
         """
         Remove prefix-list in the address-family af.
@@ -294,11 +348,10 @@ class BGPAllowListMgr(Manager):
         """
         assert af == self.V4 or af == self.V6
         log_debug("BGPAllowListMgr::__remove_prefix_lists. af='%s' pl_names='%s'" % (af, pl_name))
-        exist, _ = self.__is_prefix_list_valid(af, pl_name, [], [])
-        if not exist:
+        family = self.__af_to_family(af)
+        if not self.cfg_mgr.get_index().get_prefix_list(family, pl_name):
             log_debug("BGPAllowListMgr::__remove_prefix_lists: prefix_list '%s' not found" % pl_name)
             return []
-        family = self.__af_to_family(af)
         return ["no %s prefix-list %s" % (family, pl_name)]
 
     def __normalize_ipnetwork(self, af, allow_prefix_list):
@@ -319,35 +372,88 @@ class BGPAllowListMgr(Manager):
             normalize_list.append(' '.join(tmp_list))
         return normalize_list
 
-    def __is_prefix_list_valid(self, af, pl_name, allow_list, constant_list):
-        """
-        Check that a prefix list exists and it has valid entries
-        :param af: address family of the checked prefix-list
-        :param pl_name: prefix-list name
-        :param allow_list: a prefix-list which must be a part of the valid prefix list
-        :param constant_list: a constant list which must be on top of each "allow" prefix list on the device
-        :return: a tuple. The first element of the tuple has True if the prefix-list exists, False otherwise,
-                 The second element of the tuple has True if allow prefix list in running configuraiton is
-                 equal with ones in config db + constants, False if not
-        """
-        assert af == self.V4 or af == self.V6
-        family = self.__af_to_family(af)
-        match_string = '%s prefix-list %s seq ' % (family, pl_name)
-        conf = self.cfg_mgr.get_text()
-        if not any(line.strip().startswith(match_string) for line in conf):
-            return False, False  # if the prefix list is not exists, it is not correct
-        expect_set = set(self.__normalize_ipnetwork(af, constant_list))
-        expect_set.update(set(self.__normalize_ipnetwork(af, allow_list)))
-
-        config_list = []
-        for line in conf:
-            if line.startswith(match_string):
-                found = line[len(match_string):].strip().split(' ')
-                rule = " ".join(found[1:])
-                config_list.append(rule)
-
-        # Return double Ture, when running configuraiton is identical with config db + constants.
-        return True, expect_set == set(self.__normalize_ipnetwork(af, config_list))
+    def __parse_prefix_list_rule(self, af, rule):
+        """
+        Parse a prefix-list rule into its canonical form
+        :param af: address family of the rule
+        :param rule: prefix-list rule, for example 'permit 10.0.0.0/8 ge 24 le 32'
+        :return: a tuple (action, network, ge, le), where ge and le are the matched prefix lengths.
+                 None if the rule can't be parsed
+        """
+        tokens = rule.split()
+        if len(tokens) < 2 or tokens[0] not in ('permit', 'deny'):
+            return None
+        try:
+            if tokens[1] == 'any':
+                network = ipaddress.ip_network('0.0.0.0/0' if af == self.V4 else '::/0')
+                return tokens[0], network, 0, network.max_prefixlen
+            network = ipaddress.ip_network(tokens[1], strict=False)
+            ge, le = network.prefixlen, None
+            options = tokens[2:]
+            while options:
+                if len(options) < 2 or options[0] not in ('ge', 'le'):
+                    return None
+                if options[0] == 'ge':
+                    ge = int(options[1])
+                    le = network.max_prefixlen if le is None else le
+                else:
+                    le = int(options[1])
+                options = options[2:]
+        except ValueError:
+            return None
+        if le is None:
+            le = ge
+        if (network.version == 4) != (af == self.V4):
+            return None
+        return tokens[0], network, ge, le
+
+    @staticmethod
+    def __format_prefix_list_rule(action, network, ge, le):
+        """
+        Convert a canonical prefix-list rule into the FRR format
+        :param action: 'permit' or 'deny'
+        :param network: matched network
+        :param ge: minimal matched prefix length
+        :param le: maximal matched prefix length
+        :return: prefix-list rule
+        """
+        rule = "%s %s" % (action, network)
+        if ge > network.prefixlen:
+            rule += " ge %d" % ge
+            if le < network.max_prefixlen:
+                rule += " le %d" % le
+        elif le > ge:
+            rule += " le %d" % le
+        return rule
+
+    def __aggregate_prefix_list(self, af, rules):
+        """
+        Aggregate "permit" prefix-list rules. Adjacent networks with the same matched prefix lengths
+        are collapsed into their supernet (with 'ge', when the supernet itself must not be matched),
+        and rules which are covered by another rule are removed.
+        :param af: address family of the rules
+        :param rules: list of "permit" prefix-list rules
+        :return: the aggregated rules sorted by network. The rules are returned as is if they can't be parsed
+        """
+        groups = {}  # (ge, le) -> list of networks
+        for rule in rules:
+            entry = self.__parse_prefix_list_rule(af, rule)
+            if entry is None or entry[0] != 'permit':
+                return rules
+            groups.setdefault(entry[2:], []).append(entry[1])
+        for lengths, networks in groups.items():
+            groups[lengths] = set(ipaddress.collapse_addresses(networks))
+        entries = []
+        for (ge, le), networks in groups.items():
+            covering = [nets for (other_ge, other_le), nets in groups.items()
+                        if (other_ge, other_le) != (ge, le) and other_ge <= ge and le <= other_le]
+            for network in networks:
+                if covering:
+                    supernets = [network.supernet(new_prefix=prefixlen) for prefixlen in range(network.prefixlen + 1)]
+                    if any(supernet in nets for nets in covering for supernet in supernets):
+                        continue
+                entries.append((network, ge, le))
+        return [self.__format_prefix_list_rule('permit', *entry) for entry in sorted(entries)]
 
     def __update_community(self, community_name, community_value):
         """
@@ -398,12 +504,10 @@ class BGPAllowListMgr(Manager):
                           Second element: community value if the first element is True no value otherwise
         """
         log_debug("BGPAllowListMgr::__is_community_presented. community='%s'" % community_name)
-        match_string = 'bgp community-list standard %s permit ' % community_name
-        conf = self.cfg_mgr.get_text()
-        found = [line.strip() for line in conf if line.strip().startswith(match_string)]
+        found = [rule for rule in self.cfg_mgr.get_index().get_community_list(community_name) if rule.startswith('permit ')]
         if not found:
             return False, None
-        community_value = found[0].replace(match_string, '')
+        community_value = found[0][len('permit '):]
         return True, community_value
 
     def __update_allow_route_map_entry(self, af, allow_address_pl_name, community_name, route_map_name):
@@ -460,23 +564,15 @@ class BGPAllowListMgr(Manager):
         :return: a community value used for default action
         """
         log_debug("BGPAllowListMgr::__parse_default_action_route_map_entries. rm='%s'" % route_map_name)
-        match_string = 'route-map %s permit 65535' % route_map_name
         match_community = re.compile(r'^set community (\S+) additive$')
-        inside_route_map = False
         community_value = ""
-        conf = self.cfg_mgr.get_text()
-        for line in conf + [""]:
-            s_line = line.strip()
-            if inside_route_map:
-                matched = match_community.match(s_line)
-                if matched:
-                    community_value = matched.group(1)
-                    break
-                else:
-                    log_err("BGPAllowListMgr::Found incomplete route-map '%s' entry. seq_no=65535" % route_map_name)
-                inside_route_map = False
-            elif s_line == match_string:
-                inside_route_map = True
+        entry = self.cfg_mgr.get_index().get_route_map(route_map_name).get(65535)
+        if entry is not None and entry['action'] == 'permit':
+            matched = match_community.match(entry['lines'][0]) if entry['lines'] else None
+            if matched:
+                community_value = matched.group(1)
+            else:
+                log_err("BGPAllowListMgr::Found incomplete route-map '%s' entry. seq_no=65535" % route_map_name)
         if community_value == "":
             log_err("BGPAllowListMgr::Default action community value is not found. route-map '%s' entry. seq_no=65535" % route_map_name)
         return community_value
@@ -526,44 +622,31 @@ class BGPAllowListMgr(Manager):
         """
         assert af == self.V4 or af == self.V6
         log_debug("BGPAllowListMgr::__parse_allow_route_map_entries. af='%s', rm='%s'" % (af, route_map_name))
-        match_string = 'route-map %s permit ' % route_map_name
         entries = {}
-        inside_route_map = False
-        route_map_seq_number = None
-        pl_allow_list_name = None
-        community_name = self.EMPTY_COMMUNITY
         if af == self.V4:
             match_pl_allow_list = 'match ip address prefix-list '
         else:  # self.V6
             match_pl_allow_list = 'match ipv6 address prefix-list '
         match_community = 'match community '
-        conf = self.cfg_mgr.get_text()
-        for line in conf + [""]:
-            if inside_route_map:
-                if line.strip().startswith(match_pl_allow_list):
-                    pl_allow_list_name = line.strip()[len(match_pl_allow_list):]
-                    continue
-                elif line.strip().startswith(match_community):
-                    community_name = line.strip()[len(match_community):]
-                    continue
+        for route_map_seq_number, entry in self.cfg_mgr.get_index().get_route_map(route_map_name).items():
+            if entry['action'] != 'permit':
+                continue
+            pl_allow_list_name = None
+            community_name = self.EMPTY_COMMUNITY
+            for line in entry['lines']:
+                if line.startswith(match_pl_allow_list):
+                    pl_allow_list_name = line[len(match_pl_allow_list):]
+                elif line.startswith(match_community):
+                    community_name = line[len(match_community):]
                 else:
-                    if pl_allow_list_name is not None:
-                        entries[route_map_seq_number] = {
-                            'pl_allow_list': pl_allow_list_name,
-                            'community': community_name,
-                        }
-                    else:
-                        if route_map_seq_number != 65535:
-                            log_warn("BGPAllowListMgr::Found incomplete route-map '%s' entry. seq_no=%d" % (route_map_name, route_map_seq_number))
-                    inside_route_map = False
-                    pl_allow_list_name = None
-                    community_name = self.EMPTY_COMMUNITY
-                    route_map_seq_number = None
-            if line.startswith(match_string):
-                found = line[len(match_string):]
-                assert found.isdigit()
-                route_map_seq_number = int(found)
-                inside_route_map = True
+                    break
+            if pl_allow_list_name is not None:
+                entries[route_map_seq_number] = {
+                    'pl_allow_list': pl_allow_list_name,
+                    'community': community_name,
+                }
+            elif route_map_seq_number != 65535:
+                log_warn("BGPAllowListMgr::Found incomplete route-map '%s' entry. seq_no=%d" % (route_map_name, route_map_seq_number))
         return entries
 
     @staticmethod
@@ -597,14 +680,7 @@ class BGPAllowListMgr(Manager):
         Extract names of all peer-groups defined in the config
         :return: list of peer-group names
         """
-        # Find all peer-groups entries
-        re_peer_group = re.compile(r'^\s*neighbor (\S+) peer-group$')
-        peer_groups = []
-        for line in self.cfg_mgr.get_text():
-            result = re_peer_group.match(line)
-            if result:
-                peer_groups.append(result.group(1))
-        return peer_groups
+        return list(self.cfg_mgr.get_index().peer_groups)
 
     def __get_peer_group_to_route_map(self, peer_groups):
         """
@@ -614,13 +690,11 @@ class BGPAllowListMgr(Manager):
                  for the peer_group.
         """
         pg_2_rm = {}
+        index = self.cfg_mgr.get_index()
         for pg in peer_groups:
-            re_peer_group_rm = re.compile(r'^\s*neighbor %s route-map (\S+) in$' % pg)
-            for line in self.cfg_mgr.get_text():
-                result = re_peer_group_rm.match(line)
-                if result:
-                    pg_2_rm[pg] = result.group(1)
-                    break
+            route_map = index.get_neighbor_route_map(pg, 'in')
+            if route_map is not None:
+                pg_2_rm[pg] = route_map
         return pg_2_rm
 
     def __get_route_map_calls(self, rms):
@@ -630,23 +704,17 @@ class BGPAllowListMgr(Manager):
         :return: a dictionary: key - name of a route-map, value - name of a route-map call defined for the route-map
         """
         rm_2_call = {}
-        re_rm = re.compile(r'^route-map (\S+) permit \d+$')
-        re_call = re.compile(r'^\s*call (\S+)$')
-        inside_name = None
-        for line in self.cfg_mgr.get_text():
-            if inside_name:
-                inside_result = re_call.match(line)
-                if inside_result:
-                    rm_2_call[inside_name] = inside_result.group(1)
-                    inside_name = None
+        re_call = re.compile(r'^call (\S+)$')
+        index = self.cfg_mgr.get_index()
+        for rm in rms:
+            for entry in index.get_route_map(rm).values():
+                if entry['action'] != 'permit':
                     continue
-            result = re_rm.match(line)
-            if not result:
-                continue
-            inside_name = None
-            if result.group(1) not in rms:
-                continue
-            inside_name = result.group(1)
+                for line in entry['lines']:
+                    result = re_call.match(line)
+                    if result:
+                        rm_2_call[rm] = result.group(1)
+                        break
         return rm_2_call
 
     def __get_routemap_tag(self):
@@ -47,7 +47,7 @@ class BGPPeerGroupMgr(object):
         except jinja2.TemplateError as e:
             log_err("Can't render policy template name: '%s': %s" % (name, str(e)))
             return False
-        self.update_entity(policy, "Routing policy for peer '%s'" % name)
+        self.update_entity((self.policy_template.name, kwargs['vrf']), policy, "Routing policy for peer '%s'" % name)
         return True
 
     def update_pg(self, name, **kwargs):
@@ -68,18 +68,21 @@ class BGPPeerGroupMgr(object):
             cmd = ('router bgp %s\n' % kwargs['bgp_asn']) + pg + tsa_rm + idf_isolation_rm
         else:
             cmd = ('router bgp %s vrf %s\n' % (kwargs['bgp_asn'], kwargs['vrf'])) + pg + tsa_rm + idf_isolation_rm
-        self.update_entity(cmd, "Peer-group for peer '%s'" % name)
+        self.update_entity((self.peergroup_template.name, kwargs['vrf']), cmd, "Peer-group for peer '%s'" % name)
         return True
 
-    def update_entity(self, cmd, txt):
+    def update_entity(self, key, cmd, txt):
         """
         Send commands to FRR
+        :param key: what the commands configure. Commands equal to the ones last sent for the key are skipped
         :param cmd: commands to send in a raw form
         :param txt: text for the syslog output
         :return:
         """
-        self.cfg_mgr.push(cmd)
-        log_info("%s has been scheduled to be updated" % txt)
+        if self.cfg_mgr.push_once(key, cmd):
+            log_info("%s has been scheduled to be updated" % txt)
+        else:
+            log_debug("%s is already scheduled to be updated" % txt)
         return True
 
 
@@ -314,10 +317,11 @@ class BGPPeerMgrBase(Manager):
         bgp_asn = self.directory.get_slot("CONFIG_DB", swsscommon.CFG_DEVICE_METADATA_TABLE_NAME)["localhost"]["bgp_asn"]
         enable_bgp_suppress_fib_pending_cmd = 'bgp suppress-fib-pending'
         if vrf == 'default':
-            cmd = ('router bgp %s\n %s\n' % (bgp_asn, enable_bgp_suppress_fib_pending_cmd)) + cmd
+            section = 'router bgp %s\n %s' % (bgp_asn, enable_bgp_suppress_fib_pending_cmd)
         else:
-            cmd = ('router bgp %s vrf %s\n %s\n' % (bgp_asn, vrf, enable_bgp_suppress_fib_pending_cmd)) + cmd
-        self.cfg_mgr.push(cmd)
+            section = 'router bgp %s vrf %s\n %s' % (bgp_asn, vrf, enable_bgp_suppress_fib_pending_cmd)
+        # commands for peers of the same vrf, which follow each other, are pushed under one 'router bgp'
+        self.cfg_mgr.push_section(section, cmd)
         return True
 
     def get_lo_ipv4(self, loopback_str):
@@ -387,24 +391,15 @@ class BGPPeerMgrBase(Manager):
         Load peers from FRR.
         :return: set of peers, which are already installed in FRR
         """
-        command = ["vtysh", "-c", "show bgp vrfs json"]
+        command = ["vtysh", "-c", "show bgp vrf all neighbors json"]
         ret_code, out, err = run_command(command)
-        if ret_code == 0:
-            js_vrf = json.loads(out)
-            vrfs = js_vrf['vrfs'].keys()
-        else:
-            log_crit("Can't read bgp vrfs: %s" % err)
-            raise Exception("Can't read bgp vrfs: %s" % err)
+        if ret_code != 0:
+            log_crit("Can't read bgp neighbors: %s" % err)
+            raise Exception("Can't read bgp neighbors: %s" % err)
         peers = set()
-        for vrf in vrfs:
-            command = ["vtysh", "-c", 'show bgp vrf %s neighbors json' % str(vrf)]
-            ret_code, out, err = run_command(command)
-            if ret_code == 0:
-                js_bgp = json.loads(out)
-                for nbr in js_bgp.keys():
+        for vrf, js_bgp in json.loads(out).items():
+            for nbr in js_bgp.keys():
+                if nbr not in ('vrfId', 'vrfName'):
                     peers.add((vrf, nbr))
-            else:
-                log_crit("Can't read vrf '%s' neighbors: %s" % (vrf, str(err)))
-                raise Exception("Can't read vrf '%s' neighbors: %s" % (vrf, str(err)))
 
         return peers
@@ -22,6 +22,8 @@ class DeviceGlobalCfgMgr(Manager):
         """        
         self.switch_role = ""
         self.chassis_tsa = ""
+        self.chassis_db = None
+        self.ts_routemap_cache = {}  # (template, route-map name) -> rendered configuration
         self.directory = common_objs['directory']
         self.cfg_mgr = common_objs['cfg_mgr']
         self.constants = common_objs['constants']
@@ -190,10 +192,10 @@ class DeviceGlobalCfgMgr(Manager):
         cmd = "\n"
         if tsa_status == "true":
             log_notice("DeviceGlobalCfgMgr:: Device isolated. Executing TSA")
-            cmd += self.get_ts_routemaps(self.cfg_mgr.get_text(), self.tsa_template)
+            cmd += self.__generate_routemaps_from_template(self.cfg_mgr.get_index().bound_route_maps['out'], self.tsa_template)
         else:
             log_notice("DeviceGlobalCfgMgr:: Device un-isolated. Executing TSB")
-            cmd += self.get_ts_routemaps(self.cfg_mgr.get_text(), self.tsb_template)
+            cmd += self.__generate_routemaps_from_template(self.cfg_mgr.get_index().bound_route_maps['out'], self.tsb_template)
 
         self.cfg_mgr.push(cmd)
         log_debug("DeviceGlobalCfgMgr::Done")
@@ -210,20 +212,32 @@ class DeviceGlobalCfgMgr(Manager):
     def __generate_routemaps_from_template(self, route_map_names, template):
         cmd = "\n"
         for rm in sorted(route_map_names):
-            # For packet-based chassis, the bgp session between the linecards are also considered internal sessions
-            # While isolating a single linecard, these sessions should not be skipped
-            if "_INTERNAL_" in rm or "VOQ_" in rm:
-                is_internal="1"
-            else:
-                is_internal="0"
-            if "V4" in rm:
-                ipv="V4" ; ipp="ip"
-            elif "V6" in rm:
-                ipv="V6" ; ipp="ipv6"
-            else:
-                continue
-            cmd += template.render(route_map_name=rm,ip_version=ipv,ip_protocol=ipp,internal_route_map=is_internal, constants=self.constants)
+            cmd += self.__render_routemap_from_template(rm, template)
+        return cmd
+
+    def __render_routemap_from_template(self, rm, template):
+        """ Render TSA/TSB configuration for the route-map. The rendered configuration is cached,
+            as it depends on the route-map name and the constants only """
+        key = template, rm
+        if key in self.ts_routemap_cache:
+            return self.ts_routemap_cache[key]
+        # For packet-based chassis, the bgp session between the linecards are also considered internal sessions
+        # While isolating a single linecard, these sessions should not be skipped
+        if "_INTERNAL_" in rm or "VOQ_" in rm:
+            is_internal="1"
+        else:
+            is_internal="0"
+        if "V4" in rm:
+            ipv="V4" ; ipp="ip"
+        elif "V6" in rm:
+            ipv="V6" ; ipp="ipv6"
+        else:
+            ipv = None
+        cmd = ""
+        if ipv is not None:
+            cmd = template.render(route_map_name=rm,ip_version=ipv,ip_protocol=ipp,internal_route_map=is_internal, constants=self.constants)
             cmd += "\n"
+        self.ts_routemap_cache[key] = cmd
         return cmd
 
     def __extract_out_route_map_names(self, cmds):
@@ -242,10 +256,14 @@ class DeviceGlobalCfgMgr(Manager):
             return chassis_tsa_status
 
         try:
-            ch = swsscommon.SonicV2Connector(use_unix_socket_path=False)
-            ch.connect(ch.CHASSIS_APP_DB, False)
-            chassis_tsa_status = ch.get(ch.CHASSIS_APP_DB, "BGP_DEVICE_GLOBAL|STATE", 'tsa_enabled')
+            if self.chassis_db is None:
+                ch = swsscommon.SonicV2Connector(use_unix_socket_path=False)
+                ch.connect(ch.CHASSIS_APP_DB, False)
+                self.chassis_db = ch
+            chassis_tsa_status = self.chassis_db.get(self.chassis_db.CHASSIS_APP_DB, "BGP_DEVICE_GLOBAL|STATE", 'tsa_enabled')
         except Exception as e:
+            # connect again next time
+            self.chassis_db = None
             log_err("Got an exception {}".format(e))
 
         return chassis_tsa_status
@@ -1,7 +1,8 @@
+import time
 from collections import defaultdict
 from swsscommon import swsscommon
 
-from .log import log_debug, log_crit
+from .log import log_debug, log_info, log_crit
 
 
 g_run = True
@@ -13,20 +14,69 @@ def signal_handler(_, __):  # signal_handler(signum, frame)
     g_run = False
 
 
+class EventQueue(object):
+    """ Events received by Runner in the order of arrival, without the superseded ones.
+        An event only drops earlier events of the same key, the remaining events keep their order,
+        so the handlers see the changes of different keys and tables in the same order as without coalescing
+    """
+    def __init__(self):
+        """ Constructor """
+        self.events = []   # (subscriber, key, op, data) or None for a superseded event
+        self.pending = {}  # (subscriber, key) -> indexes of the key's events which weren't superseded
+
+    def add(self, subscriber, key, op, data):
+        """
+        Add an event, dropping the events of the key it supersedes:
+        a 'SET' replaces the previous 'SET' (the event carries the whole entry), a 'DEL' removes the 'SET's before it.
+        A 'SET' after a 'DEL' is kept, so the entry is removed and created again
+        :param subscriber: subscriber the event was received from
+        :param key: key of the event
+        :param op: operation of the event
+        :param data: data of the event
+        """
+        ops = self.pending.setdefault((subscriber, key), [])
+        if op == swsscommon.SET_COMMAND:
+            if ops and self.events[ops[-1]][2] == swsscommon.SET_COMMAND:
+                self.events[ops.pop()] = None
+        elif op == swsscommon.DEL_COMMAND:
+            while ops and self.events[ops[-1]][2] == swsscommon.SET_COMMAND:
+                self.events[ops.pop()] = None
+            if ops and self.events[ops[-1]][2] == swsscommon.DEL_COMMAND:
+                return
+        ops.append(len(self.events))
+        self.events.append((subscriber, key, op, data))
+
+    def __iter__(self):
+        return (event for event in self.events if event is not None)
+
+
 class Runner(object):
     """ Implements main io-loop of the application
         It will run event handlers inside of Manager objects
         when corresponding db/table is updated
     """
     SELECT_TIMEOUT = 1000
+    COALESCE_WINDOW = 100      # ms to keep collecting events for one commit. 0 to commit after every wakeup
+    COALESCE_MAX_EVENTS = 1000  # events received before the batch is committed, even if the window isn't over
 
-    def __init__(self, cfg_manager):
+    def __init__(self, cfg_manager, coalesce_window=COALESCE_WINDOW, coalesce_max_events=COALESCE_MAX_EVENTS):
         """ Constructor """
         self.cfg_manager = cfg_manager
+        self.coalesce_window = coalesce_window
+        self.coalesce_max_events = coalesce_max_events
         self.db_connectors = {}
         self.selector = swsscommon.Select()
         self.callbacks = defaultdict(lambda: defaultdict(list))  # db -> table -> handlers[]
         self.subscribers = set()
+        self.stats = {
+            'batches': 0,
+            'events_received': 0,
+            'events_dispatched': 0,
+            'max_batch_size': 0,
+            'last_commit_time': 0.0,
+            'max_commit_time': 0.0,
+            'total_commit_time': 0.0,
+        }
 
     def add_manager(self, manager):
         """
@@ -60,14 +110,74 @@ class Runner(object):
             elif state == self.selector.ERROR:
                 raise Exception("Received error from select")
 
-            for subscriber in self.subscribers:
-                while True:
-                    key, op, fvs = subscriber.pop()
-                    if not key:
-                        break
-                    log_debug("Received message : '%s'" % str((key, op, fvs)))
-                    for callback in self.callbacks[subscriber.getDbConnector().getDbId()][subscriber.getTableName()]:
-                        callback(key, op, dict(fvs))
+            events, n_received = self.collect_events()
+            n_dispatched = self.dispatch_events(events)
+            start_time = time.time()
             rc = self.cfg_manager.commit()
+            self.update_stats(n_received, n_dispatched, time.time() - start_time)
             if not rc:
                 log_crit("Runner::commit was unsuccessful")
+
+    def collect_events(self):
+        """
+        Read events from the subscribers until no events come, the coalescing window is over
+        or the maximum number of events is received
+        :return: a tuple: the events which weren't superseded in the order of arrival, number of received events
+        """
+        events = EventQueue()
+        n_received = self.read_events(events)
+        stop_time = time.time() + self.coalesce_window / 1000.0
+        while g_run and n_received < self.coalesce_max_events:
+            timeout = int((stop_time - time.time()) * 1000)
+            if timeout <= 0:
+                break
+            state, _ = self.selector.select(timeout)
+            if state == self.selector.TIMEOUT:
+                break
+            elif state == self.selector.ERROR:
+                raise Exception("Received error from select")
+            n_received += self.read_events(events)
+        return events, n_received
+
+    def read_events(self, events):
+        """
+        Pop all available events from the subscribers
+        :param events: EventQueue to put the events to
+        :return: number of popped events
+        """
+        n_received = 0
+        for subscriber in self.subscribers:
+            while True:
+                key, op, fvs = subscriber.pop()
+                if not key:
+                    break
+                log_debug("Received message : '%s'" % str((key, op, fvs)))
+                events.add(subscriber, key, op, dict(fvs))
+                n_received += 1
+        return n_received
+
+    def dispatch_events(self, events):
+        """
+        Run the handlers for the events
+        :param events: iterable of (subscriber, key, op, data)
+        :return: number of dispatched events
+        """
+        n_dispatched = 0
+        for subscriber, key, op, data in events:
+            callbacks = self.callbacks[subscriber.getDbConnector().getDbId()][subscriber.getTableName()]
+            for callback in callbacks:
+                callback(key, op, data)
+            n_dispatched += 1
+        return n_dispatched
+
+    def update_stats(self, n_received, n_dispatched, commit_time):
+        """ Account a committed batch of events """
+        self.stats['batches'] += 1
+        self.stats['events_received'] += n_received
+        self.stats['events_dispatched'] += n_dispatched
+        self.stats['max_batch_size'] = max(self.stats['max_batch_size'], n_received)
+        self.stats['last_commit_time'] = commit_time
+        self.stats['max_commit_time'] = max(self.stats['max_commit_time'], commit_time)
+        self.stats['total_commit_time'] += commit_time
+        info = n_received, n_dispatched, commit_time * 1000, self.stats['batches'], self.stats['max_batch_size'], self.stats['max_commit_time'] * 1000
+        log_info("Runner::batch received=%d dispatched=%d commit_time=%.1fms. total batches=%d max_batch_size=%d max_commit_time=%.1fms" % info)
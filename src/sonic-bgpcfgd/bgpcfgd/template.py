@@ -1,23 +1,30 @@
 from collections import OrderedDict
 from functools import partial
 
-import jinja2
 import netaddr
+from sonic_py_common import template_env
 
 from .log import log_err
 
 class TemplateFabric(object):
     """ Fabric for rendering jinja2 templates """
-    def __init__(self, template_path = '/usr/share/sonic/templates'):
+    def __init__(self, template_path = '/usr/share/sonic/templates', cache_dir = None):
         j2_template_paths = [template_path]
-        j2_loader = jinja2.FileSystemLoader(j2_template_paths)
-        j2_env = jinja2.Environment(loader=j2_loader, trim_blocks=False)
-        j2_env.filters['ipv4'] = self.is_ipv4
-        j2_env.filters['ipv6'] = self.is_ipv6
-        j2_env.filters['pfx_filter'] = self.pfx_filter
+        j2_filters = {
+            'ipv4': self.is_ipv4,
+            'ipv6': self.is_ipv6,
+            'pfx_filter': self.pfx_filter,
+        }
         for attr in ['ip', 'network', 'prefixlen', 'netmask']:
-            j2_env.filters[attr] = partial(self.prefix_attr, attr)
-        self.env = j2_env
+            j2_filters[attr] = partial(self.prefix_attr, attr)
+        self.env = template_env.create_environment(j2_template_paths, filters=j2_filters, cache_dir=cache_dir, trim_blocks=False)
+
+    def precompile(self):
+        """
+        Compile all templates into the bytecode cache
+        :return: list of (template name, error) of the templates which failed to compile
+        """
+        return template_env.precompile_templates(self.env)
 
     def from_file(self, filename):
         """
@@ -13,10 +13,15 @@ Description: bgpmon.py -- populating bgp related information in stateDB.
 
     The script check if there are any bgp activities by monitoring the bgp
     frr.log file timestamp.  If activity is detected, then it will request bgp
-    neighbor state via vtysh cli interface. This bgp activity monitoring is
-    done periodically (every 15 second). When triggered, it looks specifically
-    for the neighbor state in the json output of show ip bgp neighbors json
-    and update the state DB for each neighbor accordingly.
+    neighbor state via the bgpd vty socket (or vtysh cli interface if the
+    socket is not available). The frr.log directory is watched with inotify,
+    so the check runs as soon as the log is written, at most once a second.
+    Without inotify the check is done periodically (every 15 second).
+    New lines of frr.log are read to find neighbor state changes logged by
+    "bgp log-neighbor-changes". Only these neighbors are requested with
+    show bgp neighbors <neighbor> json and updated in the state DB. Other
+    activity triggers a full snapshot from show bgp summary json, which is
+    taken at most every 15 seconds.
     In order to not disturb and hold on to the State DB access too long and
     removal of the stale neighbors (neighbors that was there previously on
     previous get request but no longer there in the current get request), a
@@ -26,13 +31,24 @@ Description: bgpmon.py -- populating bgp related information in stateDB.
 """
 import json
 import os
+import re
+import socket
 import sys
 import syslog
 from swsscommon import swsscommon
 import time
 from sonic_py_common.general import getstatusoutput_noshell
+from bgpcfgd.file_watcher import create_watcher
+from bgpcfgd.frr import FRR, VtyClient
 
 PIPE_BATCH_MAX_COUNT = 50
+FRR_LOG_DIR = "/var/log/frr"
+FRR_LOG_FILE = os.path.join(FRR_LOG_DIR, "frr.log")
+UPDATE_INTERVAL = 15  # seconds between the frr.log checks without inotify events
+MIN_UPDATE_INTERVAL = 1  # seconds between updates when frr.log is written continuously
+MAX_LOG_READ_SIZE = 1024 * 1024  # a full snapshot is taken instead, if more new bytes are in frr.log
+MAX_CHANGED_PEERS = 100  # a full snapshot is taken instead, if more neighbors have changed
+ADJCHANGE_RE = re.compile(r'%ADJCHANGE: neighbor (\S+?)(?:\(.*?\))? in vrf (\S+) (Up|Down)\b')
 
 class BgpStateGet:
     def __init__(self):
@@ -45,10 +61,13 @@ class BgpStateGet:
         self.new_peer_l = set()
         self.new_peer_state = {}
         self.cached_timestamp = 0
+        self.log_inode = None
+        self.log_offset = 0
         self.db = swsscommon.SonicV2Connector()
         self.db.connect(self.db.STATE_DB, False)
         self.pipe = swsscommon.RedisPipeline(self.db.get_redis_client(self.db.STATE_DB))
         self.db.delete_all_by_pattern(self.db.STATE_DB, "NEIGH_STATE_TABLE|*" )
+        self.vty = VtyClient("bgpd", FRR.VTY_SOCKET_PATH % "bgpd", FRR.VTY_TIMEOUT)
         self.MAX_RETRY_ATTEMPTS = 3
 
     # A quick way to check if there are anything happening within BGP is to
@@ -58,7 +77,7 @@ class BgpStateGet:
     # out, it will default back to constant pulling every 15 seconds
     def bgp_activity_detected(self):
         try:
-            timestamp = os.stat("/var/log/frr/frr.log").st_mtime
+            timestamp = os.stat(FRR_LOG_FILE).st_mtime
             if timestamp != self.cached_timestamp:
                 self.cached_timestamp = timestamp
                 return True
@@ -67,6 +86,41 @@ class BgpStateGet:
         except (IOError, OSError):
             return True
 
+    # Read the lines which were added to frr.log since the last call and find neighbors,
+    # which state change was logged. Returns a tuple: set of the changed neighbors, and
+    # True if a full snapshot is required, because of other activity or lost log lines
+    def read_log_changes(self):
+        try:
+            with open(FRR_LOG_FILE, 'rb') as fp:
+                st = os.fstat(fp.fileno())
+                if st.st_ino != self.log_inode or st.st_size < self.log_offset:
+                    # frr.log was rotated or truncated. Its old lines could be lost
+                    lost = self.log_inode is not None or st.st_size > 0
+                    self.log_inode = st.st_ino
+                    self.log_offset = 0
+                    if lost:
+                        self.log_offset = st.st_size
+                        return set(), True
+                if st.st_size - self.log_offset > MAX_LOG_READ_SIZE:
+                    self.log_offset = st.st_size
+                    return set(), True
+                fp.seek(self.log_offset)
+                data = fp.read(st.st_size - self.log_offset)
+        except (IOError, OSError):
+            return set(), True
+        # process complete lines only, the last one could be written partially
+        end = data.rfind(b'\n') + 1
+        self.log_offset += end
+        peers = set()
+        other_activity = False
+        for line in data[:end].decode('utf-8', 'replace').splitlines():
+            m = ADJCHANGE_RE.search(line)
+            if m is None:
+                other_activity = True
+            elif m.group(2) == 'default':
+                peers.add(m.group(1))
+        return peers, other_activity
+
     def update_new_peer_states(self, peer_dict):
         peer_l = peer_dict["peers"].keys()
         self.new_peer_l.update(peer_l)
@@ -75,6 +129,14 @@ class BgpStateGet:
                                          peer_dict["peers"][peer]["remoteAs"],
                                          peer_dict["peers"][peer]["localAs"])
 
+    # Run a show command through the persistent bgpd vty connection, fall back
+    # to vtysh if bgpd can't be reached through its vty socket
+    def run_show_command(self, cmd):
+        try:
+            return self.vty.execute(cmd[-1])
+        except (socket.error, OSError):
+            return getstatusoutput_noshell(cmd)
+
     # Get a new snapshot of BGP neighbors and store them in the "new" location
     def get_all_neigh_states(self):
         cmd = ["vtysh", "-c", 'show bgp summary json']
@@ -82,7 +144,7 @@ class BgpStateGet:
 
         while retry_attempt < self.MAX_RETRY_ATTEMPTS:
             try:
-                rc, output = getstatusoutput_noshell(cmd)
+                rc, output = self.run_show_command(cmd)
                 if rc:
                     syslog.syslog(syslog.LOG_ERR, "*ERROR* Failed with rc:{} when execute: {}".format(rc, cmd))
                     return
@@ -117,6 +179,53 @@ class BgpStateGet:
         sys.exit(1)
 
 
+    # Get the current state of one neighbor. Returns a tuple: True if the command
+    # was successful, and (state, remoteAs, localAs), None if the neighbor doesn't exist
+    def get_neigh_state(self, peer):
+        cmd = ["vtysh", "-c", 'show bgp neighbors {} json'.format(peer)]
+        try:
+            rc, output = self.run_show_command(cmd)
+            if rc or len(output) == 0:
+                syslog.syslog(syslog.LOG_WARNING, "*WARNING* Failed with rc:{} when execute: {}".format(rc, cmd))
+                return False, None
+            peer_info = json.loads(output).get(peer)
+        except (ValueError, AttributeError) as e:
+            syslog.syslog(syslog.LOG_WARNING, "*WARNING* Can't parse output of: {}: {}".format(cmd, e))
+            return False, None
+        if not isinstance(peer_info, dict) or "bgpState" not in peer_info:
+            return True, None
+        return True, (peer_info["bgpState"], peer_info.get("remoteAs"), peer_info.get("localAs"))
+
+    # Request the state of changed neighbors only and write the changed entries to the state DB.
+    # Returns False if a full snapshot is required
+    def update_changed_neigh_states(self, peers):
+        if len(peers) > MAX_CHANGED_PEERS:
+            return False
+        data = {}
+        for peer in peers:
+            ok, new_state = self.get_neigh_state(peer)
+            if not ok:
+                if len(data) > 0:
+                    self.flush_pipe(data)
+                return False
+            key = "NEIGH_STATE_TABLE|%s" % peer
+            if new_state is None:
+                if peer in self.peer_l:
+                    data[key] = None
+                    self.peer_l.discard(peer)
+                    self.peer_state.pop(peer, None)
+            elif peer not in self.peer_l or self.peer_state.get(peer) != new_state[0]:
+                state = new_state[0]
+                peerType = "i-BGP" if new_state[1] == new_state[2] else "e-BGP"
+                data[key] = {'state':state, 'peerType':peerType}
+                self.peer_l.add(peer)
+                self.peer_state[peer] = state
+            if len(data) > PIPE_BATCH_MAX_COUNT:
+                self.flush_pipe(data)
+        if len(data) > 0:
+            self.flush_pipe(data)
+        return True
+
     # This method will take the caller's dictionary which contains the peer state operation
     # That need to be updated in StateDB using Redis pipeline.
     # The data{} will be cleared at the end of this method before returning to caller.
@@ -195,12 +304,33 @@ def main():
         syslog.syslog(syslog.LOG_ERR, "{}: error exit 1, reason {}".format("THIS_MODULE", str(e)))
         sys.exit(1)
 
-    # periodically obtain the new neighbor information and update if necessary
+    # obtain the new neighbor information when frr.log is written and update if necessary
+    watcher = create_watcher([FRR_LOG_DIR]) if os.path.isdir(FRR_LOG_DIR) else None
+    if watcher is None:
+        syslog.syslog(syslog.LOG_INFO, "Can't watch {} with inotify, checking it every {} seconds".format(FRR_LOG_DIR, UPDATE_INTERVAL))
+    full_sync_pending = True
+    last_full_sync = 0
     while True:
-        time.sleep(15)
-        if bgp_state_get.bgp_activity_detected():
+        timeout = UPDATE_INTERVAL
+        if full_sync_pending:
+            timeout = max(last_full_sync + UPDATE_INTERVAL - time.time(), 0)
+        if watcher is not None:
+            watcher.wait(timeout)
+        else:
+            time.sleep(timeout)
+        activity = bgp_state_get.bgp_activity_detected()
+        if activity:
+            peers, other_activity = bgp_state_get.read_log_changes()
+            if peers and not bgp_state_get.update_changed_neigh_states(peers):
+                other_activity = True
+            full_sync_pending = full_sync_pending or other_activity
+        if full_sync_pending and time.time() - last_full_sync >= UPDATE_INTERVAL:
             bgp_state_get.get_all_neigh_states()
             bgp_state_get.update_neigh_states()
+            last_full_sync = time.time()
+            full_sync_pending = False
+        if activity and watcher is not None:
+            time.sleep(MIN_UPDATE_INTERVAL)
 
 if __name__ == '__main__':
     main()
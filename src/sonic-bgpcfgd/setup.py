@@ -19,7 +19,8 @@ setuptools.setup(
         'jinja2>=2.10',
         'netaddr==0.8.0',
         'pyyaml==6.0.1',
-        'ipaddress==1.0.23'
+        'ipaddress==1.0.23',
+        'sonic-py-common'
     ],
     setup_requires = [
         'pytest-runner',
@@ -28,6 +28,7 @@ LOCAL_NEXTHOP_TABLE = "nexthop"
 LOCAL_SRT_TABLE = "srt"
 LOCAL_BFD_TABLE = "bfd"
 LOCAL_BFD_PENDING_TABLE = "bfd_pending"
+LOCAL_BFD_PENDING_INTF_TABLE = "bfd_pending_intf"
 LOCAL_INTERFACE_TABLE = "interface"
 
 def log_debug(msg):
@@ -107,6 +108,8 @@ class StaticRouteBfd(object):
         self.local_db[LOCAL_SRT_TABLE] = defaultdict(set)
         self.local_db[LOCAL_BFD_TABLE] = defaultdict(dict)
         self.local_db[LOCAL_BFD_PENDING_TABLE] = defaultdict(dict)
+        #interface name -> keys of LOCAL_BFD_PENDING_TABLE entries, which wait for an ip address of the interface
+        self.local_db[LOCAL_BFD_PENDING_INTF_TABLE] = defaultdict(set)
         #interface, portchannel_interface and loopback_interface share same table, assume name is unique
         #assume only one ipv4  and/or one ipv6 for each interface
         self.local_db[LOCAL_INTERFACE_TABLE] = defaultdict(dict)
@@ -115,9 +118,13 @@ class StaticRouteBfd(object):
         self.appl_db = swsscommon.DBConnector(APPL_DB_NAME, 0, True)
         self.state_db = swsscommon.DBConnector(STATE_DB_NAME, 0, True)
 
-        self.bfd_appl_tbl = swsscommon.ProducerStateTable(self.appl_db, BFD_SESSION_TABLE_NAME)
+        #appl_db writes are buffered in the pipeline and flushed once per batch of received messages
+        self.appl_pipe = swsscommon.RedisPipeline(self.appl_db)
+        self.bfd_appl_tbl = swsscommon.ProducerStateTable(self.appl_pipe, BFD_SESSION_TABLE_NAME, True)
 
-        self.static_route_appl_tbl = swsscommon.Table(self.appl_db, STATIC_ROUTE_TABLE_NAME)
+        self.static_route_appl_tbl = swsscommon.Table(self.appl_pipe, STATIC_ROUTE_TABLE_NAME, True)
+        #static route key -> route data, or None to delete it. Only the last update of a route in a batch is written
+        self.static_route_appl_pending = {}
 
         self.selector = swsscommon.Select()
         self.callbacks = defaultdict(lambda: defaultdict(list))  # db -> table -> handlers[]
@@ -217,10 +224,17 @@ class StaticRouteBfd(object):
 
         return False, ""
 
+    def add_bfd_pending(self, intf, nh_ip, bfd_key):
+        pending_key = intf + "_" + bfd_key
+        self.set_local_db(LOCAL_BFD_PENDING_TABLE, pending_key, [intf, nh_ip, bfd_key])
+        self.local_db[LOCAL_BFD_PENDING_INTF_TABLE][intf].add(pending_key)
+
     def update_bfd_pending(self, if_name):
         del_list=[]
-        for k, v in self.local_db[LOCAL_BFD_PENDING_TABLE].items():
-            if len(v) == 3 and v[0] == if_name:
+        pending_keys = self.local_db[LOCAL_BFD_PENDING_INTF_TABLE].get(if_name, set())
+        for k in pending_keys:
+            v = self.local_db[LOCAL_BFD_PENDING_TABLE].get(k)
+            if v is not None and len(v) == 3 and v[0] == if_name:
                 intf, nh_ip, bfd_key = v[0], v[1], v[2]
                 valid, local_addr = self.find_interface_ip(intf, nh_ip)
                 if not valid: #IP address might not be available for this type of nh_ip (IPv4 or IPv6) yet
@@ -241,6 +255,9 @@ class StaticRouteBfd(object):
 
         for k in del_list:
             self.local_db[LOCAL_BFD_PENDING_TABLE].pop(k)
+            pending_keys.discard(k)
+        if not pending_keys:
+            self.remove_from_local_db(LOCAL_BFD_PENDING_INTF_TABLE, if_name)
 
     def strip_table_name(self, key, splitter):
         return key.split(splitter, 1)[1]
@@ -476,7 +493,7 @@ class StaticRouteBfd(object):
                 valid, local_addr = self.find_interface_ip(intf, nh_ip)
                 if not valid:
                     #interface IP is not available yet, put this request to cache
-                    self.set_local_db(LOCAL_BFD_PENDING_TABLE, intf+"_"+bfd_key, [intf, nh_ip, bfd_key])
+                    self.add_bfd_pending(intf, nh_ip, bfd_key)
                     self.append_to_nh_table_entry(nh_key, vrf + "|" + ip_prefix)
                     log_warn("bfd_pending: cannot find ip for interface: %s, postpone bfd session creation" %intf)
                     continue
@@ -583,12 +600,22 @@ class StaticRouteBfd(object):
                 self.remove_from_local_db(LOCAL_SRT_TABLE, srt_key)
 
     def set_static_route_into_appl_db(self, key, data):
-        fvs = swsscommon.FieldValuePairs(list(data.items()))
-        self.static_route_appl_tbl.set(key, fvs)
+        self.static_route_appl_pending[key] = data.copy()
         log_debug("SRT_BFD: set static route to appl_db, key %s, data %s"%(key, str(data)))
 
     def del_static_route_from_appl_db(self, key):
-        self.static_route_appl_tbl.delete(key)
+        self.static_route_appl_pending[key] = None
+
+    def flush_appl_db(self):
+        """ Write the pending static route updates and flush all buffered appl_db writes """
+        for key, data in self.static_route_appl_pending.items():
+            if data is None:
+                self.static_route_appl_tbl.delete(key)
+            else:
+                fvs = swsscommon.FieldValuePairs(list(data.items()))
+                self.static_route_appl_tbl.set(key, fvs)
+        self.static_route_appl_pending.clear()
+        self.appl_pipe.flush()
 
     def reconstruct_static_route_config(self, original_config, reachable_nexthops):
         arg_list    = lambda v: [x.strip() for x in v.split(',')] if len(v.strip()) != 0 else None
@@ -754,6 +781,7 @@ class StaticRouteBfd(object):
                     log_debug("Received message : '%s'" % str((key, op, fvs)))
                     for callback in self.callbacks[sub.getDbConnector().getDbId()][sub.getTableName()]:
                         callback(key, op, dict(fvs))
+            self.flush_appl_db()
 
 def do_work():
     sr_bfd = StaticRouteBfd()
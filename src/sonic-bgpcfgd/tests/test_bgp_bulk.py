@@ -0,0 +1,107 @@
+import os
+import sys
+import time
+
+from bgpcfgd.config import ConfigMgr
+from bgpcfgd.directory import Directory
+from bgpcfgd.template import TemplateFabric
+from . import swsscommon_test
+from .util import load_constants
+from swsscommon import swsscommon
+import bgpcfgd.managers_bgp
+
+TEMPLATE_PATH = os.path.abspath('../../dockers/docker-fpm-frr/frr')
+
+
+class FakeFRR(object):
+    """ FRR backend which records configuration pushed by ConfigMgr """
+    def __init__(self):
+        self.writes = []
+
+    def get_config(self):
+        return ""
+
+    def write(self, config_text):
+        self.writes.append(config_text)
+        return True
+
+    def restart_peer_groups(self, peer_groups):
+        return True
+
+
+def constructor():
+    frr = FakeFRR()
+    common_objs = {
+        'directory': Directory(),
+        'cfg_mgr':   ConfigMgr(frr),
+        'tf':        TemplateFabric(TEMPLATE_PATH),
+        'constants': load_constants()['constants'],
+    }
+    bgpcfgd.managers_bgp.run_command = lambda cmd: (0, "{}", "")
+    m = bgpcfgd.managers_bgp.BGPPeerMgrBase(common_objs, "CONFIG_DB", swsscommon.CFG_BGP_NEIGHBOR_TABLE_NAME, "general", True)
+    m.directory.put("CONFIG_DB", swsscommon.CFG_DEVICE_METADATA_TABLE_NAME, "localhost", {"bgp_asn": "65100", "type": "LeafRouter"})
+    m.directory.put("CONFIG_DB", "BGP_BBR", "status", "disabled")
+    m.directory.put("CONFIG_DB", swsscommon.CFG_LOOPBACK_INTERFACE_TABLE_NAME, "Loopback0|11.11.11.11/32", {})
+    m.directory.put("LOCAL", "local_addresses", "30.30.30.30", {"interface": "Ethernet4|30.30.30.30/24"})
+    m.directory.put("LOCAL", "interfaces", "Ethernet4|30.30.30.30/24", {"anything": "anything"})
+    return m, frr
+
+
+def add_neighbors(m, count):
+    for i in range(count):
+        nbr = "10.0.%d.%d" % (i // 250, i % 250 + 1)
+        data = {"asn": str(65200 + i), "name": "ARISTA%02dT0" % i, "local_addr": "30.30.30.30"}
+        assert m.set_handler(nbr, data)
+
+
+def test_load_peers_all_vrfs():
+    output = '{"default": {"vrfId": 0, "vrfName": "default", "10.0.0.1": {}}, "Vrf1": {"vrfId": 5, "vrfName": "Vrf1", "fc00::1": {}}}'
+    bgpcfgd.managers_bgp.run_command = lambda cmd: (0, output, "")
+    assert bgpcfgd.managers_bgp.BGPPeerMgrBase.load_peers() == {("default", "10.0.0.1"), ("Vrf1", "fc00::1")}
+
+def test_bulk_add_one_commit():
+    m, frr = constructor()
+    add_neighbors(m, 10)
+    assert m.cfg_mgr.commit()
+    assert len(frr.writes) == 1
+    config = frr.writes[0]
+    assert config.count("router bgp 65100\n bgp suppress-fib-pending\n") == 1
+    assert config.count("neighbor PEER_V4 peer-group\n") == 1
+    assert config.count("route-map FROM_BGP_PEER_V4 permit 100\n") == 1
+    for i in range(10):
+        assert "neighbor 10.0.0.%d remote-as %d\n" % (i + 1, 65200 + i) in config
+
+def test_bulk_add_vrfs():
+    m, frr = constructor()
+    m.set_handler("10.0.0.1", {"asn": "65200", "name": "N1", "local_addr": "30.30.30.30"})
+    m.set_handler("Vrf1|10.0.0.2", {"asn": "65201", "name": "N2", "local_addr": "30.30.30.30"})
+    m.set_handler("Vrf1|10.0.0.3", {"asn": "65202", "name": "N3", "local_addr": "30.30.30.30"})
+    assert m.cfg_mgr.commit()
+    config = frr.writes[0]
+    assert config.count("router bgp 65100 vrf Vrf1\n bgp suppress-fib-pending\n") == 1
+    vrf_section = config.index("router bgp 65100 vrf Vrf1\n bgp suppress-fib-pending\n")
+    assert config.index("neighbor 10.0.0.3 remote-as 65202") > vrf_section
+
+def test_push_once_after_commit():
+    m, frr = constructor()
+    add_neighbors(m, 1)
+    m.cfg_mgr.commit()
+    m.set_handler("10.0.1.1", {"asn": "65300", "name": "N2", "local_addr": "30.30.30.30"})
+    m.cfg_mgr.commit()
+    assert len(frr.writes) == 2
+    assert "neighbor PEER_V4 peer-group\n" in frr.writes[1]
+
+
+def benchmark(counts=(100, 1000, 5000)):
+    """ Measure time of rendering and pushing neighbors into the fake FRR backend """
+    for count in counts:
+        m, frr = constructor()
+        start = time.time()
+        add_neighbors(m, count)
+        m.cfg_mgr.commit()
+        elapsed = time.time() - start
+        print("%5d neighbors: %.3f s, %.1f us/neighbor, %d bytes pushed" % (count, elapsed, elapsed * 1e6 / count, len(frr.writes[0])))
+
+
+if __name__ == '__main__':
+    benchmark([int(arg) for arg in sys.argv[1:]] or (100, 1000, 5000))
@@ -0,0 +1,208 @@
+import json
+import os
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+import bgpmon.bgpmon as bgpmon
+
+
+ADJCHANGE_UP = "2024/01/01 00:00:00 BGP: [M59KS-A3ZXZ] %%ADJCHANGE: neighbor %s(ARISTA01T2) in vrf default Up\n"
+ADJCHANGE_DOWN = "2024/01/01 00:00:00 BGP: [M59KS-A3ZXZ] %%ADJCHANGE: neighbor %s in vrf default Down Peer closed the session\n"
+
+
+class FakeVty(object):
+    """ bgpd vty which answers show commands from the neighbor states it is given """
+    def __init__(self, peers):
+        self.peers = peers  # neighbor -> (state, remoteAs, localAs)
+        self.commands = []
+        self.rc = 0
+
+    def execute(self, command):
+        self.commands.append(command)
+        if command == 'show bgp summary json':
+            peers = dict((peer, {'state': state, 'remoteAs': remote_as, 'localAs': local_as})
+                         for peer, (state, remote_as, local_as) in self.peers.items())
+            return self.rc, json.dumps({'ipv4Unicast': {'peers': peers}})
+        peer = command.split()[3]
+        if peer not in self.peers:
+            return self.rc, '{}'
+        state, remote_as, local_as = self.peers[peer]
+        return self.rc, json.dumps({peer: {'bgpState': state, 'remoteAs': remote_as, 'localAs': local_as}})
+
+
+@pytest.fixture
+def log_file(tmp_path, monkeypatch):
+    path = str(tmp_path / 'frr.log')
+    monkeypatch.setattr(bgpmon, 'FRR_LOG_FILE', path)
+    return path
+
+
+@pytest.fixture
+def bgp_state_get():
+    with patch('bgpmon.bgpmon.swsscommon'), patch('bgpmon.bgpmon.VtyClient'):
+        m = bgpmon.BgpStateGet()
+    m.vty = FakeVty({})
+    m.flushed = []
+    m.flush_pipe = lambda data: (m.flushed.append(dict(data)), data.clear())
+    return m
+
+
+def append_log(path, text):
+    with open(path, 'a') as fp:
+        fp.write(text)
+
+
+def test_read_log_changes(log_file, bgp_state_get):
+    append_log(log_file, "old line\n")
+    # lines written before bgpmon started are skipped, a full snapshot is needed
+    assert bgp_state_get.read_log_changes() == (set(), True)
+    assert bgp_state_get.read_log_changes() == (set(), False)
+    append_log(log_file, ADJCHANGE_UP % "10.0.0.1" + ADJCHANGE_DOWN % "fc00::2")
+    assert bgp_state_get.read_log_changes() == ({"10.0.0.1", "fc00::2"}, False)
+    append_log(log_file, "%ADJCHANGE: neighbor 10.0.0.3 in vrf Vrf1 Up\nother activity\n")
+    assert bgp_state_get.read_log_changes() == (set(), True)
+
+
+def test_read_log_changes_partial_line(log_file, bgp_state_get):
+    append_log(log_file, "")
+    assert bgp_state_get.read_log_changes() == (set(), False)
+    line = ADJCHANGE_UP % "10.0.0.1"
+    append_log(log_file, line[:30])
+    assert bgp_state_get.read_log_changes() == (set(), False)
+    append_log(log_file, line[30:])
+    assert bgp_state_get.read_log_changes() == ({"10.0.0.1"}, False)
+
+
+def test_read_log_changes_rotation(log_file, bgp_state_get):
+    append_log(log_file, "")
+    bgp_state_get.read_log_changes()
+    append_log(log_file, ADJCHANGE_UP % "10.0.0.1")
+    os.rename(log_file, log_file + '.1')
+    append_log(log_file, ADJCHANGE_UP % "10.0.0.2")
+    # the lines of the rotated file could be lost
+    assert bgp_state_get.read_log_changes() == (set(), True)
+    append_log(log_file, ADJCHANGE_UP % "10.0.0.3")
+    assert bgp_state_get.read_log_changes() == ({"10.0.0.3"}, False)
+
+
+def test_read_log_changes_truncation(log_file, bgp_state_get):
+    append_log(log_file, "")
+    bgp_state_get.read_log_changes()
+    append_log(log_file, ADJCHANGE_UP % "10.0.0.1" + ADJCHANGE_UP % "10.0.0.2")
+    assert bgp_state_get.read_log_changes() == ({"10.0.0.1", "10.0.0.2"}, False)
+    with open(log_file, 'w') as fp:
+        fp.write(ADJCHANGE_UP % "10.0.0.3")
+    assert bgp_state_get.read_log_changes() == (set(), True)
+    append_log(log_file, ADJCHANGE_UP % "10.0.0.4")
+    assert bgp_state_get.read_log_changes() == ({"10.0.0.4"}, False)
+
+
+def test_read_log_changes_too_many_lines(log_file, bgp_state_get, monkeypatch):
+    monkeypatch.setattr(bgpmon, 'MAX_LOG_READ_SIZE', 200)
+    append_log(log_file, "")
+    bgp_state_get.read_log_changes()
+    append_log(log_file, ADJCHANGE_UP % "10.0.0.1" * 3)
+    assert bgp_state_get.read_log_changes() == (set(), True)
+    append_log(log_file, ADJCHANGE_UP % "10.0.0.2")
+    assert bgp_state_get.read_log_changes() == ({"10.0.0.2"}, False)
+
+
+def test_read_log_changes_no_file(log_file, bgp_state_get):
+    assert bgp_state_get.read_log_changes() == (set(), True)
+
+
+def test_update_changed_neigh_states(bgp_state_get):
+    bgp_state_get.vty.peers = {"10.0.0.1": ("Established", 65200, 65100), "10.0.0.2": ("Active", 65100, 65100)}
+    assert bgp_state_get.update_changed_neigh_states({"10.0.0.1", "10.0.0.2"})
+    assert bgp_state_get.flushed == [{"NEIGH_STATE_TABLE|10.0.0.1": {'state': 'Established', 'peerType': 'e-BGP'},
+                                      "NEIGH_STATE_TABLE|10.0.0.2": {'state': 'Active', 'peerType': 'i-BGP'}}]
+    assert bgp_state_get.peer_l == {"10.0.0.1", "10.0.0.2"}
+    # unchanged state is not written again
+    bgp_state_get.flushed = []
+    assert bgp_state_get.update_changed_neigh_states({"10.0.0.1"})
+    assert bgp_state_get.flushed == []
+
+
+def test_update_changed_neigh_states_deleted_peer(bgp_state_get):
+    bgp_state_get.vty.peers = {"10.0.0.1": ("Established", 65200, 65100)}
+    assert bgp_state_get.update_changed_neigh_states({"10.0.0.1"})
+    del bgp_state_get.vty.peers["10.0.0.1"]
+    bgp_state_get.flushed = []
+    assert bgp_state_get.update_changed_neigh_states({"10.0.0.1", "10.0.0.9"})
+    assert bgp_state_get.flushed == [{"NEIGH_STATE_TABLE|10.0.0.1": None}]
+    assert bgp_state_get.peer_l == set()
+    assert bgp_state_get.peer_state == {}
+
+
+def test_update_changed_neigh_states_fallback(bgp_state_get, monkeypatch):
+    monkeypatch.setattr(bgpmon, 'MAX_CHANGED_PEERS', 2)
+    bgp_state_get.vty.peers = {"10.0.0.1": ("Established", 65200, 65100)}
+    assert not bgp_state_get.update_changed_neigh_states({"10.0.0.1", "10.0.0.2", "10.0.0.3"})
+    assert bgp_state_get.vty.commands == []
+    # a failed show command requires a full snapshot too
+    bgp_state_get.vty.rc = 1
+    assert not bgp_state_get.update_changed_neigh_states({"10.0.0.1"})
+    assert bgp_state_get.flushed == []
+
+
+def test_full_snapshot_removes_stale_peers(bgp_state_get):
+    bgp_state_get.vty.peers = {"10.0.0.1": ("Established", 65200, 65100), "10.0.0.2": ("Active", 65100, 65100)}
+    bgp_state_get.get_all_neigh_states()
+    bgp_state_get.update_neigh_states()
+    del bgp_state_get.vty.peers["10.0.0.2"]
+    bgp_state_get.flushed = []
+    bgp_state_get.get_all_neigh_states()
+    bgp_state_get.update_neigh_states()
+    assert bgp_state_get.flushed == [{"NEIGH_STATE_TABLE|10.0.0.2": None}]
+    assert bgp_state_get.peer_l == {"10.0.0.1"}
+
+
+class StopLoop(Exception):
+    pass
+
+
+class FakeClock(object):
+    """ time module and file watcher, which wait() returns after the given delays """
+    def __init__(self, now, delays):
+        self.now = now
+        self.delays = list(delays)  # None: no event, the timeout expires
+        self.waits = []
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+    def wait(self, timeout):
+        if not self.delays:
+            raise StopLoop()
+        self.waits.append(timeout)
+        delay = self.delays.pop(0)
+        self.now += timeout if delay is None else delay
+
+
+def test_main_loop(tmp_path, monkeypatch):
+    clock = FakeClock(1000, [0, 2, 2, None])
+    monkeypatch.setattr(bgpmon, 'FRR_LOG_DIR', str(tmp_path))
+    monkeypatch.setattr(bgpmon, 'UPDATE_INTERVAL', 15)
+    monkeypatch.setattr(bgpmon, 'MIN_UPDATE_INTERVAL', 1)
+    monkeypatch.setattr(bgpmon, 'time', clock)
+    watcher = MagicMock()
+    watcher.wait.side_effect = clock.wait
+    monkeypatch.setattr(bgpmon, 'create_watcher', MagicMock(return_value=watcher))
+    state_get = MagicMock()
+    state_get.bgp_activity_detected.side_effect = [True, True, True, False]
+    state_get.read_log_changes.side_effect = [(set(), True), ({"10.0.0.1"}, False), ({"10.0.0.2"}, False)]
+    # the second neighbor change falls back to a full snapshot
+    state_get.update_changed_neigh_states.side_effect = [True, False]
+    monkeypatch.setattr(bgpmon, 'BgpStateGet', MagicMock(return_value=state_get))
+    with pytest.raises(StopLoop):
+        bgpmon.main()
+    assert state_get.update_changed_neigh_states.call_args_list == [(({"10.0.0.1"},),), (({"10.0.0.2"},),)]
+    # the pending full snapshot is delayed until UPDATE_INTERVAL passed since the first one at 1000
+    assert clock.waits == [0, 15, 15, 8]
+    assert clock.now == 1015
+    assert state_get.get_all_neigh_states.call_count == 2
+    assert state_get.update_neigh_states.call_count == 2
@@ -1,6 +1,7 @@
 from unittest.mock import MagicMock, patch
 
 import os
+from bgpcfgd.config import RunningConfig
 from bgpcfgd.directory import Directory
 from bgpcfgd.template import TemplateFabric
 from . import swsscommon_test
@@ -40,6 +41,7 @@ def constructor(check_internal=False):
     def get_config():
         return cfg_mgr.changes
     cfg_mgr.get_text = get_text
+    cfg_mgr.get_index = lambda: RunningConfig(get_text())
     cfg_mgr.update = update
     cfg_mgr.push = push
     cfg_mgr.get_config = get_config
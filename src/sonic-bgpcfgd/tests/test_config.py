@@ -1,6 +1,6 @@
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
-from bgpcfgd.config import ConfigMgr
+from bgpcfgd.config import ConfigMgr, RunningConfig
 
 
 def test_constructor():
@@ -205,3 +205,83 @@ def test_from_canonical():
     c = ConfigMgr(frr)
     raw = c.from_canonical(canonical)
     assert raw == expected
+
+def test_update_is_cached_until_commit():
+    frr = MagicMock()
+    frr.get_config = MagicMock(return_value = "router bgp 65100\n neighbor PEER_V4 peer-group\n")
+    frr.write = MagicMock(return_value = True)
+    frr.restart_peer_groups = MagicMock(return_value = True)
+    c = ConfigMgr(frr)
+    c.update()
+    c.update()
+    assert frr.get_config.call_count == 1
+    assert c.get_index() is c.get_index()
+    assert c.get_index().peer_groups == ["PEER_V4"]
+    c.push("route-map TEST permit 10")
+    generation = c.generation
+    c.commit()
+    assert c.generation > generation
+    c.update()
+    assert frr.get_config.call_count == 2
+    c.invalidate()
+    c.update()
+    assert frr.get_config.call_count == 3
+    # a commit without changes ends the batch of events too
+    c.commit()
+    c.update()
+    assert frr.get_config.call_count == 4
+
+def test_update_cache_age():
+    frr = MagicMock()
+    frr.get_config = MagicMock(return_value = "router bgp 65100\n")
+    c = ConfigMgr(frr)
+    with patch('bgpcfgd.config.time.monotonic', return_value = 100.0):
+        c.update()
+        c.update()
+    assert frr.get_config.call_count == 1
+    with patch('bgpcfgd.config.time.monotonic', return_value = 100.0 + ConfigMgr.MAX_CONFIG_AGE):
+        c.update()
+    assert frr.get_config.call_count == 2
+
+def test_push_once():
+    frr = MagicMock()
+    c = ConfigMgr(frr)
+    assert c.push_once("pg1", "A")
+    assert not c.push_once("pg1", "A")
+    assert c.push_once("pg2", "A")
+    assert c.push_once("pg1", "B")
+    # going back to an earlier change must be pushed again, it is the last one to apply
+    assert c.push_once("pg1", "A")
+    assert c.changes == "A\nA\nB\nA\n"
+
+def test_running_config_index():
+    index = RunningConfig([
+        'ip prefix-list PL_V4 seq 10 deny 0.0.0.0/0 le 17',
+        'ip prefix-list PL_V4 seq 20 permit 20.20.30.0/24 le 32',
+        'bgp community-list standard COMMUNITY permit 123:123',
+        'route-map RM_V4 permit 10',
+        ' match ip address prefix-list PL_V4',
+        ' call CALL_V4',
+        'route-map RM_V4 deny 20',
+        'exit',
+        'router bgp 65100',
+        ' neighbor PEER_V4 peer-group',
+        ' address-family ipv4',
+        '  neighbor PEER_V4 route-map RM_V4 in',
+        '  neighbor PEER_V4 route-map TO_PEER_V4 out',
+        '  neighbor 10.0.0.1 route-map TO_NEIGHBOR out',
+        ' exit-address-family',
+        '     ',
+    ])
+    assert index.get_prefix_list('ip', 'PL_V4') == {10: 'deny 0.0.0.0/0 le 17', 20: 'permit 20.20.30.0/24 le 32'}
+    assert index.get_prefix_list('ipv6', 'PL_V4') == {}
+    assert index.get_community_list('COMMUNITY') == ['permit 123:123']
+    assert index.get_route_map('RM_V4') == {
+        10: {'action': 'permit', 'lines': ['match ip address prefix-list PL_V4', 'call CALL_V4']},
+        20: {'action': 'deny', 'lines': []},
+    }
+    assert index.peer_groups == ['PEER_V4']
+    assert index.get_neighbor_route_map('PEER_V4', 'in') == 'RM_V4'
+    assert index.get_neighbor_route_map('PEER_V4', 'out') == 'TO_PEER_V4'
+    assert index.get_neighbor_route_map('PEER_V6', 'in') is None
+    assert index.bound_route_maps['out'] == {'TO_PEER_V4', 'TO_NEIGHBOR'}
@@ -2,6 +2,7 @@ import pytest
 from unittest.mock import MagicMock, patch
 
 import os
+from bgpcfgd.config import RunningConfig
 from bgpcfgd.directory import Directory
 from bgpcfgd.template import TemplateFabric
 from . import swsscommon_test
@@ -49,6 +50,7 @@ def constructor(check_internal=False):
     def get_config():
         return cfg_mgr.changes
     cfg_mgr.get_text = get_text
+    cfg_mgr.get_index = lambda: RunningConfig(get_text())
     cfg_mgr.update = update
     cfg_mgr.push = push
     cfg_mgr.get_config = get_config
@@ -189,6 +191,32 @@ def test_get_tsb_routemaps():
     expected_res = get_string_from_file("/result_unisolate.conf")
     assert res == expected_res
 
+def test_ts_routemaps_cache():
+    m = constructor()
+    render = MagicMock(side_effect=m.tsa_template.render)
+    m.tsa_template.render = render
+    res = m.get_ts_routemaps(m.cfg_mgr.get_text(), m.tsa_template)
+    n_renders = render.call_count
+    assert n_renders > 0
+    assert m.get_ts_routemaps(m.cfg_mgr.get_text(), m.tsa_template) == res
+    assert render.call_count == n_renders
+    assert res == get_string_from_file("/result_isolate.conf")
+
+@patch('bgpcfgd.managers_device_global.device_info.is_chassis', return_value=True)
+def test_get_chassis_tsa_status_reuses_connection(mock_is_chassis):
+    m = constructor()
+    connector = MagicMock()
+    connector.return_value.get.return_value = "true"
+    with patch('bgpcfgd.managers_device_global.swsscommon.SonicV2Connector', connector):
+        assert m.get_chassis_tsa_status() == "true"
+        assert m.get_chassis_tsa_status() == "true"
+        assert connector.call_count == 1
+        connector.return_value.get.side_effect = Exception("connection lost")
+        assert m.get_chassis_tsa_status() == "false"
+        connector.return_value.get.side_effect = None
+        assert m.get_chassis_tsa_status() == "true"
+        assert connector.call_count == 2
+
 def get_string_from_file(filename, base_path=BASE_PATH):
     fp = open(base_path + filename, "r")
     cfg = fp.read()
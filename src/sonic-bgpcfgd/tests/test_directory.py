@@ -55,3 +55,28 @@ def test_directory(mocked_log_err):
     # Test remove_slot() with nonexist table
     directory.remove_slot("db_name", "table_nonexist")
     mocked_log_err.assert_called_with("Directory: Can't remove slot 'db_name__table_nonexist'. The slot doesn't exist")
+
+def test_put_notifies_changed_paths():
+    directory = Directory()
+    handler_asn = MagicMock()
+    handler_slot = MagicMock()
+    handler_lo = MagicMock()
+    directory.subscribe([("CONFIG_DB", "DEVICE_METADATA", "localhost/bgp_asn")], handler_asn)
+    directory.subscribe([("CONFIG_DB", "DEVICE_METADATA", "")], handler_slot)
+    directory.subscribe([("CONFIG_DB", "LOOPBACK_INTERFACE", "Loopback0")], handler_lo)
+
+    directory.put("CONFIG_DB", "DEVICE_METADATA", "localhost", {"type": "LeafRouter"})
+    assert not handler_asn.called
+    assert handler_slot.call_count == 1
+
+    directory.put("CONFIG_DB", "DEVICE_METADATA", "other", {"bgp_asn": "65100"})
+    assert not handler_asn.called
+    assert handler_slot.call_count == 2
+
+    directory.put("CONFIG_DB", "DEVICE_METADATA", "localhost", {"bgp_asn": "65100"})
+    assert handler_asn.call_count == 1
+    assert handler_slot.call_count == 3
+    assert not handler_lo.called
+
+    assert directory.missing_deps([("CONFIG_DB", "DEVICE_METADATA", "localhost/bgp_asn"),
+                                   ("CONFIG_DB", "LOOPBACK_INTERFACE", "Loopback0")]) == [("CONFIG_DB", "LOOPBACK_INTERFACE", "Loopback0")]
@@ -0,0 +1,19 @@
+from bgpcfgd.file_watcher import FileWatcher, create_watcher
+
+
+def test_file_watcher(tmp_path):
+    watcher = create_watcher([str(tmp_path)])
+    assert watcher is not None
+    try:
+        assert watcher.wait(0) == []
+        (tmp_path / "frr.log").write_text(u"log line")
+        events = watcher.wait(1)
+        assert (str(tmp_path), "frr.log", FileWatcher.IN_CREATE) in events
+        assert any(name == "frr.log" and mask & FileWatcher.IN_CLOSE_WRITE for _, name, mask in events)
+        assert watcher.wait(0) == []
+    finally:
+        watcher.close()
+
+
+def test_create_watcher_missing_dir(tmp_path):
+    assert create_watcher([str(tmp_path / "missing")]) is None
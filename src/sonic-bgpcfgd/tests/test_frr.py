@@ -1,4 +1,7 @@
-from unittest.mock import patch
+import socket
+import threading
+import time
+from unittest.mock import MagicMock, patch
 import bgpcfgd.frr
 import pytest
 
@@ -66,3 +69,135 @@ def test_restart_peer_groups_fail(mocked_log_crit):
     res = f.restart_peer_groups(["pg_1", "pg_2"])
     assert not res, "Expect False return value"
     mocked_log_crit.assert_called_with("Can't restart bgp peer-group 'pg_2'. rc='1', out='some output', err='some error'")
+
+class FakeVtyDaemon(object):
+    """ vty socket server replying to commands with the return code from a map """
+    def __init__(self, path, return_codes=None):
+        self.commands = []
+        self.connections = 0
+        self.return_codes = return_codes or {}
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.bind(path)
+        self.sock.listen(1)
+        self.thread = threading.Thread(target=self.serve)
+        self.thread.daemon = True
+        self.thread.start()
+
+    def serve(self):
+        while True:
+            conn, _ = self.sock.accept()
+            self.connections += 1
+            buf = b''
+            while conn is not None:
+                data = conn.recv(4096)
+                if not data:
+                    break
+                buf += data
+                while b'\0' in buf:
+                    cmd, buf = buf.split(b'\0', 1)
+                    cmd = cmd.decode()
+                    if cmd == 'drop':
+                        conn.close()
+                        conn = None
+                        break
+                    self.commands.append(cmd)
+                    conn.sendall(("output of %s" % cmd).encode() + b'\0\0\0' + bytes([self.return_codes.get(cmd, 0)]))
+
+@pytest.fixture
+def vty_frr(tmp_path, monkeypatch):
+    monkeypatch.setattr(bgpcfgd.frr.FRR, 'VTY_SOCKET_PATH', str(tmp_path / '%s.vty'))
+    monkeypatch.setattr(bgpcfgd.frr, 'run_command', MagicMock(return_value=(0, "vtysh output", "")))
+    f = bgpcfgd.frr.FRR(["bgpd", "zebra", "staticd"])
+    yield f
+    f.close()
+
+def test_get_config_vty(tmp_path, vty_frr):
+    bgpd = FakeVtyDaemon(str(tmp_path / 'bgpd.vty'))
+    assert vty_frr.get_config() == "output of show running-config"
+    assert vty_frr.get_config() == "output of show running-config"
+    assert bgpd.commands == ["enable", "show running-config", "show running-config"]
+    assert bgpd.connections == 1
+    bgpcfgd.frr.run_command.assert_not_called()
+
+def test_get_config_vty_reconnect(tmp_path, vty_frr):
+    bgpd = FakeVtyDaemon(str(tmp_path / 'bgpd.vty'))
+    assert vty_frr.get_config() == "output of show running-config"
+    vty_frr.vty_clients["bgpd"].sock.sendall(b'drop\0')
+    assert vty_frr.get_config() == "output of show running-config"
+    assert bgpd.connections == 2
+
+def test_write_vty(tmp_path, vty_frr):
+    bgpd = FakeVtyDaemon(str(tmp_path / 'bgpd.vty'), {"set src 10.1.0.32": 1})
+    zebra = FakeVtyDaemon(str(tmp_path / 'zebra.vty'), {"set community 12345:12345": 1})
+    res = vty_frr.write("""!
+route-map RM_SET_SRC permit 10
+    set src 10.1.0.32
+!
+ip protocol bgp route-map RM_SET_SRC
+router bgp 65100
+  neighbor PEER_V4 peer-group
+route-map TSA permit 20
+  set community 12345:12345
+""")
+    assert res, "Expect True return value"
+    assert bgpd.commands == ["enable", "configure terminal", "route-map RM_SET_SRC permit 10", "set src 10.1.0.32",
+                             "router bgp 65100", "neighbor PEER_V4 peer-group",
+                             "route-map TSA permit 20", "set community 12345:12345", "end"]
+    assert zebra.commands == ["enable", "configure terminal", "route-map RM_SET_SRC permit 10", "set src 10.1.0.32",
+                              "ip protocol bgp route-map RM_SET_SRC",
+                              "route-map TSA permit 20", "set community 12345:12345", "end"]
+    bgpcfgd.frr.run_command.assert_not_called()
+
+def test_write_vty_end(tmp_path, vty_frr):
+    bgpd = FakeVtyDaemon(str(tmp_path / 'bgpd.vty'))
+    zebra = FakeVtyDaemon(str(tmp_path / 'zebra.vty'))
+    res = vty_frr.write("""router bgp 65100
+  neighbor PEER_V4 peer-group
+end
+ip protocol bgp route-map RM_SET_SRC
+router bgp 65100
+  neighbor PEER_V6 peer-group
+""")
+    assert res, "Expect True return value"
+    assert bgpd.commands == ["enable", "configure terminal", "router bgp 65100", "neighbor PEER_V4 peer-group", "end",
+                             "configure terminal", "router bgp 65100", "neighbor PEER_V6 peer-group", "end"]
+    assert zebra.commands == ["enable", "configure terminal", "ip protocol bgp route-map RM_SET_SRC", "end"]
+    bgpcfgd.frr.run_command.assert_not_called()
+
+@patch('bgpcfgd.frr.log_err')
+def test_write_vty_fail(mocked_log_err, tmp_path, vty_frr):
+    FakeVtyDaemon(str(tmp_path / 'bgpd.vty'), {"neighbor 10.0.0.1 remote-as 65200": 2})
+    res = vty_frr.write("router bgp 65100\n  neighbor 10.0.0.1 remote-as 65200\n")
+    assert not res, "Expect False return value"
+    mocked_log_err.assert_called_with("ConfigMgr::commit(): can't push configuration line 'neighbor 10.0.0.1 remote-as 65200' to 'bgpd', rc='2', output='output of neighbor 10.0.0.1 remote-as 65200'")
+
+def test_write_unknown_command_uses_vtysh(tmp_path, vty_frr):
+    bgpd = FakeVtyDaemon(str(tmp_path / 'bgpd.vty'))
+    res = vty_frr.write("router bgp 65100\n  neighbor PEER_V4 peer-group\nfpm address 127.0.0.1\n")
+    assert res, "Expect True return value"
+    assert bgpd.commands == []
+    assert bgpcfgd.frr.run_command.call_args[0][0][:2] == ["vtysh", "-f"]
+
+def test_restart_peer_groups_vty(tmp_path, vty_frr):
+    bgpd = FakeVtyDaemon(str(tmp_path / 'bgpd.vty'))
+    assert vty_frr.restart_peer_groups(["pg_2", "pg_1"])
+    assert bgpd.commands == ["enable", "clear bgp peer-group pg_1 soft in", "clear bgp peer-group pg_2 soft in"]
+
+def test_wait_for_vty_sockets(tmp_path, vty_frr):
+    def start_daemons():
+        time.sleep(0.2)
+        for daemon in ["bgpd", "zebra", "staticd"]:
+            FakeVtyDaemon(str(tmp_path / ('%s.vty' % daemon)))
+    thr = threading.Thread(target=start_daemons)
+    thr.start()
+    start_time = time.time()
+    vty_frr.wait_for_daemons(5)
+    assert time.time() - start_time < 0.2 + 2 * vty_frr.VTY_WAIT_INTERVAL
+    thr.join()
+    bgpcfgd.frr.run_command.assert_not_called()
+
+def test_wait_for_vty_sockets_fail(tmp_path, vty_frr, monkeypatch):
+    monkeypatch.setattr(bgpcfgd.frr.FRR, 'VTY_WAIT_INTERVAL', 0.1)
+    FakeVtyDaemon(str(tmp_path / 'bgpd.vty'))
+    with pytest.raises(RuntimeError):
+        vty_frr.wait_for_daemons(0.3)
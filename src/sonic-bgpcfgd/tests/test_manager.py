@@ -0,0 +1,63 @@
+from unittest.mock import MagicMock, patch
+
+from bgpcfgd.directory import Directory
+from bgpcfgd.manager import Manager
+
+
+class RecordingMgr(Manager):
+    def __init__(self, common_objs, deps, not_ready=()):
+        super(RecordingMgr, self).__init__(common_objs, deps, "CONFIG_DB", "BGP_NEIGHBOR")
+        self.not_ready = set(not_ready)
+        self.handled = []
+
+    def set_handler(self, key, data):
+        if key in self.not_ready:
+            return False
+        self.handled.append(key)
+        return True
+
+
+def constructor(not_ready=()):
+    common_objs = {
+        'directory': Directory(),
+        'cfg_mgr':   MagicMock(),
+        'constants': {},
+    }
+    deps = [
+        ("CONFIG_DB", "DEVICE_METADATA", "localhost/bgp_asn"),
+        ("CONFIG_DB", "LOOPBACK_INTERFACE", "Loopback0"),
+    ]
+    return RecordingMgr(common_objs, deps, not_ready)
+
+
+@patch('bgpcfgd.manager.swsscommon', MagicMock(SET_COMMAND="SET", DEL_COMMAND="DEL"))
+def test_deferred_until_deps_available():
+    m = constructor()
+    m.handler("10.0.0.1", "SET", {})
+    m.handler("10.0.0.2", "SET", {})
+    assert m.deps_queues == {("CONFIG_DB", "DEVICE_METADATA", "localhost/bgp_asn"): [("10.0.0.1", {}), ("10.0.0.2", {})]}
+
+    m.directory.put("CONFIG_DB", "DEVICE_METADATA", "localhost", {"bgp_asn": "65100"})
+    assert m.handled == []
+    assert m.deps_queues == {("CONFIG_DB", "LOOPBACK_INTERFACE", "Loopback0"): [("10.0.0.1", {}), ("10.0.0.2", {})]}
+
+    m.directory.put("CONFIG_DB", "LOOPBACK_INTERFACE", "Loopback0", {})
+    assert m.handled == ["10.0.0.1", "10.0.0.2"]
+    assert not m.deps_queues
+    assert m.set_queue == []
+
+    m.handler("10.0.0.3", "SET", {})
+    assert m.handled == ["10.0.0.1", "10.0.0.2", "10.0.0.3"]
+
+
+@patch('bgpcfgd.manager.swsscommon', MagicMock(SET_COMMAND="SET", DEL_COMMAND="DEL"))
+def test_not_ready_retried_on_deps_change():
+    m = constructor(not_ready=["10.0.0.1"])
+    m.directory.put("CONFIG_DB", "DEVICE_METADATA", "localhost", {"bgp_asn": "65100"})
+    m.directory.put("CONFIG_DB", "LOOPBACK_INTERFACE", "Loopback0", {})
+    m.handler("10.0.0.1", "SET", {})
+    assert m.set_queue == [("10.0.0.1", {})]
+    m.not_ready.clear()
+    m.directory.put("CONFIG_DB", "DEVICE_METADATA", "localhost", {"bgp_asn": "65100"})
+    assert m.handled == ["10.0.0.1"]
+    assert m.set_queue == []
@@ -0,0 +1,110 @@
+from unittest.mock import MagicMock, patch
+
+import bgpcfgd.runner
+from bgpcfgd.runner import Runner
+
+
+class FakeSubscriber(object):
+    def __init__(self, table_name, events):
+        self.table_name = table_name
+        self.events = events
+
+    def pop(self):
+        if self.events:
+            return self.events.pop(0)
+        return "", "", ()
+
+    def getDbConnector(self):
+        return MagicMock(getDbId=MagicMock(return_value=4))
+
+    def getTableName(self):
+        return self.table_name
+
+
+class FakeSelector(object):
+    TIMEOUT = 1
+    ERROR = 2
+    OBJECT = 0
+
+    def __init__(self, subscriber, bursts):
+        self.subscriber = subscriber
+        self.bursts = bursts
+        self.timeouts = []
+
+    def select(self, timeout):
+        self.timeouts.append(timeout)
+        if not self.bursts:
+            bgpcfgd.runner.g_run = False
+            return self.TIMEOUT, None
+        self.subscriber.events += self.bursts.pop(0)
+        return self.OBJECT, None
+
+
+def run_runner(bursts, **kwargs):
+    swsscommon = MagicMock(SET_COMMAND="SET", DEL_COMMAND="DEL")
+    with patch('bgpcfgd.runner.swsscommon', swsscommon):
+        cfg_mgr = MagicMock()
+        cfg_mgr.commit.return_value = True
+        runner = Runner(cfg_mgr, **kwargs)
+        subscriber = FakeSubscriber("BGP_NEIGHBOR", [])
+        runner.subscribers.add(subscriber)
+        runner.selector = FakeSelector(subscriber, bursts)
+        handler = MagicMock()
+        runner.callbacks[4]["BGP_NEIGHBOR"].append(handler)
+        bgpcfgd.runner.g_run = True
+        try:
+            runner.run()
+        finally:
+            bgpcfgd.runner.g_run = True
+    return runner, handler, cfg_mgr
+
+
+def test_coalesce_events():
+    runner, handler, cfg_mgr = run_runner([
+        [("10.0.0.1", "SET", (("asn", "65200"),)), ("10.0.0.2", "SET", (("asn", "65201"),))],
+        [("10.0.0.1", "SET", (("asn", "65300"),)), ("10.0.0.2", "DEL", ())],
+        [("10.0.0.3", "SET", ()), ("10.0.0.3", "DEL", ()), ("10.0.0.3", "SET", (("asn", "65400"),))],
+    ], coalesce_window=1000)
+    assert [c[0] for c in handler.call_args_list] == [
+        ("10.0.0.1", "SET", {"asn": "65300"}),
+        ("10.0.0.2", "DEL", {}),
+        ("10.0.0.3", "DEL", {}),
+        ("10.0.0.3", "SET", {"asn": "65400"}),
+    ]
+    assert cfg_mgr.commit.call_count == 1
+    assert runner.stats['batches'] == 1
+    assert runner.stats['events_received'] == 7
+    assert runner.stats['events_dispatched'] == 4
+    assert runner.stats['max_batch_size'] == 7
+
+def test_coalesce_events_keep_order():
+    runner, handler, cfg_mgr = run_runner([
+        [("10.0.0.1", "DEL", ()), ("10.0.0.2", "SET", (("asn", "65201"),))],
+        [("10.0.0.3", "SET", (("asn", "65300"),)), ("10.0.0.1", "SET", (("asn", "65200"),))],
+        [("10.0.0.3", "SET", (("asn", "65301"),))],
+    ], coalesce_window=1000)
+    # the superseded event is dropped, the other events are handled in the order of arrival
+    assert [c[0] for c in handler.call_args_list] == [
+        ("10.0.0.1", "DEL", {}),
+        ("10.0.0.2", "SET", {"asn": "65201"}),
+        ("10.0.0.1", "SET", {"asn": "65200"}),
+        ("10.0.0.3", "SET", {"asn": "65301"}),
+    ]
+    assert cfg_mgr.commit.call_count == 1
+
+def test_coalesce_max_events():
+    runner, handler, cfg_mgr = run_runner([
+        [("10.0.0.1", "SET", ())],
+        [("10.0.0.2", "SET", ())],
+        [("10.0.0.3", "SET", ())],
+    ], coalesce_window=1000, coalesce_max_events=2)
+    assert cfg_mgr.commit.call_count == 2
+    assert runner.stats['max_batch_size'] == 2
+
+def test_no_coalescing():
+    runner, handler, cfg_mgr = run_runner([
+        [("10.0.0.1", "SET", ())],
+        [("10.0.0.1", "DEL", ())],
+    ], coalesce_window=0)
+    assert [c[0][1] for c in handler.call_args_list] == ["SET", "DEL"]
+    assert cfg_mgr.commit.call_count == 2
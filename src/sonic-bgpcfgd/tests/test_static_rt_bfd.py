@@ -1,16 +1,19 @@
-from unittest.mock import patch
-#from unittest.mock import MagicMock, patch
+import sys
+import time
+from unittest.mock import MagicMock, patch
 
 from staticroutebfd.main import *
 from swsscommon import swsscommon
 
+@patch('swsscommon.swsscommon.RedisPipeline.__init__')
 @patch('swsscommon.swsscommon.DBConnector.__init__')
 @patch('swsscommon.swsscommon.ProducerStateTable.__init__')
 @patch('swsscommon.swsscommon.Table.__init__')
-def constructor(mock_db, mock_producer, mock_tbl):
+def constructor(mock_db, mock_producer, mock_tbl, mock_pipe):
     mock_db.return_value = None
     mock_producer.return_value = None
     mock_tbl.return_value = None
+    mock_pipe.return_value = None
 
     srt_bfd = StaticRouteBfd()
     return srt_bfd
@@ -694,5 +697,94 @@ def test_set_bfd_change_no_hold():
         {'set_default:2.2.2.0/24': {'nexthop': '192.168.2.2,192.168.1.2,192.168.3.2 ', 'ifname': 'if2,if1,if3', 'nexthop-vrf': 'default,default,default', 'expiry': 'false'}}
     )
 
+def test_bfd_pending_interface_index():
+    dut = constructor()
+    set_del_test(dut, "srt",
+        "SET",
+        ("2.2.2.0/24", {
+            "bfd": "true",
+            "nexthop": "192.168.1.2, 192.168.2.2",
+            "ifname": "if1, if2",
+        }),
+        {},
+        {}
+    )
+    assert dut.local_db[LOCAL_BFD_PENDING_INTF_TABLE] == {
+        "if1": {"if1_default:default:192.168.1.2"},
+        "if2": {"if2_default:default:192.168.2.2"},
+    }
+    set_del_test(dut, "intf",
+        "SET",
+        ("if2|192.168.2.1/24", {}
+        ),
+        {"set_default:default:192.168.2.2" : {'multihop': 'false', 'rx_interval': '50', 'tx_interval': '50', 'multiplier': '3', 'local_addr': '192.168.2.1'}},
+        {}
+    )
+    assert dut.local_db[LOCAL_BFD_PENDING_INTF_TABLE] == {"if1": {"if1_default:default:192.168.1.2"}}
+    assert list(dut.local_db[LOCAL_BFD_PENDING_TABLE].keys()) == ["if1_default:default:192.168.1.2"]
 
-
+def test_flush_appl_db():
+    dut = constructor()
+    dut.static_route_appl_tbl = MagicMock()
+    dut.appl_pipe = MagicMock()
+    dut.set_static_route_into_appl_db("default:2.2.2.0/24", {"nexthop": "192.168.1.2"})
+    dut.set_static_route_into_appl_db("default:2.2.2.0/24", {"nexthop": "192.168.1.2,192.168.2.2"})
+    dut.set_static_route_into_appl_db("default:3.3.3.0/24", {"nexthop": "192.168.1.2"})
+    dut.del_static_route_from_appl_db("default:3.3.3.0/24")
+    dut.flush_appl_db()
+    assert dut.static_route_appl_tbl.set.call_count == 1
+    assert dut.static_route_appl_tbl.set.call_args[0][0] == "default:2.2.2.0/24"
+    assert list(dut.static_route_appl_tbl.set.call_args[0][1]) == [("nexthop", "192.168.1.2,192.168.2.2")]
+    dut.static_route_appl_tbl.delete.assert_called_once_with("default:3.3.3.0/24")
+    dut.appl_pipe.flush.assert_called_once()
+    assert dut.static_route_appl_pending == {}
+
+
+def scale_setup(n_routes, n_nexthops):
+    """ Create a StaticRouteBfd with n_routes bfd static routes, each of them using 2 of n_nexthops nexthops """
+    dut = constructor()
+    dut.bfd_appl_tbl = MagicMock()
+    dut.static_route_appl_tbl = MagicMock()
+    dut.appl_pipe = MagicMock()
+    dut.interface_set_handler("if1|10.0.0.1/16", {})
+    for i in range(n_routes):
+        nh1 = "10.0.%d.%d" % (i % n_nexthops // 250, i % n_nexthops % 250 + 2)
+        nh2 = "10.0.%d.%d" % ((i + 1) % n_nexthops // 250, (i + 1) % n_nexthops % 250 + 2)
+        dut.static_route_set_handler("100.%d.%d.0/24" % (i // 256, i % 256), {
+            "bfd": "true",
+            "nexthop": "%s,%s" % (nh1, nh2),
+            "ifname": "if1,if1",
+        })
+    for i in range(n_nexthops):
+        dut.bfd_state_set_handler("10.0.%d.%d" % (i // 250, i % 250 + 2), {"state": "Up"})
+    dut.flush_appl_db()
+    dut.static_route_appl_tbl.reset_mock()
+    return dut
+
+def test_bfd_flap_scale():
+    dut = scale_setup(1000, 100)
+    dut.bfd_state_set_handler("10.0.0.2", {"state": "Down"})
+    dut.bfd_state_set_handler("10.0.0.2", {"state": "Up"})
+    dut.flush_appl_db()
+    # every route using the nexthop is written once for the batch
+    assert dut.static_route_appl_tbl.set.call_count == 20
+    assert dut.appl_pipe.flush.call_count == 2
+
+
+def benchmark(n_routes=10000, n_nexthops=300):
+    """ Measure handling of a BFD flap of one nexthop with n_routes static routes """
+    start = time.time()
+    dut = scale_setup(n_routes, n_nexthops)
+    print("setup of %d routes over %d nexthops: %.3f s" % (n_routes, n_nexthops, time.time() - start))
+    start = time.time()
+    for i in range(n_nexthops):
+        nh = "10.0.%d.%d" % (i // 250, i % 250 + 2)
+        dut.bfd_state_set_handler(nh, {"state": "Down"})
+        dut.bfd_state_set_handler(nh, {"state": "Up"})
+        dut.flush_appl_db()
+    elapsed = time.time() - start
+    print("flap of each nexthop: %.1f us/flap, %d routes written" % (elapsed * 1e6 / n_nexthops, dut.static_route_appl_tbl.set.call_count))
+
+
+if __name__ == '__main__':
+    benchmark(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,259 @@
+"""
+Layered view of the configuration data sonic-cfggen collects from its
+input sources (hwsku, json, yang, minigraph, yaml, additional data, DB and
+platform info).
+
+Instead of deep-copying every source into one dict, each source is kept as
+a layer and lookups merge the layers on demand, with the same result as
+applying deep_update() for every layer in order: dicts are merged key by
+key and any other value replaces what the earlier layers had, so the last
+writer wins per leaf.
+"""
+
+try:
+    from collections.abc import Mapping
+except ImportError:
+    from collections import Mapping
+
+from functools import partial
+
+import jinja2
+import jinja2.runtime
+
+
+class LayeredConfig(Mapping):
+    """
+    Read-only mapping merging a list of dict layers, later layers taking
+    precedence. Values found in a single layer are returned as is, values
+    merged from several dict layers are returned as LayeredConfig and are
+    resolved once per key. to_dict() returns a copy which may be changed.
+    """
+    def __init__(self, layers=None):
+        self.layers = list(layers) if layers else []
+        self.resolved = {}
+
+    def add_layer(self, layer):
+        """ Add a dict on top of the current layers """
+        self.layers.append(layer)
+        self.resolved.clear()
+
+    def __getitem__(self, key):
+        if key in self.resolved:
+            return self.resolved[key]
+
+        dict_values = []
+        for layer in reversed(self.layers):
+            if key not in layer:
+                continue
+            value = layer[key]
+            if not isinstance(value, dict):
+                if not dict_values:
+                    return value
+                break
+            dict_values.append(value)
+
+        if not dict_values:
+            raise KeyError(key)
+        if len(dict_values) == 1:
+            value = dict_values[0]
+        else:
+            value = LayeredConfig(reversed(dict_values))
+        self.resolved[key] = value
+        return value
+
+    def __contains__(self, key):
+        return any(key in layer for layer in self.layers)
+
+    def __iter__(self):
+        seen = set()
+        for layer in self.layers:
+            for key in layer:
+                if key not in seen:
+                    seen.add(key)
+                    yield key
+
+    def __len__(self):
+        return len(set().union(*self.layers)) if self.layers else 0
+
+    def __bool__(self):
+        # Stop at the first non empty layer, rather than counting every key
+        return any(self.layers)
+
+    __nonzero__ = __bool__
+
+    def __repr__(self):
+        return repr(self.to_dict())
+
+    def copy(self):
+        """ Shallow copy into a dict, as returned by dict.copy() """
+        return dict(self)
+
+    def to_dict(self):
+        """ Merge all layers into a new dict """
+        return to_dict(self)
+
+
+def deep_update(dst, src):
+    """ Deep update of dst dict with contest of src dict"""
+    pending_nodes = [(dst, src)]
+    while len(pending_nodes) > 0:
+        d, s = pending_nodes.pop(0)
+        for key, value in s.items():
+            if isinstance(value, dict):
+                node = d.setdefault(key, type(value)())
+                pending_nodes.append((node, value))
+            else:
+                d[key] = value
+    return dst
+
+
+def to_dict(value):
+    """
+    Materialize a LayeredConfig into new dicts. Dicts of the layers are
+    copied too, as deep_update() does, so the result can be changed
+    without changing the layers. Other values are shared.
+    """
+    if isinstance(value, dict):
+        result = type(value)()
+        for key, item in value.items():
+            result[key] = to_dict(item)
+        return result
+    if not isinstance(value, LayeredConfig):
+        return value
+    first_layer = value.layers[0] if value.layers else None
+    result = type(first_layer)() if isinstance(first_layer, dict) else {}
+    # Iterate over every layer before looking up values, so that a lazy
+    # layer is read as a whole rather than key by key
+    for key in list(value):
+        result[key] = to_dict(value[key])
+    return result
+
+
+class OverlayConfig(Mapping):
+    """
+    Read-only mapping of variables over a config mapping, as
+    dict(config, **variables) but without copying the config. Variables
+    hide the config entries of the same name, nothing is merged.
+    """
+    def __init__(self, variables, config):
+        self.variables = variables
+        self.config = config
+
+    def __getitem__(self, key):
+        if key in self.variables:
+            return self.variables[key]
+        return self.config[key]
+
+    def __contains__(self, key):
+        return key in self.variables or key in self.config
+
+    def __iter__(self):
+        for key in self.variables:
+            yield key
+        for key in self.config:
+            if key not in self.variables:
+                yield key
+
+    def __len__(self):
+        return len(set(self.variables).union(self.config))
+
+    def __bool__(self):
+        return bool(self.variables) or bool(self.config)
+
+    __nonzero__ = __bool__
+
+
+class LayeredContext(jinja2.runtime.Context):
+    """
+    Template context passed as is to included and imported templates.
+    jinja2 copies the context into a dict there, which would read every
+    table of a lazily loaded CONFIG_DB.
+    """
+    def get_all(self):
+        if not self.vars:
+            return self.parent
+        return OverlayConfig(self.vars, self.parent)
+
+
+class LayeredTemplate(jinja2.Template):
+    """
+    Template adding the local variables of an include or an import with
+    context over the shared context, instead of copying it into a dict
+    """
+    def new_context(self, vars=None, shared=False, locals=None):
+        if shared and locals and vars is not None:
+            variables = dict((key, value) for key, value in locals.items() if value is not jinja2.runtime.missing)
+            vars = OverlayConfig(variables, vars)
+            locals = None
+        return super(LayeredTemplate, self).new_context(vars, shared, locals)
+
+
+def get_tables(configdb, table_names):
+    """ Read the given CONFIG_DB tables with one get_table() each, leaving out empty tables """
+    tables = {}
+    for table_name in table_names:
+        table = configdb.get_table(table_name)
+        if table:
+            tables[table_name] = table
+    return tables
+
+
+class LazyConfigDB(Mapping):
+    """
+    CONFIG_DB content as a layer, each table being read the first time it
+    is looked up. A table without entries is absent. read_tables(names)
+    returns the tables among names which have entries, the default reads
+    them with get_tables(). Iterating over the tables reads the
+    whole database at once with get_config().
+    """
+    def __init__(self, configdb, read_tables=None):
+        self.configdb = configdb
+        self.read_tables = read_tables if read_tables is not None else partial(get_tables, configdb)
+        self.tables = {}
+        self.absent = set()
+        self.complete = False
+
+    def prefetch(self, table_names):
+        """ Read the given tables which were not read yet, with one read_tables() call """
+        if self.complete:
+            return
+        table_names = set(table_names).difference(self.tables, self.absent)
+        if not table_names:
+            return
+        tables = self.read_tables(sorted(table_names))
+        for table_name in table_names:
+            if tables.get(table_name):
+                self.tables[table_name] = tables[table_name]
+            else:
+                self.absent.add(table_name)
+
+    def load(self):
+        """ Read the whole CONFIG_DB """
+        if not self.complete:
+            self.tables = self.configdb.get_config()
+            self.absent = set()
+            self.complete = True
+
+    def __getitem__(self, table_name):
+        self.prefetch([table_name])
+        return self.tables[table_name]
+
+    def __contains__(self, table_name):
+        self.prefetch([table_name])
+        return table_name in self.tables
+
+    def __iter__(self):
+        self.load()
+        return iter(self.tables)
+
+    def __len__(self):
+        self.load()
+        return len(self.tables)
+
+    def __bool__(self):
+        # Only read the whole CONFIG_DB when no table was found yet
+        if not self.tables:
+            self.load()
+        return bool(self.tables)
+
+    __nonzero__ = __bool__
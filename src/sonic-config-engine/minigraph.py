@@ -1,8 +1,12 @@
 from __future__ import print_function
 
+import fcntl
+import glob
+import hashlib
 import ipaddress
 import math
 import os
+import pickle
 import sys
 import json
 import jinja2
@@ -44,6 +48,25 @@ ns1 = "http://schemas.datacontract.org/2004/07/Microsoft.Search.Autopilot.Evolut
 ns2 = "Microsoft.Search.Autopilot.NetMux"
 ns3 = "http://www.w3.org/2001/XMLSchema-instance"
 
+class QNameTable(dict):
+    """ Tags ('{namespace}LocalName') of the elements of one xml namespace.
+
+    Each tag is built once on first use, instead of creating a QName and
+    converting it to a string every time an element is looked up.
+    """
+    def __init__(self, namespace):
+        super(QNameTable, self).__init__()
+        self.namespace = namespace
+
+    def __missing__(self, local_name):
+        tag = self[local_name] = str(QName(self.namespace, local_name))
+        return tag
+
+ns_tags = QNameTable(ns)
+ns1_tags = QNameTable(ns1)
+ns2_tags = QNameTable(ns2)
+ns3_tags = QNameTable(ns3)
+
 # Device types
 spine_chassis_frontend_role = 'SpineChassisFrontendRouter'
 chassis_backend_role = 'ChassisBackendRouter'
@@ -68,6 +91,11 @@ dualtor_cable_types = ["active-active", "active-standby"]
 # Default Virtual Network Index (VNI)
 vni_default = 8000
 
+# Persistent cache of parsed minigraph sections
+MINIGRAPH_CACHE_DIR = '/var/cache/sonic/minigraph'
+MINIGRAPH_CACHE_VERSION = 1
+MINIGRAPH_CACHE_MAX_FILES = 8
+
 # Defination of custom acl table types
 acl_table_type_defination = {
     'BMCDATA': {
@@ -141,17 +169,18 @@ def get_voq_intf_attributes(ports):
 def get_chassis_type_and_hostname(root, hname):
     chassis_type = None
     chassis_hostname = None
+    if hname is None:
+        return chassis_type, chassis_hostname
     for child in root:
-        if child.tag == str(QName(ns, "MetadataDeclaration")):
-            devices = child.find(str(QName(ns, "Devices")))
-            for device_meta in devices.findall(str(QName(ns1, "DeviceMetadata"))):
-                device_name = device_meta.find(str(QName(ns1, "Name"))).text
+        if child.tag == ns_tags["MetadataDeclaration"]:
+            for device_meta in get_device_metadata(child, hname):
+                device_name = device_meta.find(ns1_tags["Name"]).text
                 if device_name != hname:
                     continue
-                properties = device_meta.find(str(QName(ns1, "Properties")))
-                for device_property in properties.findall(str(QName(ns1, "DeviceProperty"))):
-                    name = device_property.find(str(QName(ns1, "Name"))).text
-                    value = device_property.find(str(QName(ns1, "Value"))).text
+                properties = device_meta.find(ns1_tags["Properties"])
+                for device_property in properties.findall(ns1_tags["DeviceProperty"]):
+                    name = device_property.find(ns1_tags["Name"]).text
+                    value = device_property.find(ns1_tags["Value"]).text
                     if name == "ForwardingMethod":
                         chassis_type = value
                     if name == "ParentRouter":
@@ -184,6 +213,42 @@ def normailize_port_map_for_chassis(asic_name, port_map):
 #
 ###############################################################################
 
+# Lookup tables of minigraph sections, keyed by section element. Cleared
+# whenever a new minigraph document is parsed.
+_section_indexes = {}
+
+def _get_section_index(section, kind, build):
+    key = (section, kind)
+    if key not in _section_indexes:
+        _section_indexes[key] = build(section)
+    return _section_indexes[key]
+
+def _build_device_metadata_index(meta):
+    index = {}
+    device_metas = meta.find(ns_tags["Devices"])
+    for device in device_metas.findall(ns1_tags["DeviceMetadata"]):
+        index.setdefault(device.find(ns1_tags["Name"]).text.lower(), []).append(device)
+    return index
+
+def _build_png_device_index(png):
+    index = {}
+    devices = png.find(ns_tags["Devices"])
+    if devices is not None:
+        for device in devices.findall(ns_tags["Device"]):
+            hostname = device.find(ns_tags["Hostname"])
+            if hostname is not None and hostname.text is not None:
+                index.setdefault(hostname.text.lower(), []).append(device)
+    return index
+
+def get_device_metadata(meta, hname):
+    """ DeviceMetadata elements of device hname (case insensitive) in a MetadataDeclaration section """
+    return _get_section_index(meta, "DeviceMetadata", _build_device_metadata_index).get(hname.lower(), [])
+
+def get_png_devices(png, hname):
+    """ Device elements of device hname (case insensitive) in a PngDec section """
+    return _get_section_index(png, "Device", _build_png_device_index).get(hname.lower(), [])
+
+
 def parse_chassis_metadata(root,hname, lcname):
     """
     Parses the chassis metadata from the XML root.
@@ -207,16 +272,16 @@ def parse_chassis_metadata(root,hname, lcname):
     max_num_core = None
     num_voq = None
     for child in root:
-        if child.tag == str(QName(ns, "MetadataDeclaration")):
-            devices = child.find(str(QName(ns, "Devices")))
-            for device_meta in devices.findall(str(QName(ns1, "DeviceMetadata"))):
+        if child.tag == ns_tags["MetadataDeclaration"]:
+            devices = child.find(ns_tags["Devices"])
+            for device_meta in devices.findall(ns1_tags["DeviceMetadata"]):
                 slot_index = None
-                device_name = device_meta.find(str(QName(ns1, "Name"))).text
+                device_name = device_meta.find(ns1_tags["Name"]).text
 
-                properties = device_meta.find(str(QName(ns1, "Properties")))
-                for device_property in properties.findall(str(QName(ns1, "DeviceProperty"))):
-                    name = device_property.find(str(QName(ns1, "Name"))).text
-                    value = device_property.find(str(QName(ns1, "Value"))).text
+                properties = device_meta.find(ns1_tags["Properties"])
+                for device_property in properties.findall(ns1_tags["DeviceProperty"]):
+                    name = device_property.find(ns1_tags["Name"]).text
+                    value = device_property.find(ns1_tags["Value"]).text
                     if device_name == hname or device_name == lcname:
                         if name == "TotalCountOfVoQ":
                             num_voq = value
@@ -254,15 +319,15 @@ def parse_chassis_deviceinfo_intf_metadata(device_info, chassis_linecards_info,
     port_default_speed = {}
     system_port_id = 1
 
-    interface_metadata = device_info.find(str(QName(ns, "InterfaceMetadata")))
-    for interface in interface_metadata.findall(str(QName(ns1, "DeviceInterfaceMetadata"))):
+    interface_metadata = device_info.find(ns_tags["InterfaceMetadata"])
+    for interface in interface_metadata.findall(ns1_tags["DeviceInterfaceMetadata"]):
         linecard_name = None
         asic_name = None
         core_port_id = None
         core_id = None
         switch_id = None
         slot_index = None
-        intf_name = interface.find(str(QName(ns1, "InterfaceName"))).text
+        intf_name = interface.find(ns1_tags["InterfaceName"]).text
         # ignore the managment interfaces
         if any(mgmt_intf in intf_name for mgmt_intf in ['Management', 'console']) == True:
             continue
@@ -284,16 +349,16 @@ def parse_chassis_deviceinfo_intf_metadata(device_info, chassis_linecards_info,
                   (intf_name), file=sys.stderr)
             continue
 
-        intf_properties = interface.find(str(QName(ns1, "Properties")))
+        intf_properties = interface.find(ns1_tags["Properties"])
         if intf_properties is None:
             print('Warning cannot find interface porperties  for interface' %
                   (intf_name), file=sys.stderr)
             continue
 
-        for intf_property in intf_properties.findall(str(QName(ns1, "InterfaceProperty"))):
+        for intf_property in intf_properties.findall(ns1_tags["InterfaceProperty"]):
 
-            name = intf_property.find(str(QName(ns1, "Name"))).text
-            value = intf_property.find(str(QName(ns1, "Value"))).text
+            name = intf_property.find(ns1_tags["Name"]).text
+            value = intf_property.find(ns1_tags["Value"]).text
             if name == "CoreId":
                 core_id = value
             if name == "SlotIndex":
@@ -374,14 +439,14 @@ def parse_chassis_deviceinfo_intf_metadata(device_info, chassis_linecards_info,
 
 def parse_chassis_deviceinfo_voq_int_intfs(device_info):
     backend_intf_map = {}
-    backend_interfaces = device_info.find(str(QName(ns, "BackendFabricInterfaces"))).findall(
-        str(QName(ns1, "BackendFabricInterface")))
+    backend_interfaces = device_info.find(ns_tags["BackendFabricInterfaces"]).findall(
+        ns1_tags["BackendFabricInterface"])
     voq_internal_intf_attr = {}
     for backend_interface in backend_interfaces:
-        intf_name = backend_interface.find(str(QName(ns, "InterfaceName"))).text
+        intf_name = backend_interface.find(ns_tags["InterfaceName"]).text
         if any(voq_intf in intf_name.lower() for voq_intf in voq_internal_intfs) == True:
-            sonic_name = backend_interface.find(str(QName(ns, "SonicName"))).text
-            speed = backend_interface.find(str(QName(ns, "Speed"))).text
+            sonic_name = backend_interface.find(ns_tags["SonicName"]).text
+            speed = backend_interface.find(ns_tags["Speed"]).text
             backend_intf_map[intf_name] = {'sonic_name': sonic_name, 'speed': speed}
     return backend_intf_map
 
@@ -389,16 +454,16 @@ def parse_chassis_deviceinfo_voq_int_intfs(device_info):
 def parse_chassis_deviceinfo_intfs(device_info):
     interface_map = {}
 
-    interfaces = device_info.find(str(QName(ns, "EthernetInterfaces"))).findall(
-        str(QName(ns1, "EthernetInterface")))
+    interfaces = device_info.find(ns_tags["EthernetInterfaces"]).findall(
+        ns1_tags["EthernetInterface"])
 
     for interface in interfaces:
         # the interface name is at the chassis level, so the interface name will have
         # the slot information. It will be of format
         # Ethernet<slot_index>/port
-        intf_name = interface.find(str(QName(ns, "InterfaceName"))).text
-        sonic_name = interface.find(str(QName(ns, "SonicName"))).text
-        speed = interface.find(str(QName(ns, "Speed"))).text
+        intf_name = interface.find(ns_tags["InterfaceName"]).text
+        sonic_name = interface.find(ns_tags["SonicName"]).text
+        speed = interface.find(ns_tags["Speed"]).text
         interface_map[intf_name] = {'sonic_name': sonic_name, 'speed': speed}
     return interface_map
 
@@ -409,8 +474,8 @@ def parse_chassis_deviceinfo(deviceinfos, chassis_linecards_info, chassis_hwsku,
     chassis_name = None
     port_default_speed = {}
 
-    for device_info in deviceinfos.findall(str(QName(ns, "DeviceInfo"))):
-        dev_sku = device_info.find(str(QName(ns, "HwSku"))).text
+    for device_info in deviceinfos.findall(ns_tags["DeviceInfo"]):
+        dev_sku = device_info.find(ns_tags["HwSku"]).text
         if dev_sku == chassis_hwsku:
             # The chassis device_info for sonic chassiss will 3 sections
             # level information
@@ -478,31 +543,31 @@ def parse_device(device):
     slice_type = None
 
     for node in device:
-        if node.tag == str(QName(ns, "Address")):
-            lo_prefix = node.find(str(QName(ns2, "IPPrefix"))).text
-        elif node.tag == str(QName(ns, "AddressV6")):
-            lo_prefix_v6 = node.find(str(QName(ns2, "IPPrefix"))).text
-        elif node.tag == str(QName(ns, "ManagementAddress")):
-            mgmt_prefix = node.find(str(QName(ns2, "IPPrefix"))).text
-        elif node.tag == str(QName(ns, "ManagementAddressV6")):
-            mgmt_prefix_v6 = node.find(str(QName(ns2, "IPPrefix"))).text
-        elif node.tag == str(QName(ns, "Hostname")):
+        if node.tag == ns_tags["Address"]:
+            lo_prefix = node.find(ns2_tags["IPPrefix"]).text
+        elif node.tag == ns_tags["AddressV6"]:
+            lo_prefix_v6 = node.find(ns2_tags["IPPrefix"]).text
+        elif node.tag == ns_tags["ManagementAddress"]:
+            mgmt_prefix = node.find(ns2_tags["IPPrefix"]).text
+        elif node.tag == ns_tags["ManagementAddressV6"]:
+            mgmt_prefix_v6 = node.find(ns2_tags["IPPrefix"]).text
+        elif node.tag == ns_tags["Hostname"]:
             name = node.text
-        elif node.tag == str(QName(ns, "HwSku")):
+        elif node.tag == ns_tags["HwSku"]:
             hwsku = node.text
-        elif node.tag == str(QName(ns, "DeploymentId")):
+        elif node.tag == ns_tags["DeploymentId"]:
             deployment_id = node.text
-        elif node.tag == str(QName(ns, "ElementType")):
+        elif node.tag == ns_tags["ElementType"]:
             d_type = node.text
-        elif node.tag == str(QName(ns, "ClusterName")):
+        elif node.tag == ns_tags["ClusterName"]:
             cluster = node.text
-        elif node.tag == str(QName(ns, "SubType")):
+        elif node.tag == ns_tags["SubType"]:
             d_subtype = node.text
-        elif node.tag == str(QName(ns, "AssociatedSliceStr")) and node.text and "AZNG_Production" in node.text:
+        elif node.tag == ns_tags["AssociatedSliceStr"] and node.text and "AZNG_Production" in node.text:
             slice_type = "AZNG_Production"
 
-    if d_type is None and str(QName(ns3, "type")) in device.attrib:
-        d_type = device.attrib[str(QName(ns3, "type"))]
+    if d_type is None and ns3_tags["type"] in device.attrib:
+        d_type = device.attrib[ns3_tags["type"]]
 
     return (lo_prefix, lo_prefix_v6, mgmt_prefix, mgmt_prefix_v6, name, hwsku, d_type, deployment_id, cluster, d_subtype, slice_type)
 
@@ -587,16 +652,16 @@ def parse_png(png, hname, dpg_ecmp_content = None):
     NEIGH = {}
 
     for child in png:
-        if child.tag == str(QName(ns, "DeviceInterfaceLinks")):
-            for link in child.findall(str(QName(ns, "DeviceLinkBase"))):
-                linktype = link.find(str(QName(ns, "ElementType"))).text
+        if child.tag == ns_tags["DeviceInterfaceLinks"]:
+            for link in child.findall(ns_tags["DeviceLinkBase"]):
+                linktype = link.find(ns_tags["ElementType"]).text
                 if linktype == "DeviceSerialLink":
-                    enddevice = link.find(str(QName(ns, "EndDevice"))).text
-                    endport = link.find(str(QName(ns, "EndPort"))).text
-                    startdevice = link.find(str(QName(ns, "StartDevice"))).text
-                    startport = link.find(str(QName(ns, "StartPort"))).text
-                    baudrate = link.find(str(QName(ns, "Bandwidth"))).text
-                    flowcontrol = 1 if link.find(str(QName(ns, "FlowControl"))) is not None and link.find(str(QName(ns, "FlowControl"))).text == 'true' else 0
+                    enddevice = link.find(ns_tags["EndDevice"]).text
+                    endport = link.find(ns_tags["EndPort"]).text
+                    startdevice = link.find(ns_tags["StartDevice"]).text
+                    startport = link.find(ns_tags["StartPort"]).text
+                    baudrate = link.find(ns_tags["Bandwidth"]).text
+                    flowcontrol = 1 if link.find(ns_tags["FlowControl"]) is not None and link.find(ns_tags["FlowControl"]).text == 'true' else 0
                     if enddevice.lower() == hname.lower() and endport.isdigit():
                         console_ports[endport] = {
                             'remote_device': startdevice,
@@ -612,18 +677,18 @@ def parse_png(png, hname, dpg_ecmp_content = None):
                     continue
 
                 if linktype == "DeviceInterfaceLink":
-                    endport = link.find(str(QName(ns, "EndPort"))).text
-                    startdevice = link.find(str(QName(ns, "StartDevice"))).text
+                    endport = link.find(ns_tags["EndPort"]).text
+                    startdevice = link.find(ns_tags["StartDevice"]).text
                     port_device_map[endport] = startdevice
 
                 if linktype != "DeviceInterfaceLink" and linktype != "UnderlayInterfaceLink" and linktype != "DeviceMgmtLink":
                     continue
 
-                enddevice = link.find(str(QName(ns, "EndDevice"))).text
-                endport = link.find(str(QName(ns, "EndPort"))).text
-                startdevice = link.find(str(QName(ns, "StartDevice"))).text
-                startport = link.find(str(QName(ns, "StartPort"))).text
-                bandwidth_node = link.find(str(QName(ns, "Bandwidth")))
+                enddevice = link.find(ns_tags["EndDevice"]).text
+                endport = link.find(ns_tags["EndPort"]).text
+                startdevice = link.find(ns_tags["StartDevice"]).text
+                startport = link.find(ns_tags["StartPort"]).text
+                bandwidth_node = link.find(ns_tags["Bandwidth"])
                 bandwidth = bandwidth_node.text if bandwidth_node is not None else None
                 if enddevice.lower() == hname.lower():
                     if endport in port_alias_map:
@@ -640,8 +705,8 @@ def parse_png(png, hname, dpg_ecmp_content = None):
                     if bandwidth:
                         port_speeds[startport] = bandwidth
 
-        if child.tag == str(QName(ns, "Devices")):
-            for device in child.findall(str(QName(ns, "Device"))):
+        if child.tag == ns_tags["Devices"]:
+            for device in child.findall(ns_tags["Device"]):
                 (lo_prefix, lo_prefix_v6, mgmt_prefix, mgmt_prefix_v6, name, hwsku, d_type, deployment_id, cluster, d_subtype, slice_type) = \
                                         parse_device(device)
                 device_data = {}
@@ -667,29 +732,29 @@ def parse_png(png, hname, dpg_ecmp_content = None):
                     device_data['slice_type'] = slice_type
                 devices[name] = device_data
 
-        if child.tag == str(QName(ns, "DeviceInterfaceLinks")):
-            for if_link in child.findall(str(QName(ns, 'DeviceLinkBase'))):
-                if str(QName(ns3, "type")) in if_link.attrib:
-                    link_type = if_link.attrib[str(QName(ns3, "type"))]
+        if child.tag == ns_tags["DeviceInterfaceLinks"]:
+            for if_link in child.findall(ns_tags["DeviceLinkBase"]):
+                if ns3_tags["type"] in if_link.attrib:
+                    link_type = if_link.attrib[ns3_tags["type"]]
                     if link_type == 'DeviceSerialLink':
                         for node in if_link:
-                            if node.tag == str(QName(ns, "EndPort")):
+                            if node.tag == ns_tags["EndPort"]:
                                 console_port = node.text.split()[-1]
-                            elif node.tag == str(QName(ns, "EndDevice")):
+                            elif node.tag == ns_tags["EndDevice"]:
                                 console_dev = node.text
                     elif link_type == 'DeviceMgmtLink':
                         for node in if_link:
-                            if node.tag == str(QName(ns, "EndPort")):
+                            if node.tag == ns_tags["EndPort"]:
                                 mgmt_port = node.text.split()[-1]
-                            elif node.tag == str(QName(ns, "EndDevice")):
+                            elif node.tag == ns_tags["EndDevice"]:
                                 mgmt_dev = node.text
 
 
-        if child.tag == str(QName(ns, "DeviceInterfaceLinks")):
-            for link in child.findall(str(QName(ns, 'DeviceLinkBase'))):
-                if link.find(str(QName(ns, "ElementType"))).text == "LogicalLink":
-                    intf_name = link.find(str(QName(ns, "EndPort"))).text
-                    start_device = link.find(str(QName(ns, "StartDevice"))).text
+        if child.tag == ns_tags["DeviceInterfaceLinks"]:
+            for link in child.findall(ns_tags["DeviceLinkBase"]):
+                if link.find(ns_tags["ElementType"]).text == "LogicalLink":
+                    intf_name = link.find(ns_tags["EndPort"]).text
+                    start_device = link.find(ns_tags["StartDevice"]).text
                     if intf_name in port_alias_map:
                         intf_name = port_alias_map[intf_name]
 
@@ -710,11 +775,11 @@ def parse_png(png, hname, dpg_ecmp_content = None):
 def parse_asic_external_link(link, asic_name, hostname):
     neighbors = {}
     port_speeds = {}
-    enddevice = link.find(str(QName(ns, "EndDevice"))).text
-    endport = link.find(str(QName(ns, "EndPort"))).text
-    startdevice = link.find(str(QName(ns, "StartDevice"))).text
-    startport = link.find(str(QName(ns, "StartPort"))).text
-    bandwidth_node = link.find(str(QName(ns, "Bandwidth")))
+    enddevice = link.find(ns_tags["EndDevice"]).text
+    endport = link.find(ns_tags["EndPort"]).text
+    startdevice = link.find(ns_tags["StartDevice"]).text
+    startport = link.find(ns_tags["StartPort"]).text
+    bandwidth_node = link.find(ns_tags["Bandwidth"])
     bandwidth = bandwidth_node.text if bandwidth_node is not None else None
     # if chassis internal is false, the interface name will be
     # interface alias which should be converted to asic port name
@@ -736,11 +801,11 @@ def parse_asic_external_link(link, asic_name, hostname):
 def parse_asic_internal_link(link, asic_name, hostname):
     neighbors = {}
     port_speeds = {}
-    enddevice = link.find(str(QName(ns, "EndDevice"))).text
-    endport = link.find(str(QName(ns, "EndPort"))).text
-    startdevice = link.find(str(QName(ns, "StartDevice"))).text
-    startport = link.find(str(QName(ns, "StartPort"))).text
-    bandwidth_node = link.find(str(QName(ns, "Bandwidth")))
+    enddevice = link.find(ns_tags["EndDevice"]).text
+    endport = link.find(ns_tags["EndPort"]).text
+    startdevice = link.find(ns_tags["StartDevice"]).text
+    startport = link.find(ns_tags["StartPort"]).text
+    bandwidth_node = link.find(ns_tags["Bandwidth"])
     bandwidth = bandwidth_node.text if bandwidth_node is not None else None
     if ((enddevice.lower() == asic_name.lower()) and
             (startdevice.lower() != hostname.lower())):
@@ -764,13 +829,13 @@ def parse_asic_png(png, asic_name, hostname):
     devices = {}
     port_speeds = {}
     for child in png:
-        if child.tag == str(QName(ns, "DeviceInterfaceLinks")):
-            for link in child.findall(str(QName(ns, "DeviceLinkBase"))):
+        if child.tag == ns_tags["DeviceInterfaceLinks"]:
+            for link in child.findall(ns_tags["DeviceLinkBase"]):
                 # Chassis internal node is used in multi-asic device or chassis minigraph
                 # where the minigraph will contain the internal asic connectivity and
                 # external neighbor information. The ChassisInternal node will be used to
                 # determine if the link is internal to the device or chassis.
-                chassis_internal_node = link.find(str(QName(ns, "ChassisInternal")))
+                chassis_internal_node = link.find(ns_tags["ChassisInternal"])
                 chassis_internal = chassis_internal_node.text if chassis_internal_node is not None else "false"
 
                 # If the link is an external link include the external neighbor
@@ -784,8 +849,8 @@ def parse_asic_png(png, asic_name, hostname):
                     neighbors.update(int_neighbors)
                     port_speeds.update(int_port_speeds)
 
-        if child.tag == str(QName(ns, "Devices")):
-            for device in child.findall(str(QName(ns, "Device"))):
+        if child.tag == ns_tags["Devices"]:
+            for device in child.findall(ns_tags["Device"]):
                 (lo_prefix, lo_prefix_v6, mgmt_prefix, mgmt_prefix_v6, name, hwsku, d_type, deployment_id, cluster, _, slice_type) = parse_device(device)
                 device_data = {}
                 if hwsku != None:
@@ -812,11 +877,11 @@ def parse_asic_png(png, asic_name, hostname):
 
 
 def parse_loopback_intf(child):
-    lointfs = child.find(str(QName(ns, "LoopbackIPInterfaces")))
+    lointfs = child.find(ns_tags["LoopbackIPInterfaces"])
     lo_intfs = {}
-    for lointf in lointfs.findall(str(QName(ns1, "LoopbackIPInterface"))):
-        intfname = lointf.find(str(QName(ns, "AttachTo"))).text
-        ipprefix = lointf.find(str(QName(ns1, "PrefixStr"))).text
+    for lointf in lointfs.findall(ns1_tags["LoopbackIPInterface"]):
+        intfname = lointf.find(ns_tags["AttachTo"]).text
+        ipprefix = lointf.find(ns1_tags["PrefixStr"]).text
         lo_intfs[(intfname, ipprefix)] = {}
     return lo_intfs
 
@@ -849,34 +914,34 @@ def parse_dpg(dpg, hname):
             There is just one aclintf node in the minigraph
             Get the aclintfs node first.
         """
-        if not aclintfs and child.find(str(QName(ns, "AclInterfaces"))) is not None and child.find(str(QName(ns, "AclInterfaces"))).findall(str(QName(ns, "AclInterface"))):
-            aclintfs = child.find(str(QName(ns, "AclInterfaces"))).findall(str(QName(ns, "AclInterface")))
+        if not aclintfs and child.find(ns_tags["AclInterfaces"]) is not None and child.find(ns_tags["AclInterfaces"]).findall(ns_tags["AclInterface"]):
+            aclintfs = child.find(ns_tags["AclInterfaces"]).findall(ns_tags["AclInterface"])
         """
             In Multi-NPU platforms the mgmt intfs are defined only for the host not for individual asic
             There is just one mgmtintf node in the minigraph
             Get the mgmtintfs node first. We need mgmt intf to get mgmt ip in per asic dockers.
         """
-        if not mgmtintfs and child.find(str(QName(ns, "ManagementIPInterfaces"))) is not None and  child.find(str(QName(ns, "ManagementIPInterfaces"))).findall(str(QName(ns1, "ManagementIPInterface"))):
-            mgmtintfs = child.find(str(QName(ns, "ManagementIPInterfaces"))).findall(str(QName(ns1, "ManagementIPInterface")))
-        hostname = child.find(str(QName(ns, "Hostname")))
+        if not mgmtintfs and child.find(ns_tags["ManagementIPInterfaces"]) is not None and  child.find(ns_tags["ManagementIPInterfaces"]).findall(ns1_tags["ManagementIPInterface"]):
+            mgmtintfs = child.find(ns_tags["ManagementIPInterfaces"]).findall(ns1_tags["ManagementIPInterface"])
+        hostname = child.find(ns_tags["Hostname"])
         if hostname.text.lower() != hname.lower():
             continue
 
         vni = vni_default
-        vni_element = child.find(str(QName(ns, "VNI")))
+        vni_element = child.find(ns_tags["VNI"])
         if vni_element != None:
             if vni_element.text.isdigit():
                 vni = int(vni_element.text)
             else:
                 print("VNI must be an integer (use default VNI %d instead)" % vni_default, file=sys.stderr)
 
-        ipintfs = child.find(str(QName(ns, "IPInterfaces")))
+        ipintfs = child.find(ns_tags["IPInterfaces"])
         intfs = {}
         ip_intfs_map = {}
-        for ipintf in ipintfs.findall(str(QName(ns, "IPInterface"))):
-            ipprefix = ipintf.find(str(QName(ns, "Prefix"))).text
-            ipintf_name  = ipintf.find(str(QName(ns, "Name"))).text
-            intfalias = ipintf.find(str(QName(ns, "AttachTo"))).text
+        for ipintf in ipintfs.findall(ns_tags["IPInterface"]):
+            ipprefix = ipintf.find(ns_tags["Prefix"]).text
+            ipintf_name  = ipintf.find(ns_tags["Name"]).text
+            intfalias = ipintf.find(ns_tags["AttachTo"]).text
             """
                 VoqInband interfaces are special ip interfaces needed on inter linecard
                 control plane communications on Voq Chassis
@@ -898,58 +963,58 @@ def parse_dpg(dpg, hname):
             ip_intfs_map[ipprefix] = intfalias
         lo_intfs = parse_loopback_intf(child)
 
-        subintfs = child.find(str(QName(ns, "SubInterfaces")))
+        subintfs = child.find(ns_tags["SubInterfaces"])
         if subintfs is not None:
-            for subintf in subintfs.findall(str(QName(ns, "SubInterface"))):
-                intfalias = subintf.find(str(QName(ns, "AttachTo"))).text
+            for subintf in subintfs.findall(ns_tags["SubInterface"]):
+                intfalias = subintf.find(ns_tags["AttachTo"]).text
                 intfname = port_alias_map.get(intfalias, intfalias)
-                ipprefix = subintf.find(str(QName(ns, "Prefix"))).text
-                subintfvlan = subintf.find(str(QName(ns, "Vlan"))).text
+                ipprefix = subintf.find(ns_tags["Prefix"]).text
+                subintfvlan = subintf.find(ns_tags["Vlan"]).text
                 subintfname = intfname + VLAN_SUB_INTERFACE_SEPARATOR + subintfvlan
                 intfs[(subintfname, ipprefix)] = {}
 
-        mvrfConfigs = child.find(str(QName(ns, "MgmtVrfConfigs")))
+        mvrfConfigs = child.find(ns_tags["MgmtVrfConfigs"])
         mvrf = {}
         if mvrfConfigs != None:
-            mv = mvrfConfigs.find(str(QName(ns1, "MgmtVrfGlobal")))
+            mv = mvrfConfigs.find(ns1_tags["MgmtVrfGlobal"])
             if mv != None:
-                mvrf_en_flag = mv.find(str(QName(ns, "mgmtVrfEnabled"))).text
+                mvrf_en_flag = mv.find(ns_tags["mgmtVrfEnabled"]).text
                 mvrf["vrf_global"] = {"mgmtVrfEnabled": mvrf_en_flag}
 
         mgmt_intf = {}
         for mgmtintf in mgmtintfs:
-            intfname = mgmtintf.find(str(QName(ns, "AttachTo"))).text
-            ipprefix = mgmtintf.find(str(QName(ns1, "PrefixStr"))).text
+            intfname = mgmtintf.find(ns_tags["AttachTo"]).text
+            ipprefix = mgmtintf.find(ns1_tags["PrefixStr"]).text
             mgmtipn = ipaddress.ip_network(UNICODE_TYPE(ipprefix), False)
             gwaddr = ipaddress.ip_address(next(mgmtipn.hosts()))
             mgmt_intf[(intfname, ipprefix)] = {'gwaddr': gwaddr}
 
-        voqinbandintfs = child.find(str(QName(ns, "VoqInbandInterfaces")))
+        voqinbandintfs = child.find(ns_tags["VoqInbandInterfaces"])
         if voqinbandintfs:
-            for voqintf in voqinbandintfs.findall(str(QName(ns1, "VoqInbandInterface"))):
-                intfname = voqintf.find(str(QName(ns, "Name"))).text
-                intftype = voqintf.find(str(QName(ns, "Type"))).text
-                ipprefix = voqintf.find(str(QName(ns1, "PrefixStr"))).text
+            for voqintf in voqinbandintfs.findall(ns1_tags["VoqInbandInterface"]):
+                intfname = voqintf.find(ns_tags["Name"]).text
+                intftype = voqintf.find(ns_tags["Type"]).text
+                ipprefix = voqintf.find(ns1_tags["PrefixStr"]).text
                 if intfname not in voq_inband_intfs:
                    voq_inband_intfs[intfname] = {'inband_type': intftype}
                 voq_inband_intfs["%s|%s" % (intfname, ipprefix)] = {}
 
-        pcintfs = child.find(str(QName(ns, "PortChannelInterfaces")))
+        pcintfs = child.find(ns_tags["PortChannelInterfaces"])
         pc_intfs = []
         pcs = {}
         pc_members = {}
         intfs_inpc = [] # List to hold all the LAG member interfaces
-        for pcintf in pcintfs.findall(str(QName(ns, "PortChannel"))):
-            pcintfname = pcintf.find(str(QName(ns, "Name"))).text
-            pcintfmbr = pcintf.find(str(QName(ns, "AttachTo"))).text
+        for pcintf in pcintfs.findall(ns_tags["PortChannel"]):
+            pcintfname = pcintf.find(ns_tags["Name"]).text
+            pcintfmbr = pcintf.find(ns_tags["AttachTo"]).text
             pcmbr_list = pcintfmbr.split(';')
             pc_intfs.append(pcintfname)
             for i, member in enumerate(pcmbr_list):
                 pcmbr_list[i] = port_alias_map.get(member, member)
                 intfs_inpc.append(pcmbr_list[i])
                 pc_members[(pcintfname, pcmbr_list[i])] = {}
-            if pcintf.find(str(QName(ns, "Fallback"))) != None:
-                pcs[pcintfname] = {'fallback': pcintf.find(str(QName(ns, "Fallback"))).text, 'min_links': str(int(math.ceil(len() * 0.75))), 'lacp_key': 'auto'}
+            if pcintf.find(ns_tags["Fallback"]) != None:
+                pcs[pcintfname] = {'fallback': pcintf.find(ns_tags["Fallback"]).text, 'min_links': str(int(math.ceil(len() * 0.75))), 'lacp_key': 'auto'}
             else:
                 pcs[pcintfname] = {'min_links': str(int(math.ceil(len(pcmbr_list) * 0.75))), 'lacp_key': 'auto' }
         port_nhipv4_map = {}
@@ -958,26 +1023,26 @@ def parse_dpg(dpg, hname):
         nhportlist = []
         dpg_ecmp_content = {}
         static_routes = {}
-        ipnhs = child.find(str(QName(ns, "IPNextHops")))
+        ipnhs = child.find(ns_tags["IPNextHops"])
         if ipnhs is not None:
-            for ipnh in ipnhs.findall(str(QName(ns, "IPNextHop"))):
-                if ipnh.find(str(QName(ns, "Type"))).text == 'FineGrainedECMPGroupMember':
-                    ipnhfmbr = ipnh.find(str(QName(ns, "AttachTo"))).text
-                    ipnhaddr = ipnh.find(str(QName(ns, "Address"))).text
+            for ipnh in ipnhs.findall(ns_tags["IPNextHop"]):
+                if ipnh.find(ns_tags["Type"]).text == 'FineGrainedECMPGroupMember':
+                    ipnhfmbr = ipnh.find(ns_tags["AttachTo"]).text
+                    ipnhaddr = ipnh.find(ns_tags["Address"]).text
                     nhportlist.append(ipnhfmbr)
                     if "." in ipnhaddr:
                         port_nhipv4_map[ipnhfmbr] = ipnhaddr
                     elif ":" in ipnhaddr:
                         port_nhipv6_map[ipnhfmbr] = ipnhaddr
-                elif ipnh.find(str(QName(ns, "Type"))).text == 'StaticRoute':
-                    prefix = ipnh.find(str(QName(ns, "Address"))).text
+                elif ipnh.find(ns_tags["Type"]).text == 'StaticRoute':
+                    prefix = ipnh.find(ns_tags["Address"]).text
                     ifname = []
                     nexthop = []
-                    for nexthop_tuple in ipnh.find(str(QName(ns, "AttachTo"))).text.split(";"):
+                    for nexthop_tuple in ipnh.find(ns_tags["AttachTo"]).text.split(";"):
                         ifname.append(nexthop_tuple.split(",")[0])
                         nexthop.append(nexthop_tuple.split(",")[1])
-                    if ipnh.find(str(QName(ns, "Advertise"))):
-                       advertise = ipnh.find(str(QName(ns, "Advertise"))).text
+                    if ipnh.find(ns_tags["Advertise"]):
+                       advertise = ipnh.find(ns_tags["Advertise"]).text
                     else:
                         advertise = "false"
                     if '/' not in prefix:
@@ -1001,30 +1066,30 @@ def parse_dpg(dpg, hname):
                 dpg_ecmp_content['ipv4'] = ipv4_content
                 dpg_ecmp_content['ipv6'] = ipv6_content
 
-        vlanintfs = child.find(str(QName(ns, "VlanInterfaces")))
+        vlanintfs = child.find(ns_tags["VlanInterfaces"])
         vlans = {}
         vlan_members = {}
         vlan_member_list = {}
         dhcp_relay_table = {}
         # Dict: vlan member (port/PortChannel) -> set of VlanID, in which the member if an untagged vlan member
         untagged_vlan_mbr = defaultdict(set)
-        for vintf in vlanintfs.findall(str(QName(ns, "VlanInterface"))):
-            vlanid = vintf.find(str(QName(ns, "VlanID"))).text
-            vlantype = vintf.find(str(QName(ns, "Type")))
+        for vintf in vlanintfs.findall(ns_tags["VlanInterface"]):
+            vlanid = vintf.find(ns_tags["VlanID"]).text
+            vlantype = vintf.find(ns_tags["Type"])
             if vlantype is None:
                 vlantype_name = ""
             else:
                 vlantype_name = vlantype.text
-            vintfmbr = vintf.find(str(QName(ns, "AttachTo"))).text
+            vintfmbr = vintf.find(ns_tags["AttachTo"]).text
             vmbr_list = vintfmbr.split(';')
             if vlantype_name != "Tagged":
                 for member in vmbr_list:
                     untagged_vlan_mbr[member].add(vlanid)
-        for vintf in vlanintfs.findall(str(QName(ns, "VlanInterface"))):
-            vintfname = vintf.find(str(QName(ns, "Name"))).text
-            vlanid = vintf.find(str(QName(ns, "VlanID"))).text
-            vintfmbr = vintf.find(str(QName(ns, "AttachTo"))).text
-            vlantype = vintf.find(str(QName(ns, "Type")))
+        for vintf in vlanintfs.findall(ns_tags["VlanInterface"]):
+            vintfname = vintf.find(ns_tags["Name"]).text
+            vlanid = vintf.find(ns_tags["VlanID"]).text
+            vintfmbr = vintf.find(ns_tags["AttachTo"]).text
+            vlantype = vintf.find(ns_tags["Type"])
             if vlantype is None:
                 vlantype_name = ""
             else:
@@ -1045,13 +1110,13 @@ def parse_dpg(dpg, hname):
 
             # If this VLAN requires a DHCP relay agent, it will contain a <DhcpRelays> element
             # containing a list of DHCP server IPs
-            vintf_node = vintf.find(str(QName(ns, "DhcpRelays")))
+            vintf_node = vintf.find(ns_tags["DhcpRelays"])
             if vintf_node is not None and vintf_node.text is not None:
                 vintfdhcpservers = vintf_node.text
                 vdhcpserver_list = vintfdhcpservers.split(';')
                 vlan_attributes['dhcp_servers'] = vdhcpserver_list
 
-            vintf_node = vintf.find(str(QName(ns, "Dhcpv6Relays")))
+            vintf_node = vintf.find(ns_tags["Dhcpv6Relays"])
             if vintf_node is not None and vintf_node.text is not None:
                 vintfdhcpservers = vintf_node.text
                 vdhcpserver_list = vintfdhcpservers.split(';')
@@ -1060,11 +1125,11 @@ def parse_dpg(dpg, hname):
                 sonic_vlan_member_name = "Vlan%s" % (vlanid)
                 dhcp_relay_table[sonic_vlan_member_name] = dhcp_attributes
 
-            vlanmac = vintf.find(str(QName(ns, "MacAddress")))
+            vlanmac = vintf.find(ns_tags["MacAddress"])
             if vlanmac is not None and vlanmac.text is not None:
                 vlan_attributes['mac'] = vlanmac.text
 
-            vintf_node = vintf.find(str(QName(ns, "SecondarySubnets")))
+            vintf_node = vintf.find(ns_tags["SecondarySubnets"])
             if vintf_node is not None and vintf_node.text is not None:
                 subnets = vintf_node.text.split(';')
                 for subnet in subnets:
@@ -1082,15 +1147,15 @@ def parse_dpg(dpg, hname):
             vlan_member_list[sonic_vlan_name] = vmbr_list
 
         for aclintf in aclintfs:
-            if aclintf.find(str(QName(ns, "InAcl"))) is not None:
-                aclname = aclintf.find(str(QName(ns, "InAcl"))).text.upper().replace(" ", "_").replace("-", "_")
+            if aclintf.find(ns_tags["InAcl"]) is not None:
+                aclname = aclintf.find(ns_tags["InAcl"]).text.upper().replace(" ", "_").replace("-", "_")
                 stage = "ingress"
-            elif aclintf.find(str(QName(ns, "OutAcl"))) is not None:
-                aclname = aclintf.find(str(QName(ns, "OutAcl"))).text.upper().replace(" ", "_").replace("-", "_")
+            elif aclintf.find(ns_tags["OutAcl"]) is not None:
+                aclname = aclintf.find(ns_tags["OutAcl"]).text.upper().replace(" ", "_").replace("-", "_")
                 stage = "egress"
             else:
                 sys.exit("Error: 'AclInterface' must contain either an 'InAcl' or 'OutAcl' subelement.")
-            aclattach = aclintf.find(str(QName(ns, "AttachTo"))).text.split(';')
+            aclattach = aclintf.find(ns_tags["AttachTo"]).text.split(';')
             acl_intfs = []
             is_bmc_data = False
             is_bmc_data_v6 = False
@@ -1176,7 +1241,7 @@ def parse_dpg(dpg, hname):
                         if panel_port not in intfs_inpc and panel_port not in acl_intfs:
                             acl_intfs.append(panel_port)
                     break
-            if aclintf.find(str(QName(ns, "Type"))) is not None and aclintf.find(str(QName(ns, "Type"))).text.upper() == "BMCDATA":
+            if aclintf.find(ns_tags["Type"]) is not None and aclintf.find(ns_tags["Type"]).text.upper() == "BMCDATA":
                 if 'v6' in aclname.lower():
                     is_bmc_data_v6 = True
                     acl_table_types['BMCDATAV6'] = acl_table_type_defination['BMCDATAV6']
@@ -1212,7 +1277,7 @@ def parse_dpg(dpg, hname):
             else:
                 # This ACL has no interfaces to attach to -- consider this a control plane ACL
                 try:
-                    aclservice = aclintf.find(str(QName(ns, "Type"))).text
+                    aclservice = aclintf.find(ns_tags["Type"]).text
 
                     # If we already have an ACL with this name and this ACL is bound to a different service,
                     # append the service to our list of services
@@ -1232,7 +1297,7 @@ def parse_dpg(dpg, hname):
                     print("Warning: Ignoring Control Plane ACL %s without type" % aclname, file=sys.stderr)
 
 
-        mg_tunnels = child.find(str(QName(ns, "TunnelInterfaces")))
+        mg_tunnels = child.find(ns_tags["TunnelInterfaces"])
         if mg_tunnels is not None:
             table_key_to_mg_key_map = {"encap_ecn_mode": "EcnEncapsulationMode",
                                        "ecn_mode": "EcnDecapsulationMode",
@@ -1245,7 +1310,7 @@ def parse_dpg(dpg, hname):
                                        "encap_tc_to_queue_map": "EncapTcToQueueMap",
                                        "encap_tc_to_dscp_map": "EncapTcToDscpMap"}
 
-            for mg_tunnel in mg_tunnels.findall(str(QName(ns, "TunnelInterface"))):
+            for mg_tunnel in mg_tunnels.findall(ns_tags["TunnelInterface"]):
                 tunnel_type = mg_tunnel.attrib["Type"]
                 tunnel_name = mg_tunnel.attrib["Name"]
                 tunnelintfs[tunnel_type][tunnel_name] = {
@@ -1270,7 +1335,7 @@ def parse_dpg(dpg, hname):
 
 def parse_host_loopback(dpg, hname):
     for child in dpg:
-        hostname = child.find(str(QName(ns, "Hostname")))
+        hostname = child.find(ns_tags["Hostname"])
         if hostname.text.lower() != hname.lower():
             continue
         lo_intfs = parse_loopback_intf(child)
@@ -1286,38 +1351,38 @@ def parse_cpg(cpg, hname, local_devices=[]):
     bgp_sentinel_sessions = {}
     for child in cpg:
         tag = child.tag
-        if tag == str(QName(ns, "PeeringSessions")):
-            for session in child.findall(str(QName(ns, "BGPSession"))):
-                start_router = session.find(str(QName(ns, "StartRouter"))).text
-                start_peer = session.find(str(QName(ns, "StartPeer"))).text
-                end_router = session.find(str(QName(ns, "EndRouter"))).text
-                end_peer = session.find(str(QName(ns, "EndPeer"))).text
-                rrclient = 1 if session.find(str(QName(ns, "RRClient"))) is not None else 0
-                if session.find(str(QName(ns, "HoldTime"))) is not None:
-                    holdtime = session.find(str(QName(ns, "HoldTime"))).text
+        if tag == ns_tags["PeeringSessions"]:
+            for session in child.findall(ns_tags["BGPSession"]):
+                start_router = session.find(ns_tags["StartRouter"]).text
+                start_peer = session.find(ns_tags["StartPeer"]).text
+                end_router = session.find(ns_tags["EndRouter"]).text
+                end_peer = session.find(ns_tags["EndPeer"]).text
+                rrclient = 1 if session.find(ns_tags["RRClient"]) is not None else 0
+                if session.find(ns_tags["HoldTime"]) is not None:
+                    holdtime = session.find(ns_tags["HoldTime"]).text
                 else:
                     holdtime = 180
-                if session.find(str(QName(ns, "KeepAliveTime"))) is not None:
-                    keepalive = session.find(str(QName(ns, "KeepAliveTime"))).text
+                if session.find(ns_tags["KeepAliveTime"]) is not None:
+                    keepalive = session.find(ns_tags["KeepAliveTime"]).text
                 else:
                     keepalive = 60
-                nhopself = 1 if session.find(str(QName(ns, "NextHopSelf"))) is not None else 0
+                nhopself = 1 if session.find(ns_tags["NextHopSelf"]) is not None else 0
 
                 # choose the right table and admin_status for the peer
                 chassis_internal_ibgp = None
-                if session.find(str(QName(ns, "ChassisInternal")))is not None:
+                if session.find(ns_tags["ChassisInternal"])is not None:
 
-                    chassis_internal_ibgp = session.find(str(QName(ns, "ChassisInternal"))).text
+                    chassis_internal_ibgp = session.find(ns_tags["ChassisInternal"]).text
                 else:
-                    if session.find(str(QName(ns, "BgpGroup"))) is not None:
-                        chassis_internal_ibgp_group = session.find(str(QName(ns, "BgpGroup")))
+                    if session.find(ns_tags["BgpGroup"]) is not None:
+                        chassis_internal_ibgp_group = session.find(ns_tags["BgpGroup"])
                         start_group_peer = None
                         end_group_peer = None
 
-                        if chassis_internal_ibgp_group.find(str(QName(ns, "Start"))) is not None:
-                            start_group_peer = chassis_internal_ibgp_group.find(str(QName(ns, "Start"))).text
-                        if chassis_internal_ibgp_group.find(str(QName(ns, "End"))) is not None:
-                            end_group_peer = chassis_internal_ibgp_group.find(str(QName(ns, "End"))).text
+                        if chassis_internal_ibgp_group.find(ns_tags["Start"]) is not None:
+                            start_group_peer = chassis_internal_ibgp_group.find(ns_tags["Start"]).text
+                        if chassis_internal_ibgp_group.find(ns_tags["End"]) is not None:
+                            end_group_peer = chassis_internal_ibgp_group.find(ns_tags["End"]).text
 
                         if start_group_peer == CHASSIS_CARD_VOQ  and end_group_peer == CHASSIS_CARD_VOQ:
                             chassis_internal_ibgp = "voq"
@@ -1360,35 +1425,35 @@ def parse_cpg(cpg, hname, local_devices=[]):
                     }
                     if admin_status:
                         table[end_peer.lower()]['admin_status'] = admin_status
-        elif child.tag == str(QName(ns, "Routers")):
-            for router in child.findall(str(QName(ns1, "BGPRouterDeclaration"))):
-                asn = router.find(str(QName(ns1, "ASN"))).text
-                hostname = router.find(str(QName(ns1, "Hostname"))).text
+        elif child.tag == ns_tags["Routers"]:
+            for router in child.findall(ns1_tags["BGPRouterDeclaration"]):
+                asn = router.find(ns1_tags["ASN"]).text
+                hostname = router.find(ns1_tags["Hostname"]).text
                 if hostname.lower() == hname.lower():
                     myasn = asn
-                    peers = router.find(str(QName(ns1, "Peers")))
-                    for bgpPeer in peers.findall(str(QName(ns, "BGPPeer"))):
-                        addr = bgpPeer.find(str(QName(ns, "Address"))).text
-                        if bgpPeer.find(str(QName(ns1, "PeersRange"))) is not None: # FIXME: is better to check for type BGPPeerPassive
-                            name = bgpPeer.find(str(QName(ns1, "Name"))).text
-                            ip_range = bgpPeer.find(str(QName(ns1, "PeersRange"))).text
+                    peers = router.find(ns1_tags["Peers"])
+                    for bgpPeer in peers.findall(ns_tags["BGPPeer"]):
+                        addr = bgpPeer.find(ns_tags["Address"]).text
+                        if bgpPeer.find(ns1_tags["PeersRange"]) is not None: # FIXME: is better to check for type BGPPeerPassive
+                            name = bgpPeer.find(ns1_tags["Name"]).text
+                            ip_range = bgpPeer.find(ns1_tags["PeersRange"]).text
                             ip_range_group = ip_range.split(';') if ip_range and ip_range != "" else []
                             if name == "BGPSentinel" or name == "BGPSentinelV6":
                                 bgp_sentinel_sessions[name] = {
                                     'name': name,
                                     'ip_range': ip_range_group
                                 }
-                                if bgpPeer.find(str(QName(ns, "Address"))) is not None:
-                                    bgp_sentinel_sessions[name]['src_address'] = bgpPeer.find(str(QName(ns, "Address"))).text
+                                if bgpPeer.find(ns_tags["Address"]) is not None:
+                                    bgp_sentinel_sessions[name]['src_address'] = bgpPeer.find(ns_tags["Address"]).text
                             else:
                                 bgp_peers_with_range[name] = {
                                     'name': name,
                                     'ip_range': ip_range_group
                                 }
-                                if bgpPeer.find(str(QName(ns, "Address"))) is not None:
-                                    bgp_peers_with_range[name]['src_address'] = bgpPeer.find(str(QName(ns, "Address"))).text
-                                if bgpPeer.find(str(QName(ns1, "PeerAsn"))) is not None:
-                                    bgp_peers_with_range[name]['peer_asn'] = bgpPeer.find(str(QName(ns1, "PeerAsn"))).text
+                                if bgpPeer.find(ns_tags["Address"]) is not None:
+                                    bgp_peers_with_range[name]['src_address'] = bgpPeer.find(ns_tags["Address"]).text
+                                if bgpPeer.find(ns1_tags["PeerAsn"]) is not None:
+                                    bgp_peers_with_range[name]['peer_asn'] = bgpPeer.find(ns1_tags["PeerAsn"]).text
                 else:
                     for peer in bgp_sessions:
                         bgp_session = bgp_sessions[peer]
@@ -1423,33 +1488,31 @@ def parse_chassis_meta(meta, hname):
     macsec_profile = {}
     qos_profile = None
 
-    device_metas = meta.find(str(QName(ns, "Devices")))
-    for device in device_metas.findall(str(QName(ns1, "DeviceMetadata"))):
-        if device.find(str(QName(ns1, "Name"))).text.lower() == hname.lower():
-            properties = device.find(str(QName(ns1, "Properties")))
-            for device_property in properties.findall(str(QName(ns1, "DeviceProperty"))):
-                name = device_property.find(str(QName(ns1, "Name"))).text
-                value = device_property.find(str(QName(ns1, "Value"))).text
-                value_group = value.strip().split(';') if value and value != "" else []
-                if name == "NtpResources":
-                    ntp_servers = value_group
-                elif name == "SyslogResources":
-                    syslog_servers = value_group
-                elif name == "TacacsServer":
-                    tacacs_servers = value_group
-                    mgmt_routes.extend(value_group)
-                elif name == "ForcedMgmtRoutes":
-                    mgmt_routes.extend(value_group)
-                elif name == "ErspanDestinationIpv4":
-                    erspan_dst = value_group
-                elif name == "DeploymentId":
-                    deployment_id = value
-                elif name == "Region":
-                    region = value
-                elif name == 'MacSecProfile':
-                    macsec_profile = parse_macsec_profile(value)
-                elif name == "SonicQosProfile":
-                    qos_profile = value
+    for device in get_device_metadata(meta, hname):
+        properties = device.find(ns1_tags["Properties"])
+        for device_property in properties.findall(ns1_tags["DeviceProperty"]):
+            name = device_property.find(ns1_tags["Name"]).text
+            value = device_property.find(ns1_tags["Value"]).text
+            value_group = value.strip().split(';') if value and value != "" else []
+            if name == "NtpResources":
+                ntp_servers = value_group
+            elif name == "SyslogResources":
+                syslog_servers = value_group
+            elif name == "TacacsServer":
+                tacacs_servers = value_group
+                mgmt_routes.extend(value_group)
+            elif name == "ForcedMgmtRoutes":
+                mgmt_routes.extend(value_group)
+            elif name == "ErspanDestinationIpv4":
+                erspan_dst = value_group
+            elif name == "DeploymentId":
+                deployment_id = value
+            elif name == "Region":
+                region = value
+            elif name == 'MacSecProfile':
+                macsec_profile = parse_macsec_profile(value)
+            elif name == "SonicQosProfile":
+                qos_profile = value
 
     return syslog_servers, ntp_servers, tacacs_servers, mgmt_routes, erspan_dst, deployment_id, region, macsec_profile
 
@@ -1476,68 +1539,66 @@ def parse_meta(meta, hname):
     qos_profile = None
     rack_mgmt_map = None
 
-    device_metas = meta.find(str(QName(ns, "Devices")))
-    for device in device_metas.findall(str(QName(ns1, "DeviceMetadata"))):
-        if device.find(str(QName(ns1, "Name"))).text.lower() == hname.lower():
-            properties = device.find(str(QName(ns1, "Properties")))
-            for device_property in properties.findall(str(QName(ns1, "DeviceProperty"))):
-                name = device_property.find(str(QName(ns1, "Name"))).text
-                value = device_property.find(str(QName(ns1, "Value"))).text
-                value_group = value.strip().split(';') if value and value != "" else []
-                if name == "DhcpResources":
-                    dhcp_servers = value_group
-                elif name == "NtpResources":
-                    ntp_servers = value_group
-                elif name == "SyslogResources":
-                    syslog_servers = value_group
-                elif name == "TacacsServer":
-                    tacacs_servers = value_group
-                elif name == "ForcedMgmtRoutes":
-                    mgmt_routes = value_group
-                elif name == "ErspanDestinationIpv4":
-                    erspan_dst = value_group
-                elif name == "DeploymentId":
-                    deployment_id = value
-                elif name == "Region":
-                    region = value
-                elif name == "CloudType":
-                    cloudtype = value
-                elif name == "ResourceType":
-                    resource_type = value
-                elif name == "DownStreamSubRole":
-                    downstream_subrole = value
-                elif name == "SwitchId":
-                    switch_id = value
-                elif name == "SwitchType":
-                    switch_type = value
-                elif name == "MaxCores":
-                    max_cores = value
-                elif name == "KubernetesEnabled":
-                    kube_data["enable"] = value
-                elif name == "KubernetesServerIp":
-                    kube_data["ip"] = value
-                elif name == 'MacSecProfile':
-                    macsec_profile = parse_macsec_profile(value)
-                elif name == "RedundancyType":
-                    redundancy_type = value
-                elif name == "DownstreamRedundancyTypes":
-                    downstream_redundancy_types = value
-                elif name == "SonicQosProfile":
-                    qos_profile = value
-                elif name == "RackMgmtMap":
-                    rack_mgmt_map = value
+    for device in get_device_metadata(meta, hname):
+        properties = device.find(ns1_tags["Properties"])
+        for device_property in properties.findall(ns1_tags["DeviceProperty"]):
+            name = device_property.find(ns1_tags["Name"]).text
+            value = device_property.find(ns1_tags["Value"]).text
+            value_group = value.strip().split(';') if value and value != "" else []
+            if name == "DhcpResources":
+                dhcp_servers = value_group
+            elif name == "NtpResources":
+                ntp_servers = value_group
+            elif name == "SyslogResources":
+                syslog_servers = value_group
+            elif name == "TacacsServer":
+                tacacs_servers = value_group
+            elif name == "ForcedMgmtRoutes":
+                mgmt_routes = value_group
+            elif name == "ErspanDestinationIpv4":
+                erspan_dst = value_group
+            elif name == "DeploymentId":
+                deployment_id = value
+            elif name == "Region":
+                region = value
+            elif name == "CloudType":
+                cloudtype = value
+            elif name == "ResourceType":
+                resource_type = value
+            elif name == "DownStreamSubRole":
+                downstream_subrole = value
+            elif name == "SwitchId":
+                switch_id = value
+            elif name == "SwitchType":
+                switch_type = value
+            elif name == "MaxCores":
+                max_cores = value
+            elif name == "KubernetesEnabled":
+                kube_data["enable"] = value
+            elif name == "KubernetesServerIp":
+                kube_data["ip"] = value
+            elif name == 'MacSecProfile':
+                macsec_profile = parse_macsec_profile(value)
+            elif name == "RedundancyType":
+                redundancy_type = value
+            elif name == "DownstreamRedundancyTypes":
+                downstream_redundancy_types = value
+            elif name == "SonicQosProfile":
+                qos_profile = value
+            elif name == "RackMgmtMap":
+                rack_mgmt_map = value
     return syslog_servers, dhcp_servers, dhcpv6_servers, ntp_servers, tacacs_servers, mgmt_routes, erspan_dst, deployment_id, region, cloudtype, resource_type, downstream_subrole, switch_id, switch_type, max_cores, kube_data, macsec_profile, downstream_redundancy_types, redundancy_type, qos_profile, rack_mgmt_map
 
 
 def parse_linkmeta(meta, hname):
-    link = meta.find(str(QName(ns, "Link")))
+    link = meta.find(ns_tags["Link"])
     linkmetas = {}
-    for linkmeta in link.findall(str(QName(ns1, "LinkMetadata"))):
+    for linkmeta in link.findall(ns1_tags["LinkMetadata"]):
         port = None
         fec_disabled = None
 
         # Sample: ARISTA05T1:Ethernet1/33;switch-t0:fortyGigE0/4
-        key = linkmeta.find(str(QName(ns1, "Key"))).text
+        key = linkmeta.find(ns1_tags["Key"]).text
         endpoints = key.split(';')
         for endpoint in endpoints:
             t = endpoint.split(':')
@@ -1555,10 +1616,10 @@ def parse_linkmeta(meta, hname):
         macsec_enabled = False
         tx_power = None
         laser_freq = None
-        properties = linkmeta.find(str(QName(ns1, "Properties")))
-        for device_property in properties.findall(str(QName(ns1, "DeviceProperty"))):
-            name = device_property.find(str(QName(ns1, "Name"))).text
-            value = device_property.find(str(QName(ns1, "Value"))).text
+        properties = linkmeta.find(ns1_tags["Properties"])
+        for device_property in properties.findall(ns1_tags["DeviceProperty"]):
+            name = device_property.find(ns1_tags["Name"]).text
+            value = device_property.find(ns1_tags["Value"]).text
             if name == "FECDisabled":
                 fec_disabled = value
             elif name in [ "GeminiPeeringLink", "LibraPeeringLink" ]:
@@ -1612,15 +1673,15 @@ def parse_global_info(root):
     hwsku = hostname = None
     docker_routing_config_mode = "separated"
 
-    hwsku_qn = QName(ns, "HwSku")
-    hostname_qn = QName(ns, "Hostname")
-    docker_routing_config_mode_qn = QName(ns, "DockerRoutingConfigMode")
+    hwsku_qn = ns_tags["HwSku"]
+    hostname_qn = ns_tags["Hostname"]
+    docker_routing_config_mode_qn = ns_tags["DockerRoutingConfigMode"]
     for child in root:
-        if child.tag == str(hwsku_qn):
+        if child.tag == hwsku_qn:
             hwsku = child.text
-        if child.tag == str(hostname_qn):
+        if child.tag == hostname_qn:
             hostname = child.text
-        if child.tag == str(docker_routing_config_mode_qn):
+        if child.tag == docker_routing_config_mode_qn:
             docker_routing_config_mode = child.text
             
     chassis_type, chassis_hostname  =  get_chassis_type_and_hostname(root, hostname)
@@ -1633,25 +1694,23 @@ def parse_asic_meta(meta, hname):
     max_cores = None
     deployment_id = None
     macsec_profile = {}
-    device_metas = meta.find(str(QName(ns, "Devices")))
-    for device in device_metas.findall(str(QName(ns1, "DeviceMetadata"))):
-        if device.find(str(QName(ns1, "Name"))).text.lower() == hname.lower():
-            properties = device.find(str(QName(ns1, "Properties")))
-            for device_property in properties.findall(str(QName(ns1, "DeviceProperty"))):
-                name = device_property.find(str(QName(ns1, "Name"))).text
-                value = device_property.find(str(QName(ns1, "Value"))).text
-                if name == "SubRole":
-                    sub_role = value
-                elif name == "SwitchId" or name == "AsicSwitchId":
-                    switch_id = value
-                elif name == "SwitchType":
-                    switch_type = value
-                elif name == "MaxCores":
-                    max_cores = value
-                elif name == "DeploymentId":
-                    deployment_id = value
-                elif name == 'MacSecProfile':
-                    macsec_profile = parse_macsec_profile(value)
+    for device in get_device_metadata(meta, hname):
+        properties = device.find(ns1_tags["Properties"])
+        for device_property in properties.findall(ns1_tags["DeviceProperty"]):
+            name = device_property.find(ns1_tags["Name"]).text
+            value = device_property.find(ns1_tags["Value"]).text
+            if name == "SubRole":
+                sub_role = value
+            elif name == "SwitchId" or name == "AsicSwitchId":
+                switch_id = value
+            elif name == "SwitchType":
+                switch_type = value
+            elif name == "MaxCores":
+                max_cores = value
+            elif name == "DeploymentId":
+                deployment_id = value
+            elif name == 'MacSecProfile':
+                macsec_profile = parse_macsec_profile(value)
 
     return sub_role, switch_id, switch_type, max_cores, deployment_id, macsec_profile
 
@@ -1659,31 +1718,31 @@ def parse_deviceinfo(meta, hwsku):
     port_speeds = {}
     port_descriptions = {}
     sys_ports = {}
-    for device_info in meta.findall(str(QName(ns, "DeviceInfo"))):
-        dev_sku = device_info.find(str(QName(ns, "HwSku"))).text
+    for device_info in meta.findall(ns_tags["DeviceInfo"]):
+        dev_sku = device_info.find(ns_tags["HwSku"]).text
         if dev_sku == hwsku:
-            interfaces = device_info.find(str(QName(ns, "EthernetInterfaces"))).findall(str(QName(ns1, "EthernetInterface")))
-            interfaces = interfaces + device_info.find(str(QName(ns, "ManagementInterfaces"))).findall(str(QName(ns1, "ManagementInterface")))
+            interfaces = device_info.find(ns_tags["EthernetInterfaces"]).findall(ns1_tags["EthernetInterface"])
+            interfaces = interfaces + device_info.find(ns_tags["ManagementInterfaces"]).findall(ns1_tags["ManagementInterface"])
             for interface in interfaces:
-                alias = interface.find(str(QName(ns, "InterfaceName"))).text
-                speed = interface.find(str(QName(ns, "Speed"))).text
-                desc  = interface.find(str(QName(ns, "Description")))
+                alias = interface.find(ns_tags["InterfaceName"]).text
+                speed = interface.find(ns_tags["Speed"]).text
+                desc  = interface.find(ns_tags["Description"])
                 if desc != None:
                     port_descriptions[port_alias_map.get(alias, alias)] = desc.text
                 port_speeds[port_alias_map.get(alias, alias)] = speed
 
-            sysports = device_info.find(str(QName(ns, "SystemPorts")))
+            sysports = device_info.find(ns_tags["SystemPorts"])
             if sysports is not None:
-                for sysport in sysports.findall(str(QName(ns, "SystemPort"))):
-                    portname = sysport.find(str(QName(ns, "Name"))).text
-                    hostname = sysport.find(str(QName(ns, "Hostname")))
-                    asic_name = sysport.find(str(QName(ns, "AsicName")))
-                    system_port_id = sysport.find(str(QName(ns, "SystemPortId"))).text
-                    switch_id = sysport.find(str(QName(ns, "SwitchId"))).text
-                    core_id = sysport.find(str(QName(ns, "CoreId"))).text
-                    core_port_id = sysport.find(str(QName(ns, "CorePortId"))).text
-                    speed = sysport.find(str(QName(ns, "Speed"))).text
-                    num_voq = sysport.find(str(QName(ns, "NumVoq"))).text
+                for sysport in sysports.findall(ns_tags["SystemPort"]):
+                    portname = sysport.find(ns_tags["Name"]).text
+                    hostname = sysport.find(ns_tags["Hostname"])
+                    asic_name = sysport.find(ns_tags["AsicName"])
+                    system_port_id = sysport.find(ns_tags["SystemPortId"]).text
+                    switch_id = sysport.find(ns_tags["SwitchId"]).text
+                    core_id = sysport.find(ns_tags["CoreId"]).text
+                    core_port_id = sysport.find(ns_tags["CorePortId"]).text
+                    speed = sysport.find(ns_tags["Speed"]).text
+                    num_voq = sysport.find(ns_tags["NumVoq"]).text
                     key = portname
                     if asic_name is not None:
                        key = "%s|%s" % (asic_name.text, key)
@@ -1947,7 +2006,104 @@ def update_forced_mgmt_route(mgmt_intf, mgmt_routes):
 # Main functions
 #
 ###############################################################################
-def parse_xml(filename, platform=None, port_config_file=None, asic_name=None, hwsku_config_file=None, fabric_port_config_file=None ):
+class MinigraphCache(object):
+    """ On-disk cache of the results of the minigraph section parsers.
+
+    Section parsers (parse_dpg, parse_png, parse_meta, ...) are pure functions
+    of the minigraph content, their arguments and the port maps loaded from
+    the port config, so their results can be reused across processes, e.g. by
+    every 'sonic-cfggen -m -n asicN' run of a multi-ASIC device. One pickle file
+    is kept per minigraph content hash; any change to the minigraph, the port
+    config or this module results in new cache keys. Processes running at the
+    same time merge their new entries into the file under a lock of the cache
+    directory.
+    """
+    def __init__(self, cache_dir=None):
+        self.cache_dir = cache_dir if cache_dir is not None else MINIGRAPH_CACHE_DIR
+        self.hits = 0
+        self.misses = 0
+        self.cache_file = None
+        self.context = None
+        self.entries = {}
+        self.new_entries = {}
+
+    def load(self, filename, context):
+        """ Load cached entries of minigraph file
+
+        Keyword arguments:
+        filename -- minigraph file name
+        context -- any other state the section parsers depend on
+        """
+        with open(filename, 'rb') as minigraph_file:
+            digest = hashlib.sha256(minigraph_file.read()).hexdigest()
+        self.cache_file = os.path.join(self.cache_dir, digest + '.pickle')
+        self.context = repr((MINIGRAPH_CACHE_VERSION, os.path.getmtime(__file__), context))
+        self.new_entries = {}
+        self.entries = self.read_entries(self.cache_file)
+
+    @staticmethod
+    def read_entries(cache_file):
+        try:
+            with open(cache_file, 'rb') as f:
+                return pickle.load(f)
+        except Exception:
+            return {}
+
+    def parse_section(self, parser, section, *args):
+        """ Return parser(section, *args), from the cache when possible """
+        position = section.getparent().index(section)
+        key = hashlib.sha256(repr((self.context, parser.__name__, position, args)).encode()).hexdigest()
+        if key in self.entries:
+            self.hits += 1
+            return pickle.loads(self.entries[key])
+
+        self.misses += 1
+        result = parser(section, *args)
+        try:
+            # Serialize right away, the caller may modify the result later
+            self.entries[key] = pickle.dumps(result, pickle.HIGHEST_PROTOCOL)
+            self.new_entries[key] = self.entries[key]
+        except Exception:
+            pass
+        return result
+
+    def save(self):
+        """ Write new entries to disk """
+        if self.new_entries:
+            self.merge(self.cache_file, self.new_entries)
+            self.new_entries = {}
+
+    def merge(self, cache_file, new_entries):
+        """ Add entries to a cache file and drop the oldest cache files """
+        try:
+            if not os.path.isdir(self.cache_dir):
+                os.makedirs(self.cache_dir)
+            # Re-read the file under the lock, another process may have added entries since it was loaded
+            with open(os.path.join(self.cache_dir, '.lock'), 'w') as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                entries = self.read_entries(cache_file)
+                entries.update(new_entries)
+                tmp_file = '{}.{}.tmp'.format(cache_file, os.getpid())
+                with open(tmp_file, 'wb') as f:
+                    pickle.dump(entries, f, pickle.HIGHEST_PROTOCOL)
+                os.rename(tmp_file, cache_file)
+
+            cache_files = sorted(glob.glob(os.path.join(self.cache_dir, '*.pickle')), key=os.path.getmtime, reverse=True)
+            for old_file in cache_files[MINIGRAPH_CACHE_MAX_FILES:]:
+                os.remove(old_file)
+        except (IOError, OSError):
+            # The cache is only an optimization
+            pass
+
+    def stats(self):
+        return "minigraph cache: {} hits, {} misses".format(self.hits, self.misses)
+
+def parse_section(cache, parser, section, *args):
+    if cache is None:
+        return parser(section, *args)
+    return cache.parse_section(parser, section, *args)
+
+def parse_xml(filename, platform=None, port_config_file=None, asic_name=None, hwsku_config_file=None, fabric_port_config_file=None, cache=None):
     """ Parse minigraph xml file.
 
     Keyword arguments:
@@ -1957,9 +2113,10 @@ def parse_xml(filename, platform=None, port_config_file=None, asic_name=None, hw
     asic_name -- asic name; to parse multi-asic device minigraph to
     generate asic specific configuration.
     fabric_port_config_file -- fabric port config file name
+    cache -- MinigraphCache to reuse section parsing results from
      """
 
-    root = ET.parse(filename).getroot()
+    root = iterparse_minigraph(filename)
 
     u_neighbors = None
     u_devices = None
@@ -2029,15 +2186,15 @@ def parse_xml(filename, platform=None, port_config_file=None, asic_name=None, hw
     max_num_cores = None
     card_type = None
 
-    hwsku_qn = QName(ns, "HwSku")
-    hostname_qn = QName(ns, "Hostname")
-    docker_routing_config_mode_qn = QName(ns, "DockerRoutingConfigMode")
+    hwsku_qn = ns_tags["HwSku"]
+    hostname_qn = ns_tags["Hostname"]
+    docker_routing_config_mode_qn = ns_tags["DockerRoutingConfigMode"]
     for child in root:
-        if child.tag == str(hwsku_qn):
+        if child.tag == hwsku_qn:
             hwsku = child.text
-        if child.tag == str(hostname_qn):
+        if child.tag == hostname_qn:
             hostname = child.text
-        if child.tag == str(docker_routing_config_mode_qn):
+        if child.tag == docker_routing_config_mode_qn:
             docker_routing_config_mode = child.text
 
     hwsku, hostname, docker_routing_config_mode, chassis_type, chassis_hostname = parse_global_info(root)
@@ -2057,49 +2214,55 @@ def parse_xml(filename, platform=None, port_config_file=None, asic_name=None, hw
     port_alias_map.update(alias_map)
     port_alias_asic_map.update(alias_asic_map)
 
+    if cache is not None:
+        cache.load(filename, (port_names_map, port_alias_map, port_alias_asic_map))
+
     slot_index = get_linecard_slot_index(hostname, chassis_linecards_info)
     # Get the local device node from DeviceMetadata
     local_devices = parse_asic_meta_get_devices(root)
 
     for child in root:
         if asic_hostname is None:
-            if child.tag == str(QName(ns, "DpgDec")):
-                (intfs, lo_intfs, mvrf, mgmt_intf, voq_inband_intfs, vlans, vlan_members, dhcp_relay_table, pcs, pc_members, acls, acl_table_types, vni, tunnel_intfs, dpg_ecmp_content, static_routes, tunnel_intfs_qos_remap_config) = parse_dpg(child, hostname)
-            elif child.tag == str(QName(ns, "CpgDec")):
-                (bgp_sessions, bgp_internal_sessions, bgp_voq_chassis_sessions, bgp_asn, bgp_peers_with_range, bgp_monitors, bgp_sentinel_sessions) = parse_cpg(child, hostname)
-            elif child.tag == str(QName(ns, "PngDec")):
-                (neighbors, devices, console_dev, console_port, mgmt_dev, mgmt_port, port_speed_png, console_ports, mux_cable_ports, png_ecmp_content) = parse_png(child, hostname, dpg_ecmp_content)
-            elif child.tag == str(QName(ns, "UngDec")):
-                (u_neighbors, u_devices, _, _, _, _, _, _) = parse_png(child, hostname, None)
-            elif child.tag == str(QName(ns, "MetadataDeclaration")):
-                (syslog_servers, dhcp_servers, dhcpv6_servers, ntp_servers, tacacs_servers, mgmt_routes, erspan_dst, deployment_id, region, cloudtype, resource_type, downstream_subrole, switch_id, switch_type, max_cores, kube_data, macsec_profile, downstream_redundancy_types, redundancy_type, qos_profile, rack_mgmt_map) = parse_meta(child, hostname)
-            elif child.tag == str(QName(ns, "LinkMetadataDeclaration")):
-                linkmetas = parse_linkmeta(child, hostname)
-            elif child.tag == str(QName(ns, "DeviceInfos")):
-                (port_speeds_default, port_descriptions, sys_ports) = parse_deviceinfo(child, hwsku)
+            if child.tag == ns_tags["DpgDec"]:
+                (intfs, lo_intfs, mvrf, mgmt_intf, voq_inband_intfs, vlans, vlan_members, dhcp_relay_table, pcs, pc_members, acls, acl_table_types, vni, tunnel_intfs, dpg_ecmp_content, static_routes, tunnel_intfs_qos_remap_config) = parse_section(cache, parse_dpg, child, hostname)
+            elif child.tag == ns_tags["CpgDec"]:
+                (bgp_sessions, bgp_internal_sessions, bgp_voq_chassis_sessions, bgp_asn, bgp_peers_with_range, bgp_monitors, bgp_sentinel_sessions) = parse_section(cache, parse_cpg, child, hostname)
+            elif child.tag == ns_tags["PngDec"]:
+                (neighbors, devices, console_dev, console_port, mgmt_dev, mgmt_port, port_speed_png, console_ports, mux_cable_ports, png_ecmp_content) = parse_section(cache, parse_png, child, hostname, dpg_ecmp_content)
+            elif child.tag == ns_tags["UngDec"]:
+                (u_neighbors, u_devices, _, _, _, _, _, _) = parse_section(cache, parse_png, child, hostname, None)
+            elif child.tag == ns_tags["MetadataDeclaration"]:
+                (syslog_servers, dhcp_servers, dhcpv6_servers, ntp_servers, tacacs_servers, mgmt_routes, erspan_dst, deployment_id, region, cloudtype, resource_type, downstream_subrole, switch_id, switch_type, max_cores, kube_data, macsec_profile, downstream_redundancy_types, redundancy_type, qos_profile, rack_mgmt_map) = parse_section(cache, parse_meta, child, hostname)
+            elif child.tag == ns_tags["LinkMetadataDeclaration"]:
+                linkmetas = parse_section(cache, parse_linkmeta, child, hostname)
+            elif child.tag == ns_tags["DeviceInfos"]:
+                (port_speeds_default, port_descriptions, sys_ports) = parse_section(cache, parse_deviceinfo, child, hwsku)
         else:
-            if child.tag == str(QName(ns, "DpgDec")):
-                (intfs, lo_intfs, mvrf, mgmt_intf, voq_inband_intfs, vlans, vlan_members, dhcp_relay_table, pcs, pc_members, acls, acl_table_types, vni, tunnel_intfs, dpg_ecmp_content, static_routes, tunnel_intfs_qos_remap_config) = parse_dpg(child, asic_hostname)
-                host_lo_intfs = parse_host_loopback(child, hostname)
-            elif child.tag == str(QName(ns, "CpgDec")):
-                (bgp_sessions, bgp_internal_sessions, bgp_voq_chassis_sessions, bgp_asn, bgp_peers_with_range, bgp_monitors, bgp_sentinel_sessions) = parse_cpg(child, asic_hostname, local_devices)
-            elif child.tag == str(QName(ns, "PngDec")):
-                (neighbors, devices, port_speed_png) = parse_asic_png(child, asic_hostname, hostname)
-            elif child.tag == str(QName(ns, "MetadataDeclaration")):
-                (sub_role, switch_id, switch_type, max_cores, deployment_id, macsec_profile) = parse_asic_meta(child, asic_hostname)
-            elif child.tag == str(QName(ns, "LinkMetadataDeclaration")):
-                linkmetas = parse_linkmeta(child, hostname)
-            elif child.tag == str(QName(ns, "DeviceInfos")):
-                (port_speeds_default, port_descriptions, sys_ports) = parse_deviceinfo(child, hwsku)
+            if child.tag == ns_tags["DpgDec"]:
+                (intfs, lo_intfs, mvrf, mgmt_intf, voq_inband_intfs, vlans, vlan_members, dhcp_relay_table, pcs, pc_members, acls, acl_table_types, vni, tunnel_intfs, dpg_ecmp_content, static_routes, tunnel_intfs_qos_remap_config) = parse_section(cache, parse_dpg, child, asic_hostname)
+                host_lo_intfs = parse_section(cache, parse_host_loopback, child, hostname)
+            elif child.tag == ns_tags["CpgDec"]:
+                (bgp_sessions, bgp_internal_sessions, bgp_voq_chassis_sessions, bgp_asn, bgp_peers_with_range, bgp_monitors, bgp_sentinel_sessions) = parse_section(cache, parse_cpg, child, asic_hostname, local_devices)
+            elif child.tag == ns_tags["PngDec"]:
+                (neighbors, devices, port_speed_png) = parse_section(cache, parse_asic_png, child, asic_hostname, hostname)
+            elif child.tag == ns_tags["MetadataDeclaration"]:
+                (sub_role, switch_id, switch_type, max_cores, deployment_id, macsec_profile) = parse_section(cache, parse_asic_meta, child, asic_hostname)
+            elif child.tag == ns_tags["LinkMetadataDeclaration"]:
+                linkmetas = parse_section(cache, parse_linkmeta, child, hostname)
+            elif child.tag == ns_tags["DeviceInfos"]:
+                (port_speeds_default, port_descriptions, sys_ports) = parse_section(cache, parse_deviceinfo, child, hwsku)
 
         if chassis_hostname:
-            if child.tag == str(QName(ns, "DeviceInfos")):
+            if child.tag == ns_tags["DeviceInfos"]:
                 if asic_hostname is not None:
-                    (sys_ports, chassis_port_alias, port_speeds_default) = parse_chassis_deviceinfo(child, chassis_linecards_info, chassis_hwsku, num_voq, chassis_type, voq_intf_attributes)
-            elif child.tag == str(QName(ns, "MetadataDeclaration")):
-                (syslog_servers, ntp_servers, tacacs_servers, mgmt_routes, erspan_dst, deployment_id, region, macsec_profile) = parse_chassis_meta(child, chassis_hostname)
-            elif child.tag == str(QName(ns, "LinkMetadataDeclaration")):
-                linkmetas = parse_linkmeta(child, chassis_hostname)
+                    (sys_ports, chassis_port_alias, port_speeds_default) = parse_section(cache, parse_chassis_deviceinfo, child, chassis_linecards_info, chassis_hwsku, num_voq, chassis_type, voq_intf_attributes)
+            elif child.tag == ns_tags["MetadataDeclaration"]:
+                (syslog_servers, ntp_servers, tacacs_servers, mgmt_routes, erspan_dst, deployment_id, region, macsec_profile) = parse_section(cache, parse_chassis_meta, child, chassis_hostname)
+            elif child.tag == ns_tags["LinkMetadataDeclaration"]:
+                linkmetas = parse_section(cache, parse_linkmeta, child, chassis_hostname)
+
+    if cache is not None:
+        cache.save()
 
     select_mmu_profiles(qos_profile, platform, hwsku)
     
@@ -2761,11 +2924,11 @@ def get_ports_in_active_active(root, devices, neighbors):
     """Parse out ports in active-active cable type."""
     servers = {hostname.lower(): device_data for hostname, device_data in devices.items() if device_data["type"] == "Server"}
     ports_in_active_active = {}
-    dpg_section = root.find(str(QName(ns, "DpgDec")))
+    dpg_section = root.find(ns_tags["DpgDec"])
     neighbor_to_port_mapping = {neighbor["name"].lower(): port for port, neighbor in neighbors.items()}
     if dpg_section is not None:
         for child in dpg_section:
-            hostname = child.find(str(QName(ns, "Hostname")))
+            hostname = child.find(ns_tags["Hostname"])
             if hostname is None:
                 continue
             hostname = hostname.text.lower()
@@ -2855,14 +3018,52 @@ def parse_device_desc_xml(filename):
 
     return results
 
+def _minigraph_file_key(filename):
+    stat = os.stat(filename)
+    return (os.path.realpath(filename), stat.st_mtime, stat.st_size)
+
+# Root element of the last minigraph fully parsed by this process, so that
+# parse_hostname(), parse_asic_sub_role() and parse_asic_switch_type() reuse
+# the pass already made by parse_xml() instead of reading the file again.
+_parsed_minigraph = {'key': None, 'root': None}
+
+def iterparse_minigraph(filename, sections=None):
+    """ Parse minigraph xml file in a single streaming pass.
+
+    Keyword arguments:
+    filename -- minigraph file name
+    sections -- local names of the top level elements to keep, all of them
+    when None. Other top level subtrees are freed as soon as they are read.
+
+    Returns the root element of the document.
+    """
+    file_key = _minigraph_file_key(filename)
+    if _parsed_minigraph['key'] == file_key:
+        return _parsed_minigraph['root']
+
+    _section_indexes.clear()
+    root = None
+    for _, elem in ET.iterparse(filename, events=('end',)):
+        parent = elem.getparent()
+        if parent is None:
+            root = elem
+        elif sections is not None and parent.getparent() is None and QName(elem).localname not in sections:
+            elem.clear()
+            parent.remove(elem)
+
+    if sections is None:
+        _parsed_minigraph['key'] = file_key
+        _parsed_minigraph['root'] = root
+    return root
+
 def parse_hostname(filename):
     hostName = None
     if not os.path.isfile(filename):
         return None
-    root = ET.parse(filename).getroot()
-    hostname_qn = QName(ns, "Hostname")
+    root = iterparse_minigraph(filename, sections=['Hostname'])
+    hostname_qn = ns_tags["Hostname"]
     for child in root:
-        if child.tag == str(hostname_qn):
+        if child.tag == hostname_qn:
             hostName = child.text
             break
 
@@ -2871,48 +3072,67 @@ def parse_hostname(filename):
 def parse_asic_sub_role(filename, asic_name):
     if not os.path.isfile(filename):
         return None
-    root = ET.parse(filename).getroot()
+    root = iterparse_minigraph(filename, sections=['MetadataDeclaration'])
     for child in root:
-        if child.tag == str(QName(ns, "MetadataDeclaration")):
+        if child.tag == ns_tags["MetadataDeclaration"]:
             sub_role, _, _, _, _, _= parse_asic_meta(child, asic_name)
             return sub_role
 
 def parse_asic_switch_type(filename, asic_name):
     if os.path.isfile(filename):
-        root = ET.parse(filename).getroot()
+        root = iterparse_minigraph(filename, sections=['MetadataDeclaration'])
         for child in root:
-            if child.tag == str(QName(ns, "MetadataDeclaration")):
+            if child.tag == ns_tags["MetadataDeclaration"]:
                 _, _, switch_type, _, _, _ = parse_asic_meta(child, asic_name)
                 return switch_type
     return None
 
+def parse_hostname_and_asic_info(filename, asic_name=None):
+    """ Get hostname, asic sub role and asic switch type with one read of minigraph file.
+
+    Returns (hostname, sub_role, switch_type); sub_role and switch_type are
+    None when asic_name is None or the file does not exist.
+    """
+    if not os.path.isfile(filename):
+        return None, None, None
+
+    hostname = sub_role = switch_type = None
+    meta_parsed = asic_name is None
+    root = iterparse_minigraph(filename, sections=['Hostname', 'MetadataDeclaration'])
+    for child in root:
+        if child.tag == ns_tags["Hostname"] and hostname is None:
+            hostname = child.text
+        elif child.tag == ns_tags["MetadataDeclaration"] and not meta_parsed:
+            sub_role, _, switch_type, _, _, _ = parse_asic_meta(child, asic_name)
+            meta_parsed = True
+
+    return hostname, sub_role, switch_type
+
 def parse_asic_meta_get_devices(root):
     local_devices = []
 
     for child in root:
-        if child.tag == str(QName(ns, "MetadataDeclaration")):
-            device_metas = child.find(str(QName(ns, "Devices")))
-            for device in device_metas.findall(str(QName(ns1, "DeviceMetadata"))):
-                name = device.find(str(QName(ns1, "Name"))).text.lower()
+        if child.tag == ns_tags["MetadataDeclaration"]:
+            device_metas = child.find(ns_tags["Devices"])
+            for device in device_metas.findall(ns1_tags["DeviceMetadata"]):
+                name = device.find(ns1_tags["Name"]).text.lower()
                 local_devices.append(name)
 
     return local_devices
 
 def parse_chassis_hwsku(root,chassis_hostname):
     for child in root:
-        if child.tag == str(QName(ns, "PngDec")):
-            devices = child.find(str(QName(ns, "Devices")))
-            for device in devices.findall(str(QName(ns, "Device"))):
-                if chassis_hostname.lower() ==  device.find(str(QName(ns, "Hostname"))).text.lower():
-                    hwsku =  device.find(str(QName(ns, "HwSku"))).text
-                    return hwsku
+        if child.tag == ns_tags["PngDec"]:
+            for device in get_png_devices(child, chassis_hostname):
+                hwsku =  device.find(ns_tags["HwSku"]).text
+                return hwsku
     return None
 
 def parse_mgmt_intf(child):
     mgmt_intf = {}
-    for mgmtintf in child.find(str(QName(ns, "ManagementIPInterfaces"))).findall(str(QName(ns1, "ManagementIPInterface"))):
-        intfname = mgmtintf.find(str(QName(ns, "AttachTo"))).text
-        ipprefix = mgmtintf.find(str(QName(ns1, "PrefixStr"))).text
+    for mgmtintf in child.find(ns_tags["ManagementIPInterfaces"]).findall(ns1_tags["ManagementIPInterface"]):
+        intfname = mgmtintf.find(ns_tags["AttachTo"]).text
+        ipprefix = mgmtintf.find(ns1_tags["PrefixStr"]).text
         mgmtipn = ipaddress.ip_network(UNICODE_TYPE(ipprefix), False)
         gwaddr = ipaddress.ip_address(next(mgmtipn.hosts()))
         mgmt_intf[(intfname, ipprefix)] = {'gwaddr': gwaddr}
@@ -2920,9 +3140,9 @@ def parse_mgmt_intf(child):
 
 def parse_linecard_mgmt_ip(root, hname):
     linecard_mgmt_intfs = {}
-    dpg = root.find(str(QName(ns, "DpgDec")))
+    dpg = root.find(ns_tags["DpgDec"])
     for child in dpg:
-        hostname = child.find(str(QName(ns, "Hostname")))
+        hostname = child.find(ns_tags["Hostname"])
         if hostname.text.lower() != hname.lower():
             continue
         linecard_mgmt_intfs = parse_mgmt_intf(child)
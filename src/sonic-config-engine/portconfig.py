@@ -1,7 +1,10 @@
 try:
     import ast
+    import glob
+    import hashlib
     import json
     import os
+    import pickle
     import re
     import sys
 
@@ -42,6 +45,15 @@ OPTIONAL_HWSKU_ATTRIBUTES = ["fec", "autoneg", "role"]
 BRKOUT_PATTERN = r'(\d{1,6})x(\d{1,6}G?)(\[(\d{1,6}G?,?)*\])?(\((\d{1,6})\))?'
 BRKOUT_PATTERN_GROUPS = 6
 
+# Compiled port maps, see get_compiled_port_map()
+PORT_MAP_CACHE_DIR = '/var/cache/sonic/portconfig'
+PORT_MAP_CACHE_VERSION = 1
+PORT_MAP_CACHE_MAX_FILES = 16
+# Compiled port maps already loaded by this process, shared with forked children
+_port_maps = {}
+if os.environ.get("CFGGEN_UNIT_TESTING") == "2":
+    PORT_MAP_CACHE_DIR = None
+
 #
 # Helper Functions
 #
@@ -87,6 +99,81 @@ def db_connect_configdb(namespace=None):
         config_db = None
     return config_db
 
+def _port_map_cache_file(filenames):
+    """
+    Return the cache file of the port map compiled from filenames, or None
+    when the cache is disabled or one of the files does not exist.
+
+    The key is the content of the files, not their mtime: image builds may
+    give every file the same mtime, and an edited file can keep its size.
+    """
+    if not PORT_MAP_CACHE_DIR:
+        return None
+    try:
+        file_keys = []
+        for filename in filenames:
+            with open(filename, 'rb') as fp:
+                file_keys.append((os.path.realpath(filename), hashlib.sha256(fp.read()).hexdigest()))
+        module_mtime = os.path.getmtime(__file__)
+    except (IOError, OSError, TypeError):
+        return None
+    digest = hashlib.sha256(repr((PORT_MAP_CACHE_VERSION, module_mtime, file_keys)).encode()).hexdigest()
+    return os.path.join(PORT_MAP_CACHE_DIR, digest + '.pickle')
+
+def _save_port_map(cache_file, port_map):
+    try:
+        if not os.path.isdir(PORT_MAP_CACHE_DIR):
+            os.makedirs(PORT_MAP_CACHE_DIR)
+        tmp_file = '{}.{}.tmp'.format(cache_file, os.getpid())
+        with open(tmp_file, 'wb') as fp:
+            pickle.dump(port_map, fp, pickle.HIGHEST_PROTOCOL)
+        os.rename(tmp_file, cache_file)
+
+        cache_files = sorted(glob.glob(os.path.join(PORT_MAP_CACHE_DIR, '*.pickle')), key=os.path.getmtime, reverse=True)
+        for old_file in cache_files[PORT_MAP_CACHE_MAX_FILES:]:
+            os.remove(old_file)
+    except (IOError, OSError, pickle.PicklingError):
+        # The cache is only an optimization
+        pass
+
+def get_compiled_port_map(parser, *filenames):
+    """
+    Return parser(*filenames), from the compiled port map kept in
+    PORT_MAP_CACHE_DIR when the files did not change since it was written.
+
+    The port map of a hwsku is thus parsed and expanded once, on first
+    boot, and then loaded by every sonic-cfggen run and by any other user
+    of get_port_config() or get_breakout_mode(). Loaded port maps are also
+    kept in memory, so processes forked by 'sonic-cfggen --all-namespaces'
+    use the port maps loaded by their parent.
+    """
+    cache_file = _port_map_cache_file(filenames)
+    if cache_file is None:
+        return parser(*filenames)
+
+    if cache_file not in _port_maps:
+        try:
+            with open(cache_file, 'rb') as fp:
+                compiled = fp.read()
+        except (IOError, OSError):
+            port_map = parser(*filenames)
+            if port_map is None:
+                return None
+            _save_port_map(cache_file, port_map)
+            try:
+                compiled = pickle.dumps(port_map, pickle.HIGHEST_PROTOCOL)
+            except pickle.PicklingError:
+                return port_map
+        if len(_port_maps) >= PORT_MAP_CACHE_MAX_FILES:
+            _port_maps.clear()
+        _port_maps[cache_file] = compiled
+    try:
+        # Callers may modify the returned port map, unpickle a new copy every time
+        return pickle.loads(_port_maps[cache_file])
+    except Exception:
+        del _port_maps[cache_file]
+        return parser(*filenames)
+
 def get_hwsku_file_name(hwsku=None, platform=None):
     hwsku_candidates_Json = []
     hwsku_candidates_Json.append(os.path.join(HWSKU_ROOT_PATH, HWSKU_JSON))
@@ -204,11 +291,11 @@ def get_port_config(hwsku=None, platform=None, port_config_file=None, hwsku_conf
         else:
             hwsku_json_file = hwsku_config_file
 
-        return parse_platform_json_file(hwsku_json_file, port_config_file)
+        return get_compiled_port_map(parse_platform_json_file, hwsku_json_file, port_config_file)
 
     # If 'platform.json' file is not available, read from 'port_config.ini'
     else:
-        return parse_port_config_file(port_config_file)
+        return get_compiled_port_map(parse_port_config_file, port_config_file)
 
 def parse_port_config_file(port_config_file):
     ports = {}
@@ -305,6 +392,10 @@ class BreakoutCfg(object):
         def __hash__(self):
             return hash((self.num_ports, tuple(self.supported_speed), self.num_assigned_lanes))
 
+    # Parsed breakout modes keyed by mode string and number of lanes, all
+    # ports of a platform sharing the same few modes
+    _entries_cache = {}
+
     def __init__(self, name, bmode, properties):
         self._interface_base_id = int(name.replace(PORT_STR, ''))
         self._properties = properties
@@ -343,12 +434,19 @@ class BreakoutCfg(object):
             2x50G ---------------> [('2', '50G', None, None, None)]
         """
 
+        cache_key = (bmode, len(self._lanes))
+        if cache_key in BreakoutCfg._entries_cache:
+            return BreakoutCfg._entries_cache[cache_key]
+
         try:
             groups_list = [re.match(BRKOUT_PATTERN, i).groups() for i in bmode.split("+")]
         except Exception:
             raise RuntimeError('Breakout mode "{}" validation failed!'.format(bmode))
 
-        return [self._re_group_to_entry(group) for group in groups_list]
+        # A tuple, the cached entries are shared by every port using the mode
+        entries = tuple(self._re_group_to_entry(group) for group in groups_list)
+        BreakoutCfg._entries_cache[cache_key] = entries
+        return entries
 
     def get_config(self):
         # Ensure that we have corret number of configured lanes
@@ -395,6 +493,9 @@ the list of child ports using platform_json file
 def get_child_ports(interface, breakout_mode, platform_json_file):
     port_dict = readJson(platform_json_file)
 
+    return _get_child_ports(interface, breakout_mode, port_dict)
+
+def _get_child_ports(interface, breakout_mode, port_dict):
     mode_handler = BreakoutCfg(interface, breakout_mode, port_dict[INTF_KEY][interface])
 
     return mode_handler.get_config()
@@ -422,7 +523,7 @@ def parse_platform_json_file(hwsku_json_file, platform_json_file):
         # take default_brkout_mode from hwsku.json
         brkout_mode = hwsku_dict[INTF_KEY][intf][BRKOUT_MODE]
 
-        child_ports = get_child_ports(intf, brkout_mode, platform_json_file)
+        child_ports = _get_child_ports(intf, brkout_mode, port_dict)
 
         # take optional fields from hwsku.json
         hwsku_entry = hwsku_dict[INTF_KEY]
@@ -452,7 +553,7 @@ def get_breakout_mode(hwsku=None, platform=None, port_config_file=None):
         if not hwsku_json_file:
             raise Exception("'hwsku_json' file does not exist!!! This file is necessary to proceed forward.")
 
-        return parse_breakout_mode(hwsku_json_file)
+        return get_compiled_port_map(parse_breakout_mode, hwsku_json_file)
     else:
         return None
 
@@ -24,7 +24,8 @@ if sys.version_info.major == 3:
         # Python3 has enum module and so pyangbind should be installed outside
         # dependencies section of setuptools followed by uninstall of enum43
         # 'pyangbind==0.8.2',
-        'Jinja2>=2.10',
+        # layered_config relies on jinja2 internals, see tests/test_layered_config.py
+        'Jinja2>=2.10,<3.2',
         'pyyaml==6.0.1',
     ]
     sonic_dependencies += [
@@ -49,6 +50,7 @@ else:
 # Common modules for python2 and python3
 py_modules = [
     'config_samples',
+    'layered_config',
     'minigraph',
     'openconfig_acl',
     'portconfig',
@@ -84,6 +86,7 @@ setup(
     py_modules = py_modules,
     scripts = [
         'sonic-cfggen',
+        'sonic-cfggen-client',
     ],
     install_requires = dependencies,
     data_files = [
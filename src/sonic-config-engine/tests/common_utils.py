@@ -112,3 +112,14 @@ def cmp_tables(f_rcvd, f_exp):
     except Exception as e:
         return False
     return True
+
+def load_sonic_cfggen():
+    """ Import the sonic-cfggen script as a module, to test its functions directly """
+    import importlib.machinery
+    import importlib.util
+    path = os.path.join(os.path.dirname(os.path.realpath(__file__)), '..', 'sonic-cfggen')
+    loader = importlib.machinery.SourceFileLoader('sonic_cfggen', path)
+    spec = importlib.util.spec_from_loader(loader.name, loader)
+    module = importlib.util.module_from_spec(spec)
+    loader.exec_module(module)
+    return module
@@ -0,0 +1,97 @@
+"""
+Benchmark of get_port_config() on a synthetic breakout SKU, parsed without the compiled port map,
+with a cold compiled port map, with a warm one loaded from disk and with one already in memory
+
+    python -m tests.portconfig_benchmark [iterations] [parent ports] [breakout mode]
+
+By default the SKU has 128 8-lane parent ports in 4x100G mode, 512 ports in total, and each parent
+port offers 4 breakout modes. platform.json, hwsku.json and the cache directory are created in a
+temporary directory.
+"""
+import json
+import os
+import shutil
+import sys
+import tempfile
+import timeit
+
+import portconfig
+
+LANES = 8
+BREAKOUT_MODES = ['1x400G', '2x200G', '4x100G[50G,25G]', '8x50G']
+
+
+def create_sku_files(root, n_parent_ports, breakout_mode):
+    platform_interfaces = {}
+    hwsku_interfaces = {}
+    for i in range(n_parent_ports):
+        name = 'Ethernet{}'.format(i * LANES)
+        breakout_modes = {}
+        for mode in BREAKOUT_MODES:
+            n_children = int(mode.split('x')[0])
+            breakout_modes[mode] = ['Eth{}/{}'.format(i + 1, j + 1) for j in range(n_children)]
+        platform_interfaces[name] = {
+            'index': ','.join([str(i + 1)] * LANES),
+            'lanes': ','.join(str(i * LANES + j) for j in range(LANES)),
+            'breakout_modes': breakout_modes,
+        }
+        hwsku_interfaces[name] = {'default_brkout_mode': breakout_mode}
+    platform_json = os.path.join(root, 'platform.json')
+    with open(platform_json, 'w') as f:
+        json.dump({'interfaces': platform_interfaces}, f, indent=4)
+    hwsku_json = os.path.join(root, 'hwsku.json')
+    with open(hwsku_json, 'w') as f:
+        json.dump({'interfaces': hwsku_interfaces}, f, indent=4)
+    return platform_json, hwsku_json
+
+
+def run(iterations, platform_json, hwsku_json, cache_dir):
+    def get_port_config():
+        return portconfig.get_port_config(port_config_file=platform_json, hwsku_config_file=hwsku_json)
+
+    def cold_cache_call():
+        for cache_file in os.listdir(cache_dir):
+            os.remove(os.path.join(cache_dir, cache_file))
+        portconfig._port_maps.clear()
+        get_port_config()
+
+    def warm_cache_call():
+        # As in a new process, which loads the compiled map from the cache directory
+        portconfig._port_maps.clear()
+        get_port_config()
+
+    portconfig.PORT_MAP_CACHE_DIR = None
+    ports, _, _ = get_port_config()
+    no_cache = timeit.timeit(get_port_config, number=iterations) / iterations
+    portconfig.PORT_MAP_CACHE_DIR = cache_dir
+    cold_cache = timeit.timeit(cold_cache_call, number=iterations) / iterations
+    warm_cache = timeit.timeit(warm_cache_call, number=iterations) / iterations
+    in_memory = timeit.timeit(get_port_config, number=iterations) / iterations
+    assert get_port_config()[0] == ports
+
+    print('{} ports, {} iterations'.format(len(ports), iterations))
+    print('{:<24}{:>10}'.format('port map', 'ms'))
+    print('{:<24}{:>10.2f}'.format('parsed, no cache', no_cache * 1e3))
+    print('{:<24}{:>10.2f}'.format('cold compiled map', cold_cache * 1e3))
+    print('{:<24}{:>10.2f}'.format('warm compiled map', warm_cache * 1e3))
+    print('{:<24}{:>10.2f}'.format('in-memory map', in_memory * 1e3))
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    n_parent_ports = int(sys.argv[2]) if len(sys.argv) > 2 else 128
+    breakout_mode = sys.argv[3] if len(sys.argv) > 3 else '4x100G[50G,25G]'
+    root = tempfile.mkdtemp()
+    cache_dir_saved = portconfig.PORT_MAP_CACHE_DIR
+    try:
+        platform_json, hwsku_json = create_sku_files(root, n_parent_ports, breakout_mode)
+        cache_dir = os.path.join(root, 'cache')
+        os.makedirs(cache_dir)
+        run(iterations, platform_json, hwsku_json, cache_dir)
+    finally:
+        portconfig.PORT_MAP_CACHE_DIR = cache_dir_saved
+        shutil.rmtree(root)
+
+
+if __name__ == '__main__':
+    main()
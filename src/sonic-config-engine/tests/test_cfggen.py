@@ -1,9 +1,15 @@
+import contextlib
+import io
 import json
+import shutil
 import subprocess
 import os
+import tempfile
+import minigraph
 import tests.common_utils as utils
 
-from unittest import TestCase
+from collections import OrderedDict
+from unittest import TestCase, mock
 
 TOR_ROUTER = 'ToRRouter'
 BACKEND_TOR_ROUTER = 'BackEndToRRouter'
@@ -141,6 +147,22 @@ class TestCfgGen(TestCase):
         output = self.run_script(argument)
         self.assertEqual(output.strip(), 'value1')
 
+    def test_write_to_db_dry_run(self):
+        argument = ['-a', '{"PORT": {"Ethernet0": {"mtu": "9100", "speed": "40000"}, "Ethernet999": {"mtu": "9100"}}}',
+                    '-w', '--dry-run']
+        output = self.run_script(argument)
+        self.assertEqual(utils.to_dict(output.strip()), {
+            'PORT': {
+                'Ethernet0': {'speed': '40000'},
+                'Ethernet999': {'mtu': '9100'}
+            }
+        })
+
+    def test_dry_run_requires_write_to_db(self):
+        argument = ['-a', '{"key1":"value1"}', '--dry-run']
+        with self.assertRaises(subprocess.CalledProcessError):
+            self.run_script(argument)
+
     def test_additional_json_data_level1_key(self):
         argument = ['-a', '{"k1":{"k11":"v11","k12":"v12"}, "k2":{"k22":"v22"}}', '--var-json', 'k1']
         output = self.run_script(argument)
@@ -1151,3 +1173,117 @@ class TestCfgGen(TestCase):
         self.assertEqual(
             utils.liststr_to_dict(output.strip()),
             utils.liststr_to_dict("['192.168.200.15|161|', '100.0.0.6|161|', '100.0.0.7|161|', 'fe80::1%Management0|161|']"))
+
+
+class FakeScriptConfigDB(object):
+    db_name = 'CONFIG_DB'
+    TABLE_NAME_SEPARATOR = '|'
+
+    def __init__(self, raw_tables):
+        self.raw_tables = raw_tables
+        self.tables_read = []
+
+    def get_redis_client(self, db_name):
+        return self
+
+    def raw_to_typed(self, raw_data):
+        return dict((field.rstrip('@'), value.split(',') if field.endswith('@') else value) for field, value in raw_data.items())
+
+    def deserialize_key(self, key):
+        return tuple(key.split('|')) if '|' in key else key
+
+    def get_table(self, table):
+        self.tables_read.append(table)
+        return dict((self.deserialize_key(key), self.raw_to_typed(entry)) for key, entry in self.raw_tables.get(table, {}).items())
+
+    def run_script(self, client, sha, keys, argv):
+        self.script_argv = argv
+        # runRedisScript() returns the strings of the reply as a set
+        return set([json.dumps(dict((table, self.raw_tables[table]) for table in argv[1::2] if table in self.raw_tables))])
+
+
+class TestReadConfigDBTables(TestCase):
+
+    def setUp(self):
+        self.cfggen = utils.load_sonic_cfggen()
+        self.configdb = FakeScriptConfigDB({
+            'ACL_RULE': {'DATAACL|RULE_1': {'PRIORITY': '9999', 'ports@': 'Ethernet0,Ethernet4'},
+                         'DATAACL|RULE_2': {'PRIORITY': '9999', 'ports@': 'Ethernet0,Ethernet4'}},
+            'DEVICE_METADATA': {'localhost': {'hostname': 'switch1'}},
+        })
+
+    def test_read_tables_with_script(self):
+        with mock.patch.object(self.cfggen, 'loadRedisScript', return_value='sha'), \
+                mock.patch.object(self.cfggen, 'runRedisScript', side_effect=self.configdb.run_script):
+            tables = self.cfggen._read_config_db_tables(self.configdb, ['ACL_RULE', 'DEVICE_METADATA', 'VLAN'])
+        self.assertEqual(tables, {
+            'ACL_RULE': {('DATAACL', 'RULE_1'): {'PRIORITY': '9999', 'ports': ['Ethernet0', 'Ethernet4']},
+                         ('DATAACL', 'RULE_2'): {'PRIORITY': '9999', 'ports': ['Ethernet0', 'Ethernet4']}},
+            'DEVICE_METADATA': {'localhost': {'hostname': 'switch1'}},
+        })
+        self.assertEqual(self.configdb.script_argv, ['|', 'ACL_RULE', 'ACL_RULE|*', 'DEVICE_METADATA', 'DEVICE_METADATA|*', 'VLAN', 'VLAN|*'])
+        self.assertEqual(self.configdb.tables_read, [])
+
+    def test_read_tables_without_script(self):
+        with mock.patch.object(self.cfggen, 'loadRedisScript', side_effect=TypeError):
+            tables = self.cfggen._read_config_db_tables(self.configdb, ['DEVICE_METADATA', 'VLAN'])
+        self.assertEqual(tables, {'DEVICE_METADATA': {'localhost': {'hostname': 'switch1'}}})
+        self.assertEqual(self.configdb.tables_read, ['DEVICE_METADATA', 'VLAN'])
+
+
+
+class TestWriteConfigDBChanges(TestCase):
+
+    def setUp(self):
+        self.cfggen = utils.load_sonic_cfggen()
+        self.configdb = mock.MagicMock()
+
+    def test_write_batches(self):
+        changes = OrderedDict([('VLAN', None), ('ACL_TABLE', None), ('PORT', OrderedDict([('Ethernet0', {'mtu': '9100'}),
+                                                                                          ('Ethernet4', {})])),
+                               ('LOOPBACK', None)])
+        with mock.patch.object(self.cfggen, 'CONFIG_DB_WRITE_BATCH_SIZE', 2):
+            self.cfggen._write_config_db_changes(self.configdb, changes)
+        # Deleted tables count towards the batch size like entries
+        self.assertEqual([c[0][0] for c in self.configdb.mod_config.call_args_list], [
+            {'VLAN': None, 'ACL_TABLE': None},
+            {'PORT': {'Ethernet0': {'mtu': '9100'}, 'Ethernet4': {}}},
+            {'LOOPBACK': None},
+        ])
+
+class TestCfgGenMinigraphCache(TestCase):
+
+    def setUp(self):
+        self.cfggen = utils.load_sonic_cfggen()
+        self.test_dir = os.path.dirname(os.path.realpath(__file__))
+        self.sample_graph = os.path.join(self.test_dir, 'simple-sample-graph-case.xml')
+        self.port_config = os.path.join(self.test_dir, 't0-sample-port-config.ini')
+        self.cache_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir)
+
+    def run_cfggen(self, argument):
+        stdout = io.StringIO()
+        stderr = io.StringIO()
+        # The cache is off with CFGGEN_UNIT_TESTING=2, test the default path
+        with mock.patch.dict(os.environ, {'CFGGEN_UNIT_TESTING': ''}), \
+                mock.patch.object(minigraph, 'MINIGRAPH_CACHE_DIR', self.cache_dir), \
+                contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+            self.cfggen.main(argument)
+        return stdout.getvalue(), stderr.getvalue()
+
+    def test_minigraph_cache_hit(self):
+        argument = ['-m', self.sample_graph, '-p', self.port_config, '--cache-stats', '--print-data']
+        output, stats = self.run_cfggen(argument)
+        self.assertIn(' 0 hits', stats)
+        self.assertNotIn(' 0 misses', stats)
+        self.assertEqual(len([f for f in os.listdir(self.cache_dir) if f.endswith('.pickle')]), 1)
+
+        cached_output, stats = self.run_cfggen(argument)
+        self.assertIn(' 0 misses', stats)
+        self.assertNotIn(' 0 hits', stats)
+        self.assertEqual(cached_output, output)
+
+        _, stats = self.run_cfggen(argument + ['--no-cache'])
+        self.assertEqual(stats, '')
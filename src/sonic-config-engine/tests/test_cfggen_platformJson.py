@@ -1,13 +1,16 @@
 import ast
 import json
 import os
+import shutil
 import subprocess
 import sys
+import tempfile
 import ast
 import tests.common_utils as utils
 
 from unittest import TestCase
-from portconfig import get_port_config, INTF_KEY
+import portconfig
+from portconfig import get_port_config, parse_platform_json_file, INTF_KEY
 
 if sys.version_info.major == 3:
     from unittest import mock
@@ -116,3 +119,48 @@ class TestCfgGenPlatformJson(TestCase):
         (ports, _, _) = get_port_config(port_config_file=self.platform_json)
         self.assertNotEqual(ports, None)
         self.assertEqual(ports, {})
+
+    def test_compiled_port_map(self):
+        cache_dir = tempfile.mkdtemp()
+        try:
+            expected = parse_platform_json_file(self.hwsku_json, self.platform_json)
+            with mock.patch('portconfig.PORT_MAP_CACHE_DIR', cache_dir):
+                self.assertEqual(get_port_config(port_config_file=self.platform_json, hwsku_config_file=self.hwsku_json), expected)
+                self.assertEqual(len(os.listdir(cache_dir)), 1)
+
+                with mock.patch('portconfig.parse_platform_json_file') as parser:
+                    result = get_port_config(port_config_file=self.platform_json, hwsku_config_file=self.hwsku_json)
+                    self.assertEqual(result, expected)
+                    parser.assert_not_called()
+        finally:
+            shutil.rmtree(cache_dir)
+
+    def test_compiled_port_map_content_change(self):
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            hwsku_json = os.path.join(tmp_dir, 'hwsku.json')
+            shutil.copy(self.hwsku_json, hwsku_json)
+            with mock.patch('portconfig.PORT_MAP_CACHE_DIR', os.path.join(tmp_dir, 'cache')):
+                ports, _, _ = get_port_config(port_config_file=self.platform_json, hwsku_config_file=hwsku_json)
+                self.assertEqual(ports['Ethernet0']['speed'], '100000')
+
+                # Same size and mtime, only the content changed
+                stat = os.stat(hwsku_json)
+                with open(hwsku_json) as f:
+                    content = f.read()
+                with open(hwsku_json, 'w') as f:
+                    f.write(content.replace('"1x100G[40G]"', '"4x25G[10G]" ', 1))
+                os.utime(hwsku_json, (stat.st_atime, stat.st_mtime))
+                self.assertEqual(os.path.getsize(hwsku_json), stat.st_size)
+
+                ports, _, _ = get_port_config(port_config_file=self.platform_json, hwsku_config_file=hwsku_json)
+                self.assertEqual(ports['Ethernet0']['speed'], '25000')
+        finally:
+            shutil.rmtree(tmp_dir)
+
+    def test_breakout_mode_entries_immutable(self):
+        properties = {'lanes': '0,1,2,3', 'index': '1,1,1,1', 'breakout_modes': {'1x100G[40G]': ['Eth1'], '2x50G': ['Eth1/1', 'Eth1/2']}}
+        breakout = portconfig.BreakoutCfg('Ethernet0', '2x50G', properties)
+        entries = breakout._str_to_entries('2x50G')
+        self.assertIsInstance(entries, tuple)
+        self.assertIs(portconfig.BreakoutCfg('Ethernet4', '2x50G', properties)._str_to_entries('2x50G'), entries)
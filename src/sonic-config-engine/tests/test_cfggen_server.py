@@ -0,0 +1,175 @@
+import os
+import queue
+import subprocess
+import tempfile
+import time
+import tests.common_utils as utils
+
+from unittest import TestCase
+
+
+class TestCfgGenServer(TestCase):
+
+    def setUp(self):
+        self.test_dir = os.path.dirname(os.path.realpath(__file__))
+        self.script_file = [utils.PYTHON_INTERPRETTER, os.path.join(self.test_dir, '..', 'sonic-cfggen')]
+        self.client_file = [utils.PYTHON_INTERPRETTER, os.path.join(self.test_dir, '..', 'sonic-cfggen-client')]
+        self.sample_graph = os.path.join(self.test_dir, 'simple-sample-graph-case.xml')
+        self.port_config = os.path.join(self.test_dir, 't0-sample-port-config.ini')
+        self.sample_template = os.path.join(self.test_dir, 'sample-template-1.json.j2')
+        self.output_file = os.path.join(self.test_dir, 'output')
+
+        self.socket_path = os.path.join(tempfile.mkdtemp(), 'cfggen.sock')
+        self.env = dict(os.environ, SONIC_CFGGEN_SOCKET=self.socket_path, CFGGEN_UNIT_TESTING="2")
+        self.server = subprocess.Popen(self.script_file + ['--server', self.socket_path], env=self.env)
+        for _ in range(100):
+            if os.path.exists(self.socket_path):
+                break
+            time.sleep(0.1)
+        self.assertTrue(os.path.exists(self.socket_path))
+
+    def tearDown(self):
+        self.server.terminate()
+        self.server.wait()
+        try:
+            os.remove(self.output_file)
+        except OSError:
+            pass
+
+    def run_both(self, argument):
+        direct = subprocess.run(self.script_file + argument, env=self.env, capture_output=True)
+        served = subprocess.run(self.client_file + argument, env=self.env, capture_output=True)
+        return direct, served
+
+    def test_var(self):
+        argument = ['-m', self.sample_graph, '-p', self.port_config, '-v', "DEVICE_METADATA['localhost']['hwsku']"]
+        direct, served = self.run_both(argument)
+        self.assertEqual(served.returncode, 0)
+        self.assertEqual(served.stdout.decode().strip(), 'Force10-S6000')
+        self.assertEqual(served.stdout, direct.stdout)
+
+    def test_print_data(self):
+        argument = ['-m', self.sample_graph, '-p', self.port_config, '--print-data']
+        direct, served = self.run_both(argument)
+        self.assertEqual(served.returncode, 0)
+        self.assertEqual(served.stdout, direct.stdout)
+
+    def test_template_repeated(self):
+        argument = ['-a', '{"key1":"value1"}', '-t', self.sample_template]
+        direct, _ = self.run_both(argument)
+        for _ in range(3):
+            served = subprocess.run(self.client_file + argument, env=self.env, capture_output=True)
+            self.assertEqual(served.stdout, direct.stdout)
+
+    def test_template_to_file(self):
+        argument = ['-a', '{"key1":"value1"}', '-t', '{},{}'.format(self.sample_template, self.output_file)]
+        served = subprocess.run(self.client_file + argument, env=self.env, capture_output=True)
+        self.assertEqual(served.returncode, 0)
+        self.assertTrue(os.path.exists(self.output_file))
+
+    def test_invalid_argument(self):
+        direct, served = self.run_both(['--no-such-option'])
+        self.assertEqual(served.returncode, direct.returncode)
+        self.assertNotEqual(served.returncode, 0)
+        self.assertIn(b'unrecognized arguments', served.stderr)
+
+    def test_nested_server_rejected(self):
+        for option in ['--server', '--serv', '--server=' + self.socket_path + '.nested']:
+            served = subprocess.run(self.client_file + [option], env=self.env, capture_output=True, timeout=30)
+            self.assertEqual(served.returncode, 2)
+            self.assertIn(b'--server is not allowed', served.stderr)
+
+
+class FakePubSub(object):
+    """ Pubsub which delivers every message late, like a busy listener thread would see it """
+    def __init__(self, redis):
+        self.redis = redis
+        self.patterns = []
+        self.messages = queue.Queue()
+
+    def psubscribe(self, pattern):
+        self.patterns.append(pattern)
+
+    def get_message(self, timeout, ignore_subscribe_messages):
+        try:
+            msg = self.messages.get(timeout=timeout)
+        except queue.Empty:
+            return None
+        time.sleep(0.05)
+        return msg
+
+    def deliver(self, channel, data):
+        for pattern in self.patterns:
+            if pattern == channel or (pattern.endswith('*') and channel.startswith(pattern[:-1])):
+                self.messages.put({'type': 'pmessage', 'pattern': pattern, 'channel': channel, 'data': data})
+
+
+class FakeRedis(object):
+    def __init__(self):
+        self.subscribers = []
+
+    def pubsub(self):
+        pubsub = FakePubSub(self)
+        self.subscribers.append(pubsub)
+        return pubsub
+
+    def publish(self, channel, data):
+        for pubsub in self.subscribers:
+            pubsub.deliver(channel, data)
+
+
+class FakeConfigDB(object):
+    db_name = 'CONFIG_DB'
+    TABLE_NAME_SEPARATOR = '|'
+
+    def __init__(self):
+        self.tables = {}
+        self.redis = FakeRedis()
+        self.get_config_calls = 0
+
+    def get_redis_client(self, db_name):
+        return self.redis
+
+    def get_dbid(self, db_name):
+        return 4
+
+    def get_config(self):
+        self.get_config_calls += 1
+        return {table: dict(entries) for table, entries in self.tables.items()}
+
+    def get_entry(self, table, key):
+        return dict(self.tables.get(table, {}).get(key, {}))
+
+    def deserialize_key(self, key):
+        return key
+
+    def set_entry(self, table, key, entry):
+        self.tables.setdefault(table, {})[key] = entry
+        self.redis.publish('__keyspace@4__:{}|{}'.format(table, key), 'hset')
+
+
+class TestConfigDBSnapshot(TestCase):
+
+    def setUp(self):
+        self.cfggen = utils.load_sonic_cfggen()
+        self.configdb = FakeConfigDB()
+
+    def test_read_own_writes(self):
+        self.configdb.set_entry('DEVICE_METADATA', 'localhost', {'hwsku': 'hwsku1'})
+        snapshot = self.cfggen.ConfigDBSnapshot(self.configdb)
+        self.assertEqual(snapshot.get_config()['DEVICE_METADATA']['localhost']['hwsku'], 'hwsku1')
+        for i in range(2, 5):
+            self.configdb.set_entry('DEVICE_METADATA', 'localhost', {'hwsku': 'hwsku{}'.format(i)})
+            # the notification is still on its way, the marker makes the read wait for it
+            self.assertEqual(snapshot.get_config()['DEVICE_METADATA']['localhost']['hwsku'], 'hwsku{}'.format(i))
+        self.assertEqual(self.configdb.get_config_calls, 1)
+
+    def test_barrier_timeout(self):
+        snapshot = self.cfggen.ConfigDBSnapshot(self.configdb)
+        snapshot.get_config()
+        snapshot.BARRIER_TIMEOUT = 0.01
+        self.configdb.redis.publish = lambda channel, data: None
+        self.configdb.tables['DEVICE_METADATA'] = {'localhost': {'hwsku': 'hwsku2'}}
+        # without the marker the whole CONFIG_DB is read again
+        self.assertEqual(snapshot.get_config()['DEVICE_METADATA']['localhost']['hwsku'], 'hwsku2')
+        self.assertEqual(self.configdb.get_config_calls, 2)
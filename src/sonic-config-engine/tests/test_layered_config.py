@@ -0,0 +1,192 @@
+import inspect
+from unittest import TestCase
+
+import jinja2
+import jinja2.runtime
+
+from layered_config import LayeredConfig, LayeredContext, LayeredTemplate, LazyConfigDB, OverlayConfig, deep_update, get_tables
+
+
+class FakeConfigDB(object):
+    TABLE_NAME_SEPARATOR = '|'
+    db_name = 'CONFIG_DB'
+
+    def __init__(self, config):
+        self.config = config
+        self.tables_read = []
+
+    def get_redis_client(self, db_name):
+        return self
+
+    def get_table(self, table):
+        self.tables_read.append(table)
+        return self.config.get(table, {})
+
+    def get_config(self):
+        self.tables_read.append('*')
+        return self.config
+
+
+class TestLayeredConfig(TestCase):
+
+    def setUp(self):
+        self.minigraph = {
+            'DEVICE_METADATA': {'localhost': {'hostname': 'switch1', 'hwsku': 'Force10-S6000'}},
+            'PORT': {'Ethernet0': {'speed': '40000'}, 'Ethernet4': {'speed': '40000'}}
+        }
+        self.additional = {
+            'DEVICE_METADATA': {'localhost': {'hostname': 'switch2', 'mac': '00:11:22:33:44:55'}},
+            'VERSION': 1
+        }
+        self.config = LayeredConfig([self.minigraph])
+        self.config.add_layer(self.additional)
+
+    def test_last_writer_wins(self):
+        localhost = self.config['DEVICE_METADATA']['localhost']
+        self.assertEqual(localhost['hostname'], 'switch2')
+        self.assertEqual(localhost['hwsku'], 'Force10-S6000')
+        self.assertEqual(localhost['mac'], '00:11:22:33:44:55')
+        self.assertEqual(list(localhost), ['hostname', 'hwsku', 'mac'])
+
+    def test_single_layer_not_copied(self):
+        self.assertIs(self.config['PORT'], self.minigraph['PORT'])
+
+    def test_to_dict_copies_layers(self):
+        data = self.config.to_dict()
+        self.assertEqual(data['PORT'], self.minigraph['PORT'])
+        self.assertIsNot(data['PORT'], self.minigraph['PORT'])
+        data['PORT']['Ethernet0']['speed'] = '100000'
+        data['DEVICE_METADATA']['localhost'].pop('hwsku')
+        self.assertEqual(self.minigraph['PORT']['Ethernet0']['speed'], '40000')
+        self.assertEqual(self.minigraph['DEVICE_METADATA']['localhost']['hwsku'], 'Force10-S6000')
+
+    def test_to_dict_matches_deep_update(self):
+        data = {}
+        for layer in [self.minigraph, self.additional]:
+            deep_update(data, layer)
+        self.assertEqual(self.config.to_dict(), data)
+
+    def test_scalar_replaces_dict(self):
+        self.config.add_layer({'PORT': None})
+        self.assertIsNone(self.config['PORT'])
+        self.assertEqual(self.config.to_dict()['PORT'], None)
+
+    def test_mapping_interface(self):
+        self.assertEqual(len(self.config), 3)
+        self.assertIn('VERSION', self.config)
+        self.assertNotIn('VLAN', self.config)
+        self.assertIsNone(self.config.get('VLAN'))
+        with self.assertRaises(KeyError):
+            self.config['VLAN']
+        self.assertEqual(self.config.to_dict(), {
+            'DEVICE_METADATA': {'localhost': {'hostname': 'switch2', 'hwsku': 'Force10-S6000',
+                                              'mac': '00:11:22:33:44:55'}},
+            'PORT': {'Ethernet0': {'speed': '40000'}, 'Ethernet4': {'speed': '40000'}},
+            'VERSION': 1
+        })
+
+
+class TestLazyConfigDB(TestCase):
+
+    def setUp(self):
+        self.configdb = FakeConfigDB({
+            'DEVICE_METADATA': {'localhost': {'hostname': 'switch1'}},
+            'ACL_RULE': {'DATAACL|RULE_1': {'PRIORITY': '9999'}}
+        })
+        self.config = LayeredConfig([{'DEVICE_METADATA': {'localhost': {'hwsku': 'Force10-S6000'}}}])
+        self.config.add_layer(LazyConfigDB(self.configdb))
+
+    def test_table_read_on_first_access(self):
+        self.assertEqual(self.config['DEVICE_METADATA']['localhost'], {'hwsku': 'Force10-S6000', 'hostname': 'switch1'})
+        self.assertEqual(self.configdb.tables_read, ['DEVICE_METADATA'])
+
+    def test_absent_table_read_once(self):
+        self.assertNotIn('VLAN', self.config)
+        self.assertNotIn('VLAN', self.config)
+        self.assertRaises(KeyError, lambda: self.config['VLAN'])
+        self.assertEqual(self.configdb.tables_read, ['VLAN'])
+
+    def test_prefetch(self):
+        reads = []
+        def read_tables(table_names):
+            reads.append(table_names)
+            return get_tables(self.configdb, table_names)
+        config_db = LazyConfigDB(self.configdb, read_tables)
+        config_db.prefetch(['VLAN', 'ACL_RULE', 'range'])
+        self.assertEqual(reads, [['ACL_RULE', 'VLAN', 'range']])
+        self.assertEqual(config_db['ACL_RULE']['DATAACL|RULE_1']['PRIORITY'], '9999')
+        self.assertNotIn('VLAN', config_db)
+        self.assertNotIn('range', config_db)
+        self.assertEqual(reads, [['ACL_RULE', 'VLAN', 'range']])
+
+    def test_iteration_reads_whole_db(self):
+        self.assertEqual(set(self.config.to_dict()), set(['DEVICE_METADATA', 'ACL_RULE']))
+        self.assertEqual(self.configdb.tables_read, ['*'])
+
+    def test_bool_reads_whole_db_only_when_needed(self):
+        self.assertIn('ACL_RULE', self.config)
+        self.assertTrue(self.config.layers[-1])
+        self.assertEqual(self.configdb.tables_read, ['ACL_RULE'])
+        self.assertFalse(LazyConfigDB(FakeConfigDB({})))
+
+    def test_include_does_not_read_whole_db(self):
+        env = jinja2.Environment(loader=jinja2.DictLoader({
+            'main.j2': '{% set suffix = "!" %}{% for x in [1] %}{% include "hostname.j2" %}{% endfor %}'
+                       '{% from "macros.j2" import hwsku with context %}{{ hwsku() }}',
+            'hostname.j2': '{{ DEVICE_METADATA.localhost.hostname }}{{ x }}{{ suffix }} ',
+            'macros.j2': '{% macro hwsku() %}{{ DEVICE_METADATA.localhost.hwsku }}{% endmacro %}',
+        }))
+        env.context_class = LayeredContext
+        env.template_class = LayeredTemplate
+        template = env.get_template('main.j2')
+        context = template.new_context(LayeredConfig([template.globals, self.config]), shared=True)
+        self.assertEqual(env.concat(template.root_render_func(context)), 'switch11! Force10-S6000')
+        self.assertEqual(self.configdb.tables_read, ['DEVICE_METADATA'])
+
+
+class TestJinja2Internals(TestCase):
+    """
+    LayeredContext, LayeredTemplate and sonic-cfggen _render_template() rely
+    on these jinja2 internals, which are not part of its public API
+    """
+
+    def test_template_internals(self):
+        template = jinja2.Environment().from_string('{{ x }}')
+        self.assertTrue(callable(template.root_render_func))
+        parameters = list(inspect.signature(jinja2.Template.new_context).parameters)
+        self.assertEqual(parameters, ['self', 'vars', 'shared', 'locals'])
+        self.assertTrue(callable(jinja2.runtime.Context.get_all))
+        self.assertTrue(hasattr(jinja2.runtime, 'missing'))
+
+    def test_include_passes_shared_context(self):
+        seen = []
+        class RecordingTemplate(LayeredTemplate):
+            def new_context(self, vars=None, shared=False, locals=None):
+                seen.append((type(vars), shared, locals))
+                return super(RecordingTemplate, self).new_context(vars, shared, locals)
+        env = jinja2.Environment(loader=jinja2.DictLoader({
+            'main.j2': '{% set y = 2 %}{% include "child.j2" %}',
+            'child.j2': '{{ x }}{{ y }}',
+        }))
+        env.context_class = LayeredContext
+        env.template_class = RecordingTemplate
+        template = env.get_template('main.j2')
+        data = LayeredConfig([{'x': 1}])
+        context = template.new_context(data, shared=True)
+        self.assertEqual(env.concat(template.root_render_func(context)), '12')
+        # the include gets get_all() of the context, not a dict copy of it
+        self.assertEqual(seen[1][0], OverlayConfig)
+        self.assertTrue(seen[1][1])
+
+
+class TestOverlayConfig(TestCase):
+
+    def test_variables_hide_config(self):
+        config = LayeredConfig([{'PORT': {'Ethernet0': {}}, 'VLAN': {'Vlan1000': {}}}])
+        overlay = OverlayConfig({'PORT': {'Ethernet4': {}}, 'x': 1}, config)
+        self.assertEqual(overlay['PORT'], {'Ethernet4': {}})
+        self.assertEqual(overlay['VLAN'], {'Vlan1000': {}})
+        self.assertEqual(dict(overlay), dict(config, PORT={'Ethernet4': {}}, x=1))
+        self.assertEqual(len(overlay), 3)
+        self.assertTrue(OverlayConfig({}, config))
+        self.assertFalse(OverlayConfig({}, LayeredConfig()))
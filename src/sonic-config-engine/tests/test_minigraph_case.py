@@ -1,6 +1,8 @@
 import json
 import os
+import shutil
 import subprocess
+import tempfile
 import ipaddress
 import tests.common_utils as utils
 import minigraph
@@ -575,3 +577,54 @@ class TestCfgGenCaseInsensitive(TestCase):
         # TC2: For other minigraph, result should not contain FLEX_COUNTER_TABLE
         result = minigraph.parse_xml(self.sample_graph, port_config_file=self.port_config)
         self.assertNotIn('FLEX_COUNTER_TABLE', result)
+
+    def test_minigraph_cache(self):
+        cache_dir = tempfile.mkdtemp()
+        try:
+            expected = minigraph.parse_xml(self.sample_graph, port_config_file=self.port_config)
+
+            cache = minigraph.MinigraphCache(cache_dir)
+            result = minigraph.parse_xml(self.sample_graph, port_config_file=self.port_config, cache=cache)
+            self.assertEqual(result, expected)
+            self.assertEqual(cache.hits, 0)
+            self.assertGreater(cache.misses, 0)
+            self.assertEqual([f for f in os.listdir(cache_dir) if f.endswith('.pickle')], [os.path.basename(cache.cache_file)])
+
+            cache = minigraph.MinigraphCache(cache_dir)
+            result = minigraph.parse_xml(self.sample_graph, port_config_file=self.port_config, cache=cache)
+            self.assertEqual(result, expected)
+            self.assertGreater(cache.hits, 0)
+            self.assertEqual(cache.misses, 0)
+            self.assertEqual(cache.stats(), "minigraph cache: {} hits, 0 misses".format(cache.hits))
+        finally:
+            shutil.rmtree(cache_dir)
+
+    def test_minigraph_cache_concurrent_save(self):
+        cache_dir = tempfile.mkdtemp()
+        try:
+            section = minigraph.iterparse_minigraph(self.sample_graph)[0]
+            def parse_tag(section):
+                return section.tag
+            # Both processes load the cache file before either of them saves it
+            caches = [minigraph.MinigraphCache(cache_dir) for _ in range(2)]
+            for asic, cache in enumerate(caches):
+                cache.load(self.sample_graph, 'asic{}'.format(asic))
+            for cache in caches:
+                cache.parse_section(parse_tag, section)
+                cache.save()
+            for asic in range(2):
+                cache = minigraph.MinigraphCache(cache_dir)
+                cache.load(self.sample_graph, 'asic{}'.format(asic))
+                self.assertEqual(cache.parse_section(parse_tag, section), section.tag)
+                self.assertEqual((cache.hits, cache.misses), (1, 0))
+        finally:
+            shutil.rmtree(cache_dir)
+
+    def test_device_metadata_index(self):
+        root = minigraph.iterparse_minigraph(self.sample_graph)
+        meta = root.find(minigraph.ns_tags["MetadataDeclaration"])
+        hostname = minigraph.parse_hostname(self.sample_graph)
+        devices = minigraph.get_device_metadata(meta, hostname.upper())
+        self.assertEqual(len(devices), 1)
+        self.assertEqual(devices[0].find(minigraph.ns1_tags["Name"]).text.lower(), hostname.lower())
+        self.assertEqual(minigraph.get_device_metadata(meta, 'no-such-device'), [])
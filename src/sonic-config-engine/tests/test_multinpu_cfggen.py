@@ -1,11 +1,17 @@
+import contextlib
 import filecmp
+import io
 import json
 import os
+import pickle
 import shutil
 import subprocess
 import sys
+import tempfile
 import unittest
 import yaml
+import minigraph
+import portconfig
 import tests.common_utils as utils
 from unittest import mock
 
@@ -580,6 +586,124 @@ class TestMultiNpuCfgGen(TestCase):
         output = json.loads(self.run_script(argument, check_stderr=False, validateYang=False))
         self.assertDictEqual(output, {})
 
+    def test_parse_hostname_and_asic_info(self):
+        for asic, sub_role in [("asic0", "FrontEnd"), ("asic3", "BackEnd")]:
+            hostname, asic_role, switch_type = minigraph.parse_hostname_and_asic_info(self.sample_graph, asic)
+            self.assertEqual(hostname, HOSTNAME)
+            self.assertEqual(asic_role, sub_role)
+            self.assertEqual(asic_role, minigraph.parse_asic_sub_role(self.sample_graph, asic))
+            self.assertEqual(switch_type, minigraph.parse_asic_switch_type(self.sample_graph, asic))
+        self.assertEqual(minigraph.parse_hostname_and_asic_info(self.sample_graph), (HOSTNAME, None, None))
+
+    def test_all_namespaces_requires_write_to_db(self):
+        for argument in [["-m", self.sample_graph, "--all-namespaces", "--print-data"],
+                         ["-m", self.sample_graph, "--all-namespaces", "-w", "-n", "asic0"],
+                         ["-m", self.sample_graph, "--all-namespaces", "-w", "-p", self.port_config[0]]]:
+            with self.assertRaises(subprocess.CalledProcessError):
+                self.run_script(argument, validateYang=False)
+
+    def test_iterparse_minigraph_sections(self):
+        root = minigraph.iterparse_minigraph(self.sample_graph, sections=["Hostname"])
+        self.assertEqual([child.text for child in root], [HOSTNAME])
+
     def tearDown(self):
         os.environ["CFGGEN_UNIT_TESTING"] = ""
         os.environ["CFGGEN_UNIT_TESTING_TOPOLOGY"] = ""
+
+
+class FileConfigDB(object):
+    """ ConfigDBPipeConnector writing mod_config() data to a file per namespace, so forked workers' writes are seen """
+    out_dir = None
+
+    def __init__(self, use_unix_socket_path=False, namespace=None, **kwargs):
+        self.namespace = namespace
+
+    def connect(self, wait_for_init=True):
+        pass
+
+    def mod_config(self, data):
+        with open(os.path.join(self.out_dir, '{}.pickle'.format(self.namespace or 'host')), 'wb') as f:
+            pickle.dump(data, f)
+
+
+class TestMultiNpuCfgGenAllNamespaces(TestCase):
+
+    def setUp(self):
+        self.cfggen = utils.load_sonic_cfggen()
+        self.parse_port_config_file_saved = portconfig.parse_port_config_file
+        self.test_dir = os.path.dirname(os.path.realpath(__file__))
+        self.test_data_dir = os.path.join(self.test_dir, 'multi_npu_data')
+        self.sample_graph = os.path.join(self.test_data_dir, 'sample-minigraph.xml')
+        self.tmp_dir = tempfile.mkdtemp()
+        self.cache_dir = os.path.join(self.tmp_dir, 'cache')
+        self.parse_log = os.path.join(self.tmp_dir, 'parse.log')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def get_port_config(self, hwsku=None, platform=None, port_config_file=None, hwsku_config_file=None, asic_name=None):
+        if asic_name is None:
+            port_config_file = os.path.join(self.test_data_dir, 'sample_port_config.ini')
+        else:
+            port_config_file = os.path.join(self.test_data_dir, 'sample_port_config-{}.ini'.format(asic_name[len('asic'):]))
+        return portconfig.get_port_config(port_config_file=port_config_file)
+
+    def run_cfggen(self, argument, out_dir):
+        os.makedirs(out_dir)
+        FileConfigDB.out_dir = out_dir
+        stderr = io.StringIO()
+        with mock.patch.dict(os.environ, {'CFGGEN_UNIT_TESTING': ''}), \
+                mock.patch.object(minigraph, 'MINIGRAPH_CACHE_DIR', self.cache_dir), \
+                mock.patch.object(minigraph, 'get_port_config', self.get_port_config), \
+                mock.patch.object(self.cfggen, 'get_port_config', self.get_port_config), \
+                mock.patch.object(self.cfggen, 'DEFAULT_PORT_MAP_CACHE_DIR', os.path.join(self.tmp_dir, 'portconfig')), \
+                mock.patch.object(portconfig, 'parse_port_config_file', self.parse_port_config_file), \
+                mock.patch.object(self.cfggen, 'is_multi_asic', mock.MagicMock(return_value=True)), \
+                mock.patch.object(self.cfggen, 'get_num_asics', mock.MagicMock(return_value=NUM_ASIC)), \
+                mock.patch.object(self.cfggen, 'load_namespace_config'), \
+                mock.patch.object(self.cfggen.device_info, 'get_platform', mock.MagicMock(return_value=None)), \
+                mock.patch.object(self.cfggen, 'ConfigDBPipeConnector', FileConfigDB), \
+                contextlib.redirect_stderr(stderr):
+            try:
+                self.cfggen.main(argument)
+            except SystemExit as e:
+                self.assertEqual(e.code, 0)
+        return stderr.getvalue()
+
+    def parse_port_config_file(self, port_config_file):
+        # Appended to a file, port maps may be parsed by forked workers
+        with open(self.parse_log, 'a') as f:
+            f.write('{} {}\n'.format(os.getpid(), os.path.basename(port_config_file)))
+        return self.parse_port_config_file_saved(port_config_file)
+
+    def read_output(self, out_dir):
+        output = {}
+        for file_name in os.listdir(out_dir):
+            with open(os.path.join(out_dir, file_name), 'rb') as f:
+                output[file_name] = pickle.load(f)
+        return output
+
+    def test_all_namespaces_write_to_db(self):
+        expected = {}
+        for namespace in [None] + ['asic{}'.format(asic) for asic in range(NUM_ASIC)]:
+            argument = ['-m', self.sample_graph, '-w', '--no-cache']
+            if namespace is not None:
+                argument += ['-n', namespace]
+            self.run_cfggen(argument, os.path.join(self.tmp_dir, 'expected', namespace or 'host'))
+            expected.update(self.read_output(os.path.join(self.tmp_dir, 'expected', namespace or 'host')))
+        self.assertFalse(os.path.exists(self.cache_dir))
+        os.remove(self.parse_log)
+
+        self.run_cfggen(['-m', self.sample_graph, '-w', '--all-namespaces'], os.path.join(self.tmp_dir, 'all'))
+        self.assertEqual(self.read_output(os.path.join(self.tmp_dir, 'all')), expected)
+        # Port maps are parsed once, by the parent
+        with open(self.parse_log) as f:
+            parses = sorted(tuple(line.split()) for line in f)
+        self.assertEqual(parses, sorted((str(os.getpid()), 'sample_port_config{}.ini'.format(suffix))
+                                        for suffix in [''] + ['-{}'.format(asic) for asic in range(NUM_ASIC)]))
+
+        # The parent merged the cache entries of all workers
+        for namespace in ['asic{}'.format(asic) for asic in range(NUM_ASIC)]:
+            stats = self.run_cfggen(['-m', self.sample_graph, '-w', '-n', namespace, '--cache-stats'],
+                                    os.path.join(self.tmp_dir, 'cached', namespace))
+            self.assertIn(' 0 misses', stats)
@@ -5,7 +5,8 @@ import subprocess
 import time
 import syslog
 import os
-from swsscommon.swsscommon import ConfigDBConnector
+import json
+from swsscommon.swsscommon import ConfigDBConnector, loadRedisScript, runRedisScript
 import socket
 import threading
 import queue
@@ -15,6 +16,9 @@ import logging
 import netaddr
 import io
 import struct
+import selectors
+import sys
+from collections.abc import Mapping
 
 class CachedDataWithOp:
     OP_NONE = 0
@@ -25,6 +29,8 @@ class CachedDataWithOp:
     STAT_SUCC = 0
     STAT_FAIL = 1
 
+    __slots__ = ('data', 'op', 'status')
+
     def __init__(self, data = None, op = OP_NONE):
         self.data = data
         self.op = op
@@ -42,6 +48,81 @@ class CachedDataWithOp:
             op_str = 'UPDATE'
         return '(%s, %s)' % (self.data, op_str)
 
+class CachedTableRow(Mapping):
+    """Read-only row of the table data cache.
+    Rows having the same fields share one field name tuple, string values are interned and
+    list values are kept as tuples. A row is never modified, update creates a new one.
+    """
+    __slots__ = ('fields', 'values')
+    field_pool = {}
+    @staticmethod
+    def compact_value(val):
+        if type(val) is str:
+            return sys.intern(val)
+        if type(val) is list:
+            return tuple([sys.intern(v) if type(v) is str else v for v in val])
+        return val
+    def __init__(self, data = None):
+        items = sorted(data.items()) if data else []
+        fields = tuple([sys.intern(k) for k, _ in items])
+        self.fields = self.field_pool.setdefault(fields, fields)
+        self.values = tuple([self.compact_value(v) for _, v in items])
+    def __getitem__(self, key):
+        try:
+            val = self.values[self.fields.index(key)]
+        except ValueError:
+            raise KeyError(key)
+        return list(val) if type(val) is tuple else val
+    def __contains__(self, key):
+        return key in self.fields
+    def __iter__(self):
+        return iter(self.fields)
+    def __len__(self):
+        return len(self.fields)
+    def __repr__(self):
+        return repr(dict(self.items()))
+    def update_row(self, upd_data, del_keys):
+        data = {k: v for k, v in zip(self.fields, self.values) if k not in del_keys}
+        data.update(upd_data)
+        return CachedTableRow(data)
+
+class TableDataCache(dict):
+    """Table data cache, maps table key to CachedTableRow"""
+    def __init__(self, table_data = None):
+        super(TableDataCache, self).__init__()
+        if table_data is not None:
+            for table_key, data in table_data.items():
+                self[table_key] = CachedTableRow(data)
+    def get_row(self, table_key):
+        return self.get(table_key, CachedTableRow())
+    def get_mem_usage(self):
+        """Approximate memory used by the cache, values shared by rows are counted once"""
+        usage = {'rows': len(self), 'field_sets': 0, 'index_bytes': sys.getsizeof(self),
+                 'row_bytes': 0, 'field_bytes': 0, 'value_bytes': 0}
+        field_ids = set()
+        value_ids = set()
+        for table_key, row in list(self.items()):
+            usage['index_bytes'] += sys.getsizeof(table_key)
+            usage['row_bytes'] += sys.getsizeof(row) + sys.getsizeof(row.values)
+            if id(row.fields) not in field_ids:
+                field_ids.add(id(row.fields))
+                usage['field_sets'] += 1
+                usage['field_bytes'] += sys.getsizeof(row.fields) + sum([sys.getsizeof(k) for k in row.fields])
+            for val in row.values:
+                vals = val if type(val) is tuple else ()
+                for v in (val,) + vals:
+                    if id(v) not in value_ids:
+                        value_ids.add(id(v))
+                        usage['value_bytes'] += sys.getsizeof(v)
+        usage['total_bytes'] = usage['index_bytes'] + usage['row_bytes'] + usage['field_bytes'] + usage['value_bytes']
+        return usage
+    def get_table_rows(self):
+        table_rows = {}
+        for table_key in list(self.keys()):
+            table = table_key.split('&&', 1)[0]
+            table_rows[table] = table_rows.get(table, 0) + 1
+        return table_rows
+
 bgpd_client = None
 
 def g_run_command(table, command, use_bgpd_client, daemons, ignore_fail = False):
@@ -62,6 +143,23 @@ def g_run_command(table, command, use_bgpd_client, daemons, ignore_fail = False)
             return False
     return True
 
+def g_run_command_list(table, cmd_prefix, cmd_list, daemons):
+    # run commands in one vtysh transaction and return success of each of them
+    command = cmd_prefix + ' '.join(["-c '%s'" % cmd for cmd in cmd_list])
+    if bgpd_client is None:
+        # only one exit status is known when vtysh is run as sub-process
+        return [g_run_command(table, command, True, daemons, False)] * len(cmd_list)
+    ret_list = bgpd_client.run_vtysh_command_list(table, command, daemons)
+    if ret_list is None:
+        return [False] * len(cmd_list)
+    pfx_cnt = len(ret_list) - len(cmd_list) - 1
+    pfx_succ = all(ret_list[:pfx_cnt])
+    ret_list = [pfx_succ and succ for succ in ret_list[pfx_cnt:pfx_cnt + len(cmd_list)]]
+    for cmd, succ in zip(cmd_list, ret_list):
+        if not succ:
+            syslog.syslog(syslog.LOG_ERR, 'command execution failure. Command: "{}{}"'.format(cmd_prefix, cmd))
+    return ret_list
+
 def extract_cmd_daemons(cmd_str):
     # daemon list could be given within brackets at head of input lines
     dm_mark = re.match(r'\[(?P<daemons>.+)\]', cmd_str)
@@ -75,6 +173,9 @@ def extract_cmd_daemons(cmd_str):
 class BgpdClientMgr(threading.Thread):
     VTYSH_MARK = 'vtysh '
     PROXY_SERVER_ADDR = '/etc/frr/bgpd_client_sock'
+    REPLY_TIMEOUT = 120
+    # upper bounds in seconds of command latency histogram buckets
+    LATENCY_BUCKETS = [0.001, 0.01, 0.1, 1, 10]
     ALL_DAEMONS = ['bgpd', 'zebra', 'staticd', 'bfdd', 'ospfd', 'pimd']
     TABLE_DAEMON = {
             'DEVICE_METADATA': ['bgpd'],
@@ -219,6 +320,8 @@ class BgpdClientMgr(threading.Thread):
             raise RuntimeError('connect to FRR daemon failed')
         self.proxy_running = True
         self.lock = threading.Lock()
+        self.rd_bufs = {daemon: bytearray() for daemon in self.client_socks}
+        self.latency_hist = {}
         self.proxy_sock = self.__create_proxy_socket()
         self.cmd_to_daemon = []
         for pat, daemons in self.VTYSH_CMD_DAEMON:
@@ -245,37 +348,110 @@ class BgpdClientMgr(threading.Thread):
                 if len(cmn_daemons) == 0:
                     return []
         return list(cmn_daemons)
-    def __proc_command(self, command, daemons):
-        syslog.syslog(syslog.LOG_DEBUG, 'VTYSH CMD: %s daemons: %s' % (command, daemons))
-        resp = ''
-        ret_val = False
+    def __recv_replies(self, reply_cnt, send_time):
+        # read replies of pipelined commands from all daemons in parallel
+        replies = {daemon: [] for daemon in reply_cnt}
+        # a daemon runs the pipelined commands one after the other, the latency of a
+        # command is counted from the reply to the previous one
+        done_time = {daemon: send_time for daemon in reply_cnt}
+        sel = selectors.DefaultSelector()
+        try:
+            for daemon, cnt in reply_cnt.items():
+                if cnt > 0:
+                    sel.register(self.client_socks[daemon], selectors.EVENT_READ, daemon)
+            while len(sel.get_map()) > 0:
+                events = sel.select(self.REPLY_TIMEOUT)
+                if len(events) == 0:
+                    syslog.syslog(syslog.LOG_ERR, 'socket reading timeout')
+                    break
+                for key, _ in events:
+                    daemon = key.data
+                    try:
+                        rd_msg = key.fileobj.recv(16384)
+                    except socket.error as msg:
+                        syslog.syslog(syslog.LOG_ERR, 'failed to read reply from frr daemon %s: %s' % (daemon, msg))
+                        rd_msg = None
+                    if not rd_msg:
+                        sel.unregister(key.fileobj)
+                        continue
+                    rd_buf = self.rd_bufs[daemon]
+                    rd_buf += rd_msg
+                    while len(replies[daemon]) < reply_cnt[daemon]:
+                        # reply is terminated by 3 zero bytes followed by return code
+                        msg_end = rd_buf.find(b'\0\0\0')
+                        if msg_end < 0 or msg_end + 3 >= len(rd_buf):
+                            break
+                        replies[daemon].append((rd_buf[msg_end + 3], rd_buf[:msg_end].decode('utf-8', 'replace')))
+                        del rd_buf[:msg_end + 4]
+                        now = time.time()
+                        self.__add_latency(daemon, now - done_time[daemon])
+                        done_time[daemon] = now
+                    if len(replies[daemon]) >= reply_cnt[daemon]:
+                        sel.unregister(key.fileobj)
+        finally:
+            sel.close()
+        return replies
+    def __add_latency(self, daemon, latency):
+        hist = self.latency_hist.setdefault(daemon, [0] * (len(self.LATENCY_BUCKETS) + 1))
+        idx = 0
+        while idx < len(self.LATENCY_BUCKETS) and latency >= self.LATENCY_BUCKETS[idx]:
+            idx += 1
+        hist[idx] += 1
+    def log_latency(self):
+        bucket_names = ['<%gs' % b for b in self.LATENCY_BUCKETS] + ['>=%gs' % self.LATENCY_BUCKETS[-1]]
+        for daemon, hist in sorted(self.latency_hist.items()):
+            syslog.syslog(syslog.LOG_INFO, '[bgp cfgd] %s command latency: %s' %
+                          (daemon, ' '.join(['%s:%d' % (name, cnt) for name, cnt in zip(bucket_names, hist)])))
+    def __proc_command_list(self, cmd_list, daemons):
+        syslog.syslog(syslog.LOG_DEBUG, 'VTYSH CMD: %s daemons: %s' % (cmd_list, daemons))
+        # commands are pipelined: all of them are queued to every daemon before reading any reply,
+        # daemons run them in order and reply in the same order
+        reply_cnt = {}
+        send_failed = False
+        send_time = time.time()
         for daemon in daemons:
             sock = self.client_socks.get(daemon, None)
             if sock is None:
                 syslog.syslog(syslog.LOG_ERR, 'daemon %s is not connected' % daemon)
                 continue
             try:
-                self.__send_data(sock, command + '\0')
+                self.__send_data(sock, ''.join([command + '\0' for command in cmd_list]))
             except socket.error as msg:
                 syslog.syslog(syslog.LOG_ERR, 'failed to send command to frr daemon: %s' % msg)
-                return (False, None)
-            ret_code, reply = self.__get_reply(sock)
-            if ret_code is None or ret_code != 0:
-                if ret_code is None:
+                send_failed = True
+                continue
+            reply_cnt[daemon] = len(cmd_list)
+        if send_failed and len(reply_cnt) == 0:
+            return [(False, None)] * len(cmd_list)
+        replies = self.__recv_replies(reply_cnt, send_time)
+        ret_list = []
+        for idx in range(len(cmd_list)):
+            resp = ''
+            ret_val = False
+            for daemon in daemons:
+                if daemon not in reply_cnt:
+                    continue
+                if idx >= len(replies[daemon]):
                     syslog.syslog(syslog.LOG_ERR, 'failed to get reply from frr daemon')
                     continue
-                else:
+                ret_code, reply = replies[daemon][idx]
+                if ret_code != 0:
                     syslog.syslog(syslog.LOG_DEBUG, '[%s] command return code: %d' % (daemon, ret_code))
                     syslog.syslog(syslog.LOG_DEBUG, reply)
-            else:
-                # command is running successfully by at least one daemon
-                ret_val = True
-            resp += reply
-        return (ret_val, resp)
+                else:
+                    # command is running successfully by at least one daemon
+                    ret_val = True
+                resp += reply
+            ret_list.append((ret_val, resp))
+        return ret_list
     def run_vtysh_command(self, table, command, daemons):
+        ret_list = self.run_vtysh_command_list(table, command, daemons)
+        return ret_list is not None and all(ret_list)
+    def run_vtysh_command_list(self, table, command, daemons):
+        # return success of each command given with -c and of the ending 'end' command
         if not command.startswith(self.VTYSH_MARK):
             syslog.syslog(syslog.LOG_ERR, 'command %s is not for vtysh config' % command)
-            return False
+            return None
         cmd_line = command[len(self.VTYSH_MARK):]
         cmd_list = re.findall(r"-c\s+'([^']+)'\s*", cmd_line)
         cmd_list.append('end')
@@ -285,14 +461,9 @@ class BgpdClientMgr(threading.Thread):
             daemons = self.__get_cmd_daemons(cmd_list)
         if daemons is None or len(daemons) == 0:
             syslog.syslog(syslog.LOG_ERR, 'no common daemon list found for given commands')
-            return False
-        ret_val = True
+            return None
         with self.lock:
-            for cmd in cmd_list:
-                succ, _ = self.__proc_command(cmd.strip(), daemons)
-                if not succ:
-                    ret_val = False
-        return ret_val
+            return [succ for succ, _ in self.__proc_command_list([cmd.strip() for cmd in cmd_list], daemons)]
     @staticmethod
     def __read_all(sock, data_len):
         in_buf = io.StringIO()
@@ -337,8 +508,8 @@ class BgpdClientMgr(threading.Thread):
                             daemons = self.__get_cmd_daemons(in_lines)
                         if daemons is not None and len(daemons) > 0:
                             with self.lock:
-                                for line in in_lines:
-                                    _, reply = self.__proc_command(line.strip(), daemons)
+                                replies = self.__proc_command_list([line.strip() for line in in_lines], daemons)
+                                for _, reply in replies:
                                     if reply is not None:
                                         self.__send_data(conn_sock, reply)
                                     else:
@@ -558,11 +729,81 @@ class BGPKeyMapList(list):
                     except ValueError:
                         pass
             super(BGPKeyMapList, self).append((db_field, BGPKeyMapInfo(cmd_str, hdl_func, hdl_data)))
+        # parsed DB field specification of each key map and index of key maps referring to each DB field
+        self.field_spec_list = []
+        self.field_index = {}
+        for map_idx, (db_field, _) in enumerate(self):
+            field_spec = self.compile_field_spec(db_field)
+            self.field_spec_list.append(field_spec)
+            for _, key_list in field_spec[1]:
+                for k in key_list:
+                    self.field_index.setdefault(k, []).append(map_idx)
     def __eq__(self, other):
         return super(BGPKeyMapList, self).__eq__(other) and self.table_name == other.table_name and self.table_key == other.table_key
     def __ne__(self, other):
         return super(BGPKeyMapList, self).__ne__(other) or self.table_name != other.table_name or self.table_key != other.table_key
     @staticmethod
+    def compile_field_spec(db_field):
+        merge_vals = False
+        if type(db_field) is not list and type(db_field) is not tuple:
+            db_field = [db_field]
+        elif type(db_field) is tuple:
+            db_field = list(db_field)
+            merge_vals = True
+        key_spec_list = []
+        req_idx_list = []
+        opt_idx_list = set()
+        for idx, dkey in enumerate(db_field):
+            optional = False
+            if len(dkey) > 0 and dkey[0] == '+':
+                if len(dkey) > 1 and dkey[1] == '+':
+                    opt_idx_list.add(idx)
+                    dkey = dkey[2:]
+                else:
+                    dkey = dkey[1:]
+                optional = True
+            else:
+                req_idx_list.append(idx)
+            key_spec_list.append((optional, dkey.split('&')))
+        return (merge_vals, key_spec_list, req_idx_list, opt_idx_list)
+    def get_changed_map_idx(self, data):
+        map_idx_set = set()
+        for k, dval in data.items():
+            if isinstance(dval, CachedDataWithOp) and dval.op != CachedDataWithOp.OP_NONE:
+                map_idx_set.update(self.field_index.get(k, []))
+        return sorted(map_idx_set)
+    @staticmethod
+    def run_command_batch(table, cmd_prefix, map_cmd_list, daemons):
+        # commands of all key maps are sent in one vtysh transaction, except those whose failure
+        # is ignored. Return success of each key map, computed from the results of its own commands
+        map_succ = [True] * len(map_cmd_list)
+        batch_cmds = []
+        batch_owners = []
+        cmd_list = [(map_idx, cmd) for map_idx, (cmds, _) in enumerate(map_cmd_list) for cmd in cmds]
+        for map_idx, cmd in cmd_list + [(None, None)]:
+            ignore_fail = False
+            if type(cmd) is tuple:
+                cmd, ignore_fail = cmd
+            if cmd is not None and not ignore_fail:
+                batch_cmds.append(cmd)
+                batch_owners.append(map_idx)
+                continue
+            if len(batch_cmds) > 0:
+                for owner, succ in zip(batch_owners, g_run_command_list(table, cmd_prefix, batch_cmds, daemons)):
+                    if not succ:
+                        map_succ[owner] = False
+                batch_cmds = []
+                batch_owners = []
+            if cmd is not None:
+                g_run_command(table, cmd_prefix + "-c '%s'" % cmd, True, daemons, True)
+        return map_succ
+    @staticmethod
+    def set_data_status(data, key_list_list):
+        for key_list in key_list_list:
+            for dkey in key_list:
+                if dkey in data:
+                    data[dkey].status = CachedDataWithOp.STAT_SUCC
+    @staticmethod
     def get_map_field_key(field):
         if type(field) is str:
             field = [field]
@@ -642,34 +883,18 @@ class BGPKeyMapList(list):
         return True
     def run_command(self, daemon, table, data, prefix_list=None, *upper_vals):
         start_idx = len(upper_vals)
-        ret_val = False
         run_cmd_cnt = 0
-        for db_field, key_map in self:
-            merge_vals = False
-            if type(db_field) is not list and type(db_field) is not tuple:
-                db_field = [db_field]
-            elif type(db_field) is tuple:
-                db_field = list(db_field)
-                merge_vals = True
-
-            idx = 0
-            req_idx_list = []
+        # commands of consecutive key maps for the same daemons: list of (daemons, [(command list, key list list)])
+        batch_list = []
+        for map_idx in self.get_changed_map_idx(data):
+            _, key_map = self[map_idx]
+            merge_vals, key_spec_list, req_idx_list, opt_idx_list = self.field_spec_list[map_idx]
+
             key_list_list = []
-            opt_idx_list = set()
             run_cmd = True
-            for dkey in db_field:
-                optional = False
-                if len(dkey) > 0 and dkey[0] == '+':
-                    if len(dkey) > 1 and dkey[1] == '+':
-                        opt_idx_list.add(idx)
-                        dkey = dkey[2:]
-                    else:
-                        dkey = dkey[1:]
-                    optional = True
-                else:
-                    req_idx_list.append(idx)
+            for optional, dkey_list in key_spec_list:
                 key_list = []
-                for k in dkey.split('&'):
+                for k in dkey_list:
                     if k in data and isinstance(data[k], CachedDataWithOp):
                         key_list.append(k)
                 if not optional and len(key_list) == 0:
@@ -695,7 +920,6 @@ class BGPKeyMapList(list):
                                     new_list.append(k_lst + [k])
                     if len(new_list) > 0:
                         key_list_list = new_list
-                idx += 1
             if not run_cmd:
                 continue
 
@@ -738,29 +962,25 @@ class BGPKeyMapList(list):
             for chk_list in cmd_list_list:
                if self.is_cmd_list_covered(cmd_list, chk_list):
                    cmd_list = chk_list
-            failed = False
             if len(cmd_list) > 0:
                 run_cmd_cnt += 1
-                cmd_prefix = 'vtysh '
-                for pfx in prefix_list:
-                    cmd_prefix += "-c '%s' " % pfx
-                for cmd in cmd_list:
-                    ignore_fail = False
-                    if type(cmd) is tuple:
-                        cmd, ignore_fail = cmd
-                    if not g_run_command(table, cmd_prefix + "-c '%s'" % cmd, True, key_map.daemons, ignore_fail):
-                        syslog.syslog(syslog.LOG_ERR, 'failed running FRR command: %s' % cmd)
-                        failed = True
-                        break
-                if not failed:
-                    ret_val = True
-            if not failed:
-                for key_list in key_list_list:
-                    for dkey in key_list:
-                        if dkey in data:
-                            data[dkey].status = CachedDataWithOp.STAT_SUCC
+                if len(batch_list) == 0 or batch_list[-1][0] != key_map.daemons:
+                    batch_list.append((key_map.daemons, []))
+                batch_list[-1][1].append((cmd_list, key_list_list))
+            else:
+                self.set_data_status(data, key_list_list)
         if run_cmd_cnt == 0:
             return True
+        cmd_prefix = 'vtysh '
+        for pfx in prefix_list:
+            cmd_prefix += "-c '%s' " % pfx
+        ret_val = False
+        for daemons, map_cmd_list in batch_list:
+            map_succ = self.run_command_batch(table, cmd_prefix, map_cmd_list, daemons)
+            for (_, key_list_list), succ in zip(map_cmd_list, map_succ):
+                if succ:
+                    ret_val = True
+                    self.set_data_status(data, key_list_list)
         return ret_val
 
 class CommandArgument(object):
@@ -1442,10 +1662,33 @@ def hdl_static_route(daemon, cmd_str, op, st_idx, args, data):
     return cmd_list
 
 class ExtConfigDBConnector(ConfigDBConnector):
+    # maximum number of keyspace notifications handled in one batch
+    SUB_BATCH_SIZE = 256
+    # interval in seconds of logging per-table event rates
+    SUB_STATS_INTERVAL = 300
+    # read hashes of all given keys in one round trip. runRedisScript returns the
+    # reply as a set of strings, so the hashes are returned as one JSON encoded
+    # string: a list with a field => value object per key
+    HGETALL_BATCH_SCRIPT = """
+local res = {}
+for i = 1, #KEYS do
+    local fv = redis.call('HGETALL', KEYS[i])
+    local entry = {}
+    for j = 1, #fv, 2 do
+        entry[fv[j]] = fv[j + 1]
+    end
+    res[i] = entry
+end
+return cjson.encode(res)
+"""
     def __init__(self, ns_attrs = None):
         super(ExtConfigDBConnector, self).__init__()
         self.nosort_attrs = ns_attrs if ns_attrs is not None else {}
         self.__listen_thread_running = False
+        # table name => [total events, events since last report]
+        self.sub_stats = {}
+        self.sub_stats_time = time.time()
+        self.hgetall_batch_sha = None
     def raw_to_typed(self, raw_data, table = ''):
         if len(raw_data) == 0:
             raw_data = None
@@ -1456,31 +1699,101 @@ class ExtConfigDBConnector(ConfigDBConnector):
             if type(val) is list and key not in self.nosort_attrs.get(table, set()):
                 val.sort()
         return data
-    def sub_msg_handler(self, msg_item):
-        if msg_item['type'] == 'pmessage':
-            key = msg_item['channel'].split(':', 1)[1]
+    def get_sub_key_space(self):
+        """Keyspace patterns of the handled tables, so that updates of other tables are not delivered at all"""
+        db_id = self.get_dbid(self.db_name)
+        return ['__keyspace@{}__:{}{}*'.format(db_id, table, self.TABLE_NAME_SEPARATOR) for table in sorted(self.handlers)]
+    def get_msg_table_key(self, msg_item):
+        if msg_item['type'] != 'pmessage':
+            return None
+        key = msg_item['channel'].split(':', 1)[1]
+        try:
+            (table, row) = key.split(self.TABLE_NAME_SEPARATOR, 1)
+        except ValueError:
+            return None    #Ignore non table-formated redis entries
+        if table not in self.handlers:
+            return None
+        return (table, row, key)
+    def get_entries(self, key_list):
+        """Read hash entries of all keys in one round trip with a lua script"""
+        if len(key_list) == 0:
+            return []
+        client = self.get_redis_client(self.db_name)
+        try:
+            if self.hgetall_batch_sha is None:
+                self.hgetall_batch_sha = loadRedisScript(client, self.HGETALL_BATCH_SCRIPT)
+            reply = runRedisScript(client, self.hgetall_batch_sha, key_list, [])
+        except Exception:
+            # script cache is lost if redis was restarted, load it again
+            self.hgetall_batch_sha = loadRedisScript(client, self.HGETALL_BATCH_SCRIPT)
+            reply = runRedisScript(client, self.hgetall_batch_sha, key_list, [])
+        # an empty lua table, like the hash of a missing key, is encoded as {}
+        return json.loads(next(iter(reply)))
+    def update_sub_stats(self, table):
+        stats = self.sub_stats.setdefault(table, [0, 0])
+        stats[0] += 1
+        stats[1] += 1
+    def log_sub_stats(self, force = False):
+        now = time.time()
+        elapsed = now - self.sub_stats_time
+        if not force and elapsed < self.SUB_STATS_INTERVAL:
+            return
+        for table, stats in sorted(self.sub_stats.items()):
+            if stats[1] == 0:
+                continue
+            syslog.syslog(syslog.LOG_INFO, '[bgp cfgd] table {} events {} rate {:.2f}/s'.format(
+                          table, stats[0], stats[1] / max(elapsed, 1e-6)))
+            stats[1] = 0
+        self.sub_stats_time = now
+    def sub_msg_batch_handler(self, msg_list):
+        # notifications of the same key are merged, entry is read once with its latest content
+        pending = {}
+        for msg_item in msg_list:
+            table_key = self.get_msg_table_key(msg_item)
+            if table_key is None:
+                continue
+            table, row, key = table_key
+            self.update_sub_stats(table)
+            pending.setdefault(key, (table, row))
+        if len(pending) == 0:
+            return
+        try:
+            raw_data_list = self.get_entries(list(pending))
+        except Exception as e:
+            syslog.syslog(syslog.LOG_ERR, '[bgp cfgd] Failed reading config DB update with exception:' + str(e))
+            logging.exception(e)
+            return
+        for (table, row), raw_data in zip(pending.values(), raw_data_list):
             try:
-                (table, row) = key.split(self.TABLE_NAME_SEPARATOR, 1)
-                if table in self.handlers:
-                    client = self.get_redis_client(self.db_name)
-                    data = self.raw_to_typed(client.hgetall(key), table)
-                    super(ExtConfigDBConnector, self)._ConfigDBConnector__fire(table, row, data)
-            except ValueError:
-                pass    #Ignore non table-formated redis entries
+                data = self.raw_to_typed(raw_data, table)
+                super(ExtConfigDBConnector, self)._ConfigDBConnector__fire(table, row, data)
             except Exception as e:
                 syslog.syslog(syslog.LOG_ERR, '[bgp cfgd] Failed handling config DB update with exception:' + str(e))
                 logging.exception(e)
+    def sub_msg_handler(self, msg_item):
+        self.sub_msg_batch_handler([msg_item])
 
     def listen_thread(self, timeout):
         self.__listen_thread_running = True
-        sub_key_space = "__keyspace@{}__:*".format(self.get_dbid(self.db_name))
-        self.pubsub.psubscribe(sub_key_space)
+        sub_key_space = self.get_sub_key_space()
+        for key_space in sub_key_space:
+            self.pubsub.psubscribe(key_space)
         while self.__listen_thread_running:
             msg = self.pubsub.get_message(timeout, True)
             if msg:
-                self.sub_msg_handler(msg)
+                # drain the burst of notifications already queued, without blocking
+                msg_list = [msg]
+                while len(msg_list) < self.SUB_BATCH_SIZE:
+                    msg = self.pubsub.get_message(0, True)
+                    if not msg:
+                        break
+                    msg_list.append(msg)
+                self.sub_msg_batch_handler(msg_list)
+            self.log_sub_stats()
 
-        self.pubsub.punsubscribe(sub_key_space)
+        for key_space in sub_key_space:
+            self.pubsub.punsubscribe(key_space)
+        self.log_sub_stats(True)
 
     def listen(self):
         """Start listen Redis keyspace events and will trigger corresponding handlers when content of a table changes.
@@ -2264,8 +2577,12 @@ class BGPConfigDaemon:
             ('IGMP_INTERFACE', self.bgp_table_handler_common),
             ('IGMP_INTERFACE_QUERY', self.bgp_table_handler_common)
         ]
+        # key map lists are compiled once for each table and table key
+        self.key_map_cache = {}
+        for table in self.tbl_to_key_map:
+            self.get_key_map(table)
         self.bgp_message = queue.Queue(0)
-        self.table_data_cache = self.config_db.get_table_data([tbl for tbl, _ in self.table_handler_list])
+        self.table_data_cache = TableDataCache(self.config_db.get_table_data([tbl for tbl, _ in self.table_handler_list]))
         syslog.syslog(syslog.LOG_DEBUG, 'Init Cached DB data')
         for key, entry in self.table_data_cache.items():
             syslog.syslog(syslog.LOG_DEBUG, '  %-20s : %s' % (key, entry))
@@ -2284,6 +2601,14 @@ class BGPConfigDaemon:
                         table_key = ExtConfigDBConnector.get_table_key(table1, key1)
                         self.__update_cache_data(table_key, data1)
 
+    def get_key_map(self, table, tbl_key = None):
+        cache_key = (table, None if tbl_key is None else tuple(sorted(tbl_key.items())))
+        key_map = self.key_map_cache.get(cache_key, None)
+        if key_map is None:
+            key_map = BGPKeyMapList(self.tbl_to_key_map[table], table, tbl_key)
+            self.key_map_cache[cache_key] = key_map
+        return key_map
+
     def subscribe_all(self):
         for table, hdlr in self.table_handler_list:
             self.config_db.subscribe(table, hdlr)
@@ -2608,7 +2933,7 @@ class BGPConfigDaemon:
                     if new_key is not None:
                         key = new_key
                         tbl_key = {'ip_prefix': ('ipv4' if af_id == socket.AF_INET else 'ipv6')}
-                key_map = BGPKeyMapList(self.tbl_to_key_map[table], table, tbl_key)
+                key_map = self.get_key_map(table, tbl_key)
             else:
                 key_map = None
             if table == 'BGP_GLOBALS':
@@ -3701,7 +4026,7 @@ class BGPConfigDaemon:
 
 
     def __add_op_to_data(self, table_key, data, comb_attr_list):
-        cached_data = self.table_data_cache.setdefault(table_key, {})
+        cached_data = self.table_data_cache.get_row(table_key)
         for key in cached_data:
             if key in data:
                 # both in cache and data, update/none
@@ -3735,7 +4060,9 @@ class BGPConfigDaemon:
                     data.pop(key, None)
 
     def __update_cache_data(self, table_key, data):
-        cached_data = self.table_data_cache.setdefault(table_key, {})
+        cached_data = self.table_data_cache.get_row(table_key)
+        upd_data = {}
+        del_keys = set()
         for key, val in data.items():
             if not isinstance(val, CachedDataWithOp) or val.op == CachedDataWithOp.OP_NONE or val.status == CachedDataWithOp.STAT_FAIL:
                 syslog.syslog(syslog.LOG_DEBUG, 'ignore cache update for %s because of %s%s%s' %
@@ -3744,14 +4071,29 @@ class BGPConfigDaemon:
                               ('STAT_FAIL ' if isinstance(val, CachedDataWithOp) and val.status == CachedDataWithOp.STAT_FAIL else '')))
                 continue
             if val.op == CachedDataWithOp.OP_ADD or val.op == CachedDataWithOp.OP_UPDATE:
-                cached_data[key] = val.data
-                syslog.syslog(syslog.LOG_INFO, 'Add {} data {} to cache'.format(key, cached_data[key]))
+                upd_data[key] = val.data
+                del_keys.discard(key)
+                syslog.syslog(syslog.LOG_INFO, 'Add {} data {} to cache'.format(key, val.data))
             elif val.op == CachedDataWithOp.OP_DELETE:
                 syslog.syslog(syslog.LOG_INFO, 'delete {} data {} from cache'.format(key, cached_data.get(key, '')))
-                cached_data.pop(key, None)
+                upd_data.pop(key, None)
+                del_keys.add(key)
+        if len(upd_data) == 0 and len(del_keys) == 0 and table_key in self.table_data_cache:
+            return
+        cached_data = cached_data.update_row(upd_data, del_keys)
         if len(cached_data) == 0:
             syslog.syslog(syslog.LOG_INFO, 'delete table row {} from cache'.format(table_key))
-            del(self.table_data_cache[table_key])
+            self.table_data_cache.pop(table_key, None)
+        else:
+            self.table_data_cache[table_key] = cached_data
+
+    def log_cache_usage(self):
+        usage = self.table_data_cache.get_mem_usage()
+        syslog.syslog(syslog.LOG_INFO, '[bgp cfgd] table data cache: {} rows, {} field sets, {} bytes '
+                      '(index {} rows {} fields {} values {})'.format(usage['rows'], usage['field_sets'], usage['total_bytes'],
+                      usage['index_bytes'], usage['row_bytes'], usage['field_bytes'], usage['value_bytes']))
+        for table, rows in sorted(self.table_data_cache.get_table_rows().items()):
+            syslog.syslog(syslog.LOG_INFO, '[bgp cfgd]   %-40s : %d rows' % (table, rows))
 
 
     def bgp_table_handler_common(self, table, key, data, comb_attr_list = []):
@@ -3813,10 +4155,18 @@ def sig_handler(signum, frame):
     syslog.syslog(syslog.LOG_DEBUG, 'entering signal handler')
     main_loop = False
 
+dump_cache = False
+
+def dump_cache_handler(signum, frame):
+    global dump_cache
+    dump_cache = True
+
 def main():
-    global bgpd_client
+    global bgpd_client, dump_cache
     for sig_num in [signal.SIGTERM, signal.SIGINT]:
         signal.signal(sig_num, sig_handler)
+    # kill -USR1 to log memory usage of the table data cache and FRR command latency
+    signal.signal(signal.SIGUSR1, dump_cache_handler)
     syslog.syslog(syslog.LOG_DEBUG, 'entering BGP configuration daemon')
     bgpd_client = BgpdClientMgr()
     bgpd_client.start()
@@ -3824,6 +4174,10 @@ def main():
     daemon.start()
     while main_loop:
         signal.pause()
+        if dump_cache:
+            dump_cache = False
+            daemon.log_cache_usage()
+            bgpd_client.log_latency()
     syslog.syslog(syslog.LOG_DEBUG, 'leaving BGP configuration daemon')
     bgpd_client.shutdown()
     daemon.stop()
@@ -0,0 +1,75 @@
+import os
+import subprocess
+import sys
+import time
+from unittest.mock import MagicMock, NonCallableMagicMock, patch
+
+swsscommon_module_mock = MagicMock(ConfigDBConnector = NonCallableMagicMock)
+# because can’t use dotted names directly in a call, have to create a dictionary and unpack it using **:
+mockmapping = {'swsscommon.swsscommon': swsscommon_module_mock}
+
+with patch.dict('sys.modules', **mockmapping):
+    from frrcfgd.frrcfgd import CachedTableRow
+    from frrcfgd.frrcfgd import TableDataCache
+
+def test_cached_row():
+    row = CachedTableRow({'action': 'permit', 'community_member': ['100:1', '100:2']})
+    assert(len(row) == 2)
+    assert('action' in row)
+    assert('seq' not in row)
+    assert(row['action'] == 'permit')
+    assert(row['community_member'] == ['100:1', '100:2'])
+    assert(row.get('seq', '') == '')
+    assert(dict(row.items()) == {'action': 'permit', 'community_member': ['100:1', '100:2']})
+    new_row = row.update_row({'seq': '10'}, {'community_member'})
+    assert(dict(new_row) == {'action': 'permit', 'seq': '10'})
+    assert(dict(row) == {'action': 'permit', 'community_member': ['100:1', '100:2']})
+    assert(len(row.update_row({}, {'action', 'community_member'})) == 0)
+
+def test_cached_row_sharing():
+    row1 = CachedTableRow({'action': 'permit', 'name': 'set_' + str(1)})
+    row2 = CachedTableRow({'name': 'set_' + str(1), 'action': 'permit'})
+    assert(row1.fields is row2.fields)
+    assert(row1.values[1] is row2.values[1])
+
+def test_cache_mem_usage():
+    cache = TableDataCache({'PREFIX&&set1|10': {'action': 'permit'},
+                            'PREFIX&&set1|20': {'action': 'permit'},
+                            'ROUTE_MAP&&map1|10': {'route_operation': 'permit', 'set_med': '100'}})
+    assert(isinstance(cache['PREFIX&&set1|10'], CachedTableRow))
+    assert(cache.get_row('PREFIX&&set2|10') == {})
+    assert(cache.get_table_rows() == {'PREFIX': 2, 'ROUTE_MAP': 1})
+    usage = cache.get_mem_usage()
+    assert(usage['rows'] == 3)
+    assert(usage['field_sets'] == 2)
+    assert(usage['total_bytes'] == usage['index_bytes'] + usage['row_bytes'] + usage['field_bytes'] + usage['value_bytes'])
+
+
+def get_rss():
+    with open('/proc/self/statm') as fp:
+        return int(fp.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+
+def benchmark(count, cache_type):
+    """ Measure memory of the table data cache holding prefix-set entries, as filled by table updates """
+    cache = {} if cache_type == 'dict' else TableDataCache()
+    row_type = dict if cache_type == 'dict' else CachedTableRow
+    rss = get_rss()
+    start = time.time()
+    for i in range(count):
+        pfx_set = 'PFX_SET_%d' % (i // 1000)
+        pfx = '10.%d.%d.0/24' % (i // 256 % 256, i % 256)
+        table_key = 'PREFIX&&%s|%d|%s|24..32' % (pfx_set, i % 1000 + 1, pfx)
+        cache[table_key] = row_type({'action': 'permit' if i % 10 else 'deny'})
+    elapsed = time.time() - start
+    print('%-8s %7d entries: RSS +%6.1f MB, filled in %.2f s' %
+          (cache_type, count, (get_rss() - rss) / 2.0**20, elapsed))
+
+
+if __name__ == '__main__':
+    count = sys.argv[1] if len(sys.argv) > 1 else '100000'
+    if len(sys.argv) > 2:
+        benchmark(int(count), sys.argv[2])
+    else:
+        # each cache type is measured in its own process, so that RSS is not affected by freed memory
+        for cache_type in ['dict', 'compact']:
+            subprocess.call([sys.executable, '-m', 'tests.test_cache', count, cache_type])
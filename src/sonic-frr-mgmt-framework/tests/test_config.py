@@ -1,4 +1,5 @@
 import copy
+import json
 import re
 from unittest.mock import MagicMock, NonCallableMagicMock, patch
 
@@ -10,15 +11,91 @@ mockmapping = {'swsscommon.swsscommon': swsscommon_module_mock}
 def test_contructor():
     from frrcfgd.frrcfgd import BGPConfigDaemon
     daemon = BGPConfigDaemon()
+    daemon.config_db.handlers = {}
+    daemon.config_db.subscribe.side_effect = lambda table, hdlr: daemon.config_db.handlers.update({table: hdlr})
+    daemon.config_db.TABLE_NAME_SEPARATOR = '|'
+    daemon.config_db.get_dbid.return_value = 4
     daemon.start()
     for table, hdlr in daemon.table_handler_list:
         daemon.config_db.subscribe.assert_any_call(table, hdlr)
-    daemon.config_db.pubsub.psubscribe.assert_called_once()
     assert(daemon.config_db.sub_thread.is_alive() == True)
     daemon.stop()
-    daemon.config_db.pubsub.punsubscribe.assert_called_once()
+    for table, _ in daemon.table_handler_list:
+        daemon.config_db.pubsub.psubscribe.assert_any_call('__keyspace@4__:%s|*' % table)
+        daemon.config_db.pubsub.punsubscribe.assert_any_call('__keyspace@4__:%s|*' % table)
+    assert(daemon.config_db.pubsub.psubscribe.call_count == len(daemon.table_handler_list))
     assert(daemon.config_db.sub_thread.is_alive() == False)
 
+class FakeDBConnector:
+    """Redis client of swsscommon: no pipeline, lua scripts are run with runRedisScript,
+    which returns the strings of the script reply as a std::set, i.e. sorted and deduplicated"""
+    def __init__(self, db):
+        self.db = db
+        self.scripts = {}
+        self.script_calls = []
+        self.hgetall_calls = 0
+    def hgetall(self, key):
+        self.hgetall_calls += 1
+        return dict(self.db.get(key, {}))
+    def load_script(self, client, script):
+        assert(client is self)
+        sha = 'sha%d' % len(self.scripts)
+        self.scripts[sha] = script
+        return sha
+    def run_script(self, client, sha, keys, argv):
+        assert(client is self)
+        if sha not in self.scripts:
+            raise RuntimeError('NOSCRIPT No matching script')
+        self.script_calls.append(list(keys))
+        return set([json.dumps([self.db.get(key, {}) for key in keys])])
+
+@patch.dict('sys.modules', **mockmapping)
+def test_get_entries():
+    from frrcfgd.frrcfgd import ExtConfigDBConnector
+    config_db = ExtConfigDBConnector()
+    client = FakeDBConnector({'BGP_NEIGHBOR|default|10.0.0.1': {'asn': '200', 'name': 'peer'},
+                              'BGP_NEIGHBOR|default|10.0.0.2': {'asn': '200', 'name': 'peer'},
+                              'BGP_GLOBALS|default': {}, 'BGP_GLOBALS|Vrf_red': {'local_asn': '300'}})
+    config_db.get_redis_client.return_value = client
+    keys = ['BGP_NEIGHBOR|default|10.0.0.1', 'BGP_NEIGHBOR|default|10.0.0.2', 'BGP_GLOBALS|default', 'BGP_GLOBALS|Vrf_red']
+    with patch('frrcfgd.frrcfgd.loadRedisScript', side_effect = client.load_script), \
+         patch('frrcfgd.frrcfgd.runRedisScript', side_effect = client.run_script):
+        # repeated values of different keys are kept
+        assert(config_db.get_entries(keys) == [{'asn': '200', 'name': 'peer'}, {'asn': '200', 'name': 'peer'},
+                                               {}, {'local_asn': '300'}])
+        # script is loaded again after redis restart
+        client.scripts.clear()
+        assert(config_db.get_entries(keys[3:]) == [{'local_asn': '300'}])
+        assert(config_db.get_entries([]) == [])
+    assert(client.script_calls == [keys, keys[3:]])
+    assert(client.hgetall_calls == 0)
+
+@patch.dict('sys.modules', **mockmapping)
+def test_sub_msg_batch():
+    from frrcfgd.frrcfgd import ExtConfigDBConnector
+    config_db = ExtConfigDBConnector()
+    config_db.TABLE_NAME_SEPARATOR = '|'
+    config_db.handlers = {'BGP_NEIGHBOR': None, 'BGP_GLOBALS': None}
+    config_db.raw_to_typed = lambda raw_data, table = '': raw_data
+    client = FakeDBConnector({'BGP_NEIGHBOR|default|10.0.0.1': {'asn': '200'},
+                              'BGP_GLOBALS|default': {'local_asn': '100'}})
+    config_db.get_redis_client.return_value = client
+    fired = []
+    with patch.object(ExtConfigDBConnector.__mro__[1], '_ConfigDBConnector__fire', create = True,
+                      side_effect = lambda table, row, data: fired.append((table, row, data))), \
+         patch('frrcfgd.frrcfgd.loadRedisScript', side_effect = client.load_script), \
+         patch('frrcfgd.frrcfgd.runRedisScript', side_effect = client.run_script):
+        msg = lambda key: {'type': 'pmessage', 'channel': '__keyspace@4__:' + key, 'data': 'hset'}
+        config_db.sub_msg_batch_handler([msg('BGP_NEIGHBOR|default|10.0.0.1'), msg('BGP_GLOBALS|default'),
+                                         msg('PORT|Ethernet0'), msg('BGP_NEIGHBOR|default|10.0.0.1'),
+                                         {'type': 'psubscribe', 'channel': '__keyspace@4__:*', 'data': 1}])
+    assert(client.script_calls == [['BGP_NEIGHBOR|default|10.0.0.1', 'BGP_GLOBALS|default']])
+    assert(client.hgetall_calls == 0)
+    assert(fired == [('BGP_NEIGHBOR', 'default|10.0.0.1', {'asn': '200'}), ('BGP_GLOBALS', 'default', {'local_asn': '100'})])
+    assert(config_db.sub_stats == {'BGP_NEIGHBOR': [2, 2], 'BGP_GLOBALS': [1, 1]})
+    config_db.log_sub_stats(True)
+    assert(config_db.sub_stats == {'BGP_NEIGHBOR': [2, 0], 'BGP_GLOBALS': [1, 0]})
+
 class CmdMapTestInfo:
     data_buf = {}
     def __init__(self, table, key, data, exp_cmd, no_del = False, neg_cmd = None,
@@ -78,11 +155,13 @@ class CmdMapTestInfo:
                                         True, self.daemons, self.ignore_tail)
 
 def hdl_confed_peers_cmd(is_del, cmd_list, chk_data):
+    # commands of one update could be sent in a single vtysh call
+    cmd_list = [cmd for cmdline in cmd_list for cmd in re.findall(r"-c\s+'([^']+)'\s*", cmdline)
+                if 'bgp confederation peers ' in cmd]
     assert(len(chk_data) >= len(cmd_list))
     if is_del:
         chk_data = list(reversed(chk_data))
-    for idx, cmd in enumerate(cmd_list):
-        last_cmd = re.findall(r"-c\s+'([^']+)'\s*", cmd)[-1]
+    for idx, last_cmd in enumerate(cmd_list):
         neg_cmd = False
         if last_cmd.startswith('no '):
             neg_cmd = True
@@ -1,4 +1,6 @@
 import socket
+import threading
+import time
 import pytest
 from unittest.mock import MagicMock, NonCallableMagicMock, patch
 
@@ -18,6 +20,7 @@ with patch.dict('sys.modules', **mockmapping):
     from frrcfgd.frrcfgd import AggregateAddr
     from frrcfgd.frrcfgd import IpNextHop
     from frrcfgd.frrcfgd import IpNextHopSet
+    from frrcfgd.frrcfgd import BgpdClientMgr
 
 def test_data_with_op():
     data = CachedDataWithOp()
@@ -83,6 +86,56 @@ def test_command_map_list():
     for idx, cmd_map in enumerate(cmd_map_list):
         assert(chk_map_list[idx] == cmd_map[1])
 
+@patch.dict('sys.modules', **mockmapping)
+@patch('frrcfgd.frrcfgd.g_run_command', return_value = True)
+def test_command_map_dispatch(run_cmd):
+    from frrcfgd.frrcfgd import BGPKeyMapList, CachedDataWithOp
+    map_list = [('abc', '{no:no-prefix}set attribute {}'),
+                (['+xyz&uvw', 'defg'], 'set {} with {}'),
+                ('ipv4', '[zebra]ip test {}'),
+                ('abc', 'show attribute {}', lambda d, c, o, i, v, b: [(c.format(*v), True)], None)]
+    cmd_map_list = BGPKeyMapList(map_list, 'frrcfg')
+    assert(cmd_map_list.field_index == {'abc': [0, 3], 'xyz': [1], 'uvw': [1], 'defg': [1], 'ipv4': [2]})
+    data = {'abc': CachedDataWithOp('10', CachedDataWithOp.OP_ADD),
+            'defg': CachedDataWithOp('20', CachedDataWithOp.OP_NONE),
+            'uvw': CachedDataWithOp('30', CachedDataWithOp.OP_UPDATE),
+            'ipv4': CachedDataWithOp('1.1.1.1', CachedDataWithOp.OP_NONE)}
+    assert(cmd_map_list.get_changed_map_idx(data) == [0, 1, 3])
+    assert(cmd_map_list.run_command(None, 'frrcfg', data, ['configure terminal']))
+    assert(run_cmd.call_args_list == [
+        (('frrcfg', "vtysh -c 'configure terminal' -c 'set attribute 10' -c 'set 30 with 20'", True, None, False),),
+        (('frrcfg', "vtysh -c 'configure terminal' -c 'show attribute 10'", True, None, True),)])
+    assert(data['abc'].status == CachedDataWithOp.STAT_SUCC)
+    assert(data['uvw'].status == CachedDataWithOp.STAT_SUCC)
+    assert(data['ipv4'].status == CachedDataWithOp.STAT_FAIL)
+
+@patch.dict('sys.modules', **mockmapping)
+def test_command_map_batch_partial_fail():
+    import frrcfgd.frrcfgd as frrcfgd
+    from frrcfgd.frrcfgd import BGPKeyMapList, CachedDataWithOp
+    map_list = [('abc', 'set attribute {}'),
+                ('xyz', 'set other {}')]
+    cmd_map_list = BGPKeyMapList(map_list, 'frrcfg')
+    data = {'abc': CachedDataWithOp('10', CachedDataWithOp.OP_ADD),
+            'xyz': CachedDataWithOp('20', CachedDataWithOp.OP_ADD)}
+    bgpd_client = MagicMock()
+    # configure terminal, set attribute 10, set other 20, end
+    bgpd_client.run_vtysh_command_list.return_value = [True, True, False, True]
+    with patch.object(frrcfgd, 'bgpd_client', bgpd_client):
+        assert(cmd_map_list.run_command(None, 'frrcfg', data, ['configure terminal']))
+    bgpd_client.run_vtysh_command_list.assert_called_once_with(
+        'frrcfg', "vtysh -c 'configure terminal' -c 'set attribute 10' -c 'set other 20'", None)
+    assert(data['abc'].status == CachedDataWithOp.STAT_SUCC)
+    assert(data['xyz'].status == CachedDataWithOp.STAT_FAIL)
+    # failure of prefix command fails all key maps
+    data = {'abc': CachedDataWithOp('10', CachedDataWithOp.OP_ADD),
+            'xyz': CachedDataWithOp('20', CachedDataWithOp.OP_ADD)}
+    bgpd_client.run_vtysh_command_list.return_value = [False, True, True, True]
+    with patch.object(frrcfgd, 'bgpd_client', bgpd_client):
+        assert(not cmd_map_list.run_command(None, 'frrcfg', data, ['configure terminal']))
+    assert(data['abc'].status == CachedDataWithOp.STAT_FAIL)
+    assert(data['xyz'].status == CachedDataWithOp.STAT_FAIL)
+
 def test_community_list():
     for ext in [False, True]:
         comm_list = CommunityList('comm', ext)
@@ -234,3 +287,68 @@ def test_nexthop_set():
             test_set.add(IpNextHop(af, bkh_list[idx], ip_list[idx] if af == socket.AF_INET else ip6_list[idx],
                                    None, intf_list[idx], tag_list[idx], None, vrf_list[idx]))
         assert(nh_set == test_set)
+
+def fake_frr_daemon(sock, cmd_log):
+    rd_buf = b''
+    while True:
+        data = sock.recv(4096)
+        if not data:
+            break
+        rd_buf += data
+        while b'\0' in rd_buf:
+            cmd, rd_buf = rd_buf.split(b'\0', 1)
+            cmd_log.append(cmd.decode())
+            if cmd.startswith(b'slow'):
+                time.sleep(0.2)
+            reply = b'out:' + cmd + b'\0\0\0' + (b'\x01' if cmd.startswith(b'bad') else b'\x00')
+            # reply in small pieces to check reading of split replies
+            for idx in range(0, len(reply), 3):
+                sock.sendall(reply[idx:idx + 3])
+    sock.close()
+
+def test_bgpd_client_pipeline():
+    client = BgpdClientMgr.__new__(BgpdClientMgr)
+    client.lock = threading.Lock()
+    client.client_socks = {}
+    client.latency_hist = {}
+    cmd_logs = {}
+    threads = []
+    for daemon in ['bgpd', 'zebra']:
+        client_sock, daemon_sock = socket.socketpair()
+        client.client_socks[daemon] = client_sock
+        cmd_logs[daemon] = []
+        threads.append(threading.Thread(target = fake_frr_daemon, args = (daemon_sock, cmd_logs[daemon])))
+        threads[-1].start()
+    client.rd_bufs = {daemon: bytearray() for daemon in client.client_socks}
+    replies = client._BgpdClientMgr__proc_command_list(['configure terminal', 'bad command', 'end'], ['bgpd', 'zebra'])
+    assert(replies == [(True, 'out:configure terminal' * 2), (False, 'out:bad command' * 2), (True, 'out:end' * 2)])
+    assert(client.run_vtysh_command('ROUTE_MAP', "vtysh -c 'configure terminal' -c 'route-map test permit 10'", ['bgpd', 'zebra']))
+    assert(not client.run_vtysh_command('ROUTE_MAP', "vtysh -c 'configure terminal' -c 'bad map'", ['bgpd']))
+    for sock in client.client_socks.values():
+        sock.close()
+    for thread in threads:
+        thread.join()
+    assert(cmd_logs['bgpd'] == ['configure terminal', 'bad command', 'end', 'configure terminal', 'route-map test permit 10', 'end',
+                                'configure terminal', 'bad map', 'end'])
+    assert(cmd_logs['zebra'] == ['configure terminal', 'bad command', 'end', 'configure terminal', 'route-map test permit 10', 'end'])
+    assert(sum(client.latency_hist['bgpd']) == 9)
+    assert(sum(client.latency_hist['zebra']) == 6)
+
+def test_bgpd_client_latency():
+    client = BgpdClientMgr.__new__(BgpdClientMgr)
+    client.lock = threading.Lock()
+    client_sock, daemon_sock = socket.socketpair()
+    client.client_socks = {'bgpd': client_sock}
+    client.rd_bufs = {'bgpd': bytearray()}
+    client.latency_hist = {}
+    cmd_log = []
+    thread = threading.Thread(target = fake_frr_daemon, args = (daemon_sock, cmd_log))
+    thread.start()
+    replies = client._BgpdClientMgr__proc_command_list(['slow command', 'end', 'end'], ['bgpd'])
+    client_sock.close()
+    thread.join()
+    assert(replies == [(True, 'out:slow command'), (True, 'out:end'), (True, 'out:end')])
+    # commands queued behind the slow one are not counted as slow
+    slow_idx = BgpdClientMgr.LATENCY_BUCKETS.index(0.1) + 1
+    assert(client.latency_hist['bgpd'][slow_idx] == 1)
+    assert(sum(client.latency_hist['bgpd'][:slow_idx]) == 2)
@@ -8,6 +8,7 @@ from packaging import version
 sonic_dependencies = ['redis-dump-load']
 
 dependencies = [
+    'jinja2>=2.10',
     'natsort',
     'pyyaml',
 ]
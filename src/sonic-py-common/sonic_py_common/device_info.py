@@ -5,6 +5,7 @@ import os
 import random
 import re
 import subprocess
+import threading
 import yaml
 from natsort import natsorted
 from sonic_py_common.general import getstatusoutput_noshell_pipe
@@ -55,12 +56,133 @@ DPU_NAME_PREFIX = "dpu"
 sonic_ver_info = {}
 hw_info_dict = {}
 
+# Device facts which don't change while the process is running (contents of machine.conf,
+# asic.conf, paths of platform files). Values of None are not cached
+_device_fact_cache = {}
+
+
+def _get_cached_fact(key, loader):
+    try:
+        return _device_fact_cache[key]
+    except KeyError:
+        pass
+    value = loader()
+    if value is not None:
+        _device_fact_cache[key] = value
+    return value
+
+
+class _LocalhostInfoCache(object):
+    """
+    Cache of the DEVICE_METADATA|localhost entry of CONFIG_DB
+
+    The CONFIG_DB connection is opened on the first call and kept for the
+    lifetime of the process. From the second call on, a second connection
+    subscribes to keyspace notifications of the entry, and the entry is read
+    again only after a notification reports a change of it. A process calling
+    once, e.g. a CLI command, thus doesn't set up the subscription. Without
+    keyspace notifications the entry is read on every call. Callers which must
+    not keep connections open pass their own config_db to get_localhost_info().
+    """
+    # Notifications read at most per call. More pending ones are taken as a change
+    MAX_DRAINED_MESSAGES = 64
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.pid = None
+        self.config_db = None
+        self.client = None
+        self.key = None
+        self.subscribed = False
+        self.pubsub = None
+        self.metadata = None
+
+    def _connect(self):
+        config_db = ConfigDBConnector()
+        config_db.connect()
+        self.config_db = config_db
+        # Connections can't be shared with a forked child process
+        self.pid = os.getpid()
+
+    def _subscribe(self):
+        self.subscribed = True
+        config_db = self.config_db
+        try:
+            self.client = config_db.get_redis_client(config_db.db_name)
+            self.key = 'DEVICE_METADATA{}localhost'.format(config_db.TABLE_NAME_SEPARATOR)
+            pubsub = self.client.pubsub()
+            pubsub.psubscribe('__keyspace@{}__:{}'.format(config_db.get_dbid(config_db.db_name), self.key))
+            self.pubsub = pubsub
+        except Exception:
+            self.pubsub = None
+
+    def _is_changed(self):
+        if self.pubsub is None:
+            return True
+        # Round trip to redis first: notifications of writes which completed before
+        # this call are then already sent to the subscription connection
+        self.client.exists(self.key)
+        changed = False
+        for _ in range(self.MAX_DRAINED_MESSAGES):
+            msg = self.pubsub.get_message()
+            if not msg:
+                return changed
+            if msg.get('type') == 'pmessage':
+                changed = True
+        return True
+
+    def get(self):
+        """
+        Retrieves the DEVICE_METADATA|localhost entry
+
+        Returns:
+            A dictionary of the entry fields, None if CONFIG_DB can't be read
+        """
+        with self.lock:
+            try:
+                if self.config_db is None or self.pid != os.getpid():
+                    self.reset()
+                    self._connect()
+                elif not self.subscribed:
+                    self._subscribe()
+                    # Changes made before the subscription were not notified
+                    self.metadata = None
+                if self.metadata is None or self._is_changed():
+                    self.metadata = self.config_db.get_table('DEVICE_METADATA').get('localhost', {})
+                return self.metadata
+            except Exception:
+                self.reset()
+                return None
+
+
+_localhost_info_cache = _LocalhostInfoCache()
+
+
+def invalidate_cache():
+    """
+    Drops all cached device information, so that it is read again by the next calls.
+    Needed after the files describing the device were changed in place, e.g. by tests
+    """
+    global sonic_ver_info
+
+    _device_fact_cache.clear()
+    sonic_ver_info = {}
+    hw_info_dict.clear()
+    with _localhost_info_cache.lock:
+        _localhost_info_cache.reset()
+
+
 def get_localhost_info(field, config_db=None):
     try:
         # TODO: enforce caller to provide config_db explicitly and remove its default value
         if not config_db:
-            config_db = ConfigDBConnector()
-            config_db.connect()
+            localhost = _localhost_info_cache.get()
+            if localhost is not None:
+                return localhost.get(field)
+            return None
 
         metadata = config_db.get_table('DEVICE_METADATA')
 
@@ -84,6 +206,10 @@ def get_machine_info():
         A dictionary containing the key/value pairs as found in the machine
         configuration file
     """
+    return _get_cached_fact(('machine_info', MACHINE_CONF_PATH), _read_machine_info)
+
+
+def _read_machine_info():
     if not os.path.isfile(MACHINE_CONF_PATH):
         return None
 
@@ -176,6 +302,10 @@ def get_asic_conf_file_path():
         A string containing the path to the ASIC configuration file on success,
         None on failure
     """
+    return _get_cached_fact('asic_conf_file_path', _find_asic_conf_file)
+
+
+def _find_asic_conf_file():
     def asic_conf_path_candidates():
         yield os.path.join(CONTAINER_PLATFORM_PATH, ASIC_CONF_FILENAME)
 
@@ -411,6 +541,11 @@ def get_path_to_port_config_file(hwsku=None, asic=None):
     if not platform:
         return None
 
+    key = ('port_config_file', platform, hwsku if hwsku else get_hwsku(), asic)
+    return _get_cached_fact(key, lambda: _find_port_config_file(hwsku, asic))
+
+
+def _find_port_config_file(hwsku, asic):
     if hwsku:
         platform_path = get_path_to_platform_dir()
         hwsku_path = os.path.join(platform_path, hwsku)
@@ -453,13 +588,13 @@ def get_path_to_port_config_file(hwsku=None, asic=None):
     return None
 
 def get_sonic_version_info():
-    if not os.path.isfile(SONIC_VERSION_YAML_PATH):
-        return None
-
     global sonic_ver_info
     if sonic_ver_info:
         return sonic_ver_info
 
+    if not os.path.isfile(SONIC_VERSION_YAML_PATH):
+        return None
+
     with open(SONIC_VERSION_YAML_PATH) as stream:
         if yaml.__version__ >= "5.1":
             sonic_ver_info = yaml.full_load(stream)
@@ -547,6 +682,10 @@ def get_num_npus():
     asic_conf_file_path = get_asic_conf_file_path()
     if asic_conf_file_path is None:
         return 1
+    return _get_cached_fact(('num_npus', asic_conf_file_path), lambda: _read_num_npus(asic_conf_file_path))
+
+
+def _read_num_npus(asic_conf_file_path):
     with open(asic_conf_file_path) as asic_conf_file:
         for line in asic_conf_file:
             tokens = line.split('=')
@@ -5,7 +5,7 @@ import subprocess
 from natsort import natsorted
 from swsscommon import swsscommon
 
-from .device_info import get_asic_conf_file_path
+from .device_info import get_asic_conf_file_path, get_num_npus
 from .device_info import is_supervisor, is_chassis
 from .interface import inband_prefix, backplane_prefix, recirc_prefix, front_panel_prefix
 
@@ -88,19 +88,7 @@ def get_num_asics():
     Returns:
         Num of asics
     """
-    asic_conf_file_path = get_asic_conf_file_path()
-
-    if asic_conf_file_path is None:
-        return 1
-
-    with open(asic_conf_file_path) as asic_conf_file:
-        for line in asic_conf_file:
-            tokens = line.split('=')
-            if len(tokens) < 2:
-                continue
-            if tokens[0].lower() == 'num_asic':
-                num_asics = tokens[1].strip()
-        return int(num_asics)
+    return get_num_npus()
 
 
 def is_multi_asic():
@@ -0,0 +1,92 @@
+"""
+Jinja2 environments with a persistent template bytecode cache.
+
+Templates rendered through these environments are compiled once and the
+resulting bytecode is kept in BYTECODE_CACHE_DIR, so later processes
+(sonic-cfggen invocations, bgpcfgd restarts) load it instead of lexing
+and compiling the template source again. The cache can be filled at
+image build time with precompile_templates().
+"""
+
+import hashlib
+import os
+
+import jinja2
+
+TEMPLATE_DIR = '/usr/share/sonic/templates'
+BYTECODE_CACHE_DIR = '/var/cache/sonic/jinja2'
+
+
+class BytecodeCache(jinja2.FileSystemBytecodeCache):
+    """
+    FileSystemBytecodeCache which falls back to compiling the template
+    when the cache directory can not be read or written
+    """
+    def load_bytecode(self, bucket):
+        try:
+            super(BytecodeCache, self).load_bytecode(bucket)
+        except (OSError, IOError, EOFError, ValueError):
+            bucket.reset()
+
+    def dump_bytecode(self, bucket):
+        try:
+            super(BytecodeCache, self).dump_bytecode(bucket)
+        except (OSError, IOError):
+            pass
+
+
+def get_bytecode_cache(cache_dir=BYTECODE_CACHE_DIR, options=None):
+    """
+    Return the bytecode cache stored in cache_dir, or None if cache_dir
+    can not be used.
+
+    Jinja2 keys cached bytecode only by template name and source, while
+    environment options such as trim_blocks change the generated code.
+    The options are therefore part of the cache file names, so
+    environments created with different options never share bytecode.
+    """
+    if not cache_dir:
+        return None
+    try:
+        if not os.path.isdir(cache_dir):
+            os.makedirs(cache_dir)
+    except OSError:
+        return None
+    if not os.access(cache_dir, os.R_OK | os.W_OK | os.X_OK):
+        return None
+
+    options_tag = hashlib.sha1(repr(sorted((options or {}).items())).encode()).hexdigest()[:12]
+    return BytecodeCache(cache_dir, '__jinja2_%s_' + options_tag + '.cache')
+
+
+def create_environment(paths, filters=None, cache_dir=BYTECODE_CACHE_DIR, **options):
+    """
+    Create a jinja2 Environment loading templates from the paths list.
+
+    filters -- dictionary of additional filters
+    cache_dir -- bytecode cache directory, None to disable the cache
+    options -- other jinja2.Environment keyword arguments
+    """
+    env = jinja2.Environment(loader=jinja2.FileSystemLoader(paths),
+                             bytecode_cache=get_bytecode_cache(cache_dir, options),
+                             **options)
+    if filters:
+        env.filters.update(filters)
+    return env
+
+
+def precompile_templates(env, extensions=('j2',)):
+    """
+    Compile every template the environment's loader can find, which
+    stores its bytecode in the environment's cache.
+
+    Returns a list of (template name, error) of the templates which
+    failed to compile.
+    """
+    failed = []
+    for name in env.list_templates(extensions=extensions):
+        try:
+            env.get_template(name)
+        except (jinja2.TemplateError, UnicodeDecodeError) as e:
+            failed.append((name, e))
+    return failed
@@ -0,0 +1,113 @@
+"""
+Microbenchmark of device_info calls, with warm cache and with the cache invalidated before each call
+
+    python -m tests.device_info_benchmark [iterations]
+
+Device files are created in a temporary directory and CONFIG_DB is replaced by an in-memory fake,
+so the uncached numbers don't include redis round trips of a real device.
+"""
+import os
+import sys
+import tempfile
+import timeit
+
+if sys.version_info.major == 3:
+    from unittest import mock
+else:
+    import mock
+
+from sonic_py_common import device_info
+
+PLATFORM = 'x86_64-mlnx_msn2700-r0'
+HWSKU = 'Mellanox-SN2700'
+
+
+class FakePubSub(object):
+    def psubscribe(self, pattern):
+        pass
+
+    def get_message(self):
+        return None
+
+
+class FakeRedisClient(object):
+    def exists(self, key):
+        return True
+
+    def pubsub(self):
+        return FakePubSub()
+
+
+class FakeConfigDBConnector(object):
+    db_name = 'CONFIG_DB'
+    TABLE_NAME_SEPARATOR = '|'
+
+    def connect(self):
+        pass
+
+    def get_dbid(self, db_name):
+        return 4
+
+    def get_table(self, table):
+        return {'localhost': {'hwsku': HWSKU, 'hostname': 'sonic'}}
+
+    def get_redis_client(self, db_name):
+        return FakeRedisClient()
+
+
+def create_device_files(root):
+    machine_conf = os.path.join(root, 'machine.conf')
+    with open(machine_conf, 'w') as f:
+        f.write('onie_machine=mlnx_msn2700\nonie_platform={}\n'.format(PLATFORM))
+    version_yml = os.path.join(root, 'sonic_version.yml')
+    with open(version_yml, 'w') as f:
+        f.write("build_version: 'test'\nasic_type: mellanox\n")
+    device_path = os.path.join(root, 'device')
+    hwsku_path = os.path.join(device_path, PLATFORM, HWSKU)
+    os.makedirs(hwsku_path)
+    with open(os.path.join(device_path, PLATFORM, 'asic.conf'), 'w') as f:
+        f.write('NUM_ASIC=1\n')
+    with open(os.path.join(hwsku_path, 'port_config.ini'), 'w') as f:
+        f.write('# name lanes\nEthernet0 0,1,2,3\n')
+    return machine_conf, version_yml, device_path
+
+
+def run(iterations):
+    calls = [
+        ('get_platform', device_info.get_platform),
+        ('get_hwsku', device_info.get_hwsku),
+        ('get_machine_info', device_info.get_machine_info),
+        ('get_sonic_version_info', device_info.get_sonic_version_info),
+        ('get_path_to_port_config_file', device_info.get_path_to_port_config_file),
+        ('get_num_npus', device_info.get_num_npus),
+        ('is_multi_npu', device_info.is_multi_npu),
+    ]
+    print('{:<32}{:>14}{:>14}'.format('function', 'cached ns', 'uncached ns'))
+    for name, func in calls:
+        device_info.invalidate_cache()
+        func()
+        cached = timeit.timeit(func, number=iterations) / iterations
+
+        def uncached_call():
+            device_info.invalidate_cache()
+            func()
+        uncached = timeit.timeit(uncached_call, number=iterations) / iterations
+        print('{:<32}{:>14.0f}{:>14.0f}'.format(name, cached * 1e9, uncached * 1e9))
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    root = tempfile.mkdtemp()
+    machine_conf, version_yml, device_path = create_device_files(root)
+    with mock.patch.dict(os.environ, {}, clear=True), \
+            mock.patch.object(device_info, 'MACHINE_CONF_PATH', machine_conf), \
+            mock.patch.object(device_info, 'SONIC_VERSION_YAML_PATH', version_yml), \
+            mock.patch.object(device_info, 'HOST_DEVICE_PATH', device_path), \
+            mock.patch.object(device_info, 'CONTAINER_PLATFORM_PATH', os.path.join(root, 'platform')), \
+            mock.patch.object(device_info, 'ConfigDBConnector', FakeConfigDBConnector):
+        run(iterations)
+    device_info.invalidate_cache()
+
+
+if __name__ == '__main__':
+    main()
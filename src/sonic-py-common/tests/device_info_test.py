@@ -86,6 +86,13 @@ class TestDeviceInfo(object):
         with mock.patch.dict(os.environ, {}, clear=True):
             yield
 
+    @pytest.fixture(autouse=True)
+    def clear_device_info_cache(self):
+        # Results of one test must not be served from the cache to another one
+        device_info.invalidate_cache()
+        yield
+        device_info.invalidate_cache()
+
     def test_get_machine_info(self):
         with mock.patch("os.path.isfile") as mock_isfile:
             mock_isfile.return_value = True
@@ -162,6 +169,130 @@ class TestDeviceInfo(object):
         assert mock_hwsku.called_once()
         mock_cfg_inst.get_table.assert_called_once_with("DEVICE_METADATA")
 
+    def test_get_machine_info_cached(self):
+        with mock.patch("os.path.isfile") as mock_isfile:
+            mock_isfile.return_value = True
+            open_mocked = mock.mock_open(read_data=MACHINE_CONF_CONTENTS)
+            with mock.patch("{}.open".format(BUILTINS), open_mocked):
+                for _ in range(0, 5):
+                    assert device_info.get_machine_info() == EXPECTED_GET_MACHINE_INFO_RESULT
+                    assert device_info.get_platform() == "x86_64-mlnx_msn2700-r0"
+                open_mocked.assert_called_once_with("/host/machine.conf")
+                device_info.invalidate_cache()
+                assert device_info.get_machine_info() == EXPECTED_GET_MACHINE_INFO_RESULT
+                assert open_mocked.call_count == 2
+
+    def test_get_machine_info_missing_not_cached(self):
+        with mock.patch("os.path.isfile") as mock_isfile:
+            mock_isfile.return_value = False
+            assert device_info.get_machine_info() is None
+            mock_isfile.return_value = True
+            open_mocked = mock.mock_open(read_data=MACHINE_CONF_CONTENTS)
+            with mock.patch("{}.open".format(BUILTINS), open_mocked):
+                assert device_info.get_machine_info() == EXPECTED_GET_MACHINE_INFO_RESULT
+
+    @mock.patch("sonic_py_common.device_info.get_asic_conf_file_path")
+    def test_get_num_npus_cached(self, mock_asic_conf_path):
+        mock_asic_conf_path.return_value = "/usr/share/sonic/platform/asic.conf"
+        open_mocked = mock.mock_open(read_data="NUM_ASIC=3\nDEV_ID_ASIC_0=03:00.0\n")
+        with mock.patch("{}.open".format(BUILTINS), open_mocked):
+            for _ in range(0, 5):
+                assert device_info.get_num_npus() == 3
+                assert device_info.is_multi_npu()
+        open_mocked.assert_called_once_with("/usr/share/sonic/platform/asic.conf")
+
+    @mock.patch("sonic_py_common.device_info.get_asic_conf_file_path")
+    def test_get_num_npus_fallback_not_cached(self, mock_asic_conf_path):
+        mock_asic_conf_path.return_value = None
+        assert device_info.get_num_npus() == 1
+        mock_asic_conf_path.return_value = "/usr/share/sonic/platform/asic.conf"
+        open_mocked = mock.mock_open(read_data="NUM_ASIC=2\n")
+        with mock.patch("{}.open".format(BUILTINS), open_mocked):
+            assert device_info.get_num_npus() == 2
+
+    @mock.patch("sonic_py_common.device_info.ConfigDBConnector")
+    def test_get_localhost_info_notification_drain_bounded(self, mock_cfg_db):
+        mock_cfg_inst = mock_cfg_db.return_value
+        mock_cfg_inst.get_table.return_value = {"localhost": {"hwsku": "Mellanox-SN2700"}}
+        # A mocked pubsub always has a message
+        pubsub = mock_cfg_inst.get_redis_client.return_value.pubsub.return_value
+        for _ in range(0, 4):
+            assert device_info.get_hwsku() == "Mellanox-SN2700"
+        # Notifications are read from the third call on, after the subscription
+        assert pubsub.get_message.call_count == 2 * device_info._LocalhostInfoCache.MAX_DRAINED_MESSAGES
+        assert mock_cfg_inst.get_table.call_count == 4
+
+    @mock.patch("sonic_py_common.device_info.ConfigDBConnector")
+    def test_get_localhost_info_cached(self, mock_cfg_db):
+        mock_cfg_inst = mock_cfg_db.return_value
+        mock_cfg_inst.db_name = "CONFIG_DB"
+        mock_cfg_inst.TABLE_NAME_SEPARATOR = "|"
+        mock_cfg_inst.get_dbid.return_value = 4
+        mock_cfg_inst.get_table.return_value = {"localhost": {"hwsku": "Mellanox-SN2700", "hostname": "sonic"}}
+        client = mock_cfg_inst.get_redis_client.return_value
+        pubsub = client.pubsub.return_value
+        pubsub.get_message.return_value = None
+        for _ in range(0, 5):
+            assert device_info.get_hwsku() == "Mellanox-SN2700"
+            assert device_info.get_hostname() == "sonic"
+        mock_cfg_db.assert_called_once()
+        # Read by the first call, and again after subscribing by the second one
+        mock_cfg_inst.get_table.assert_called_with("DEVICE_METADATA")
+        assert mock_cfg_inst.get_table.call_count == 2
+        pubsub.psubscribe.assert_called_once_with("__keyspace@4__:DEVICE_METADATA|localhost")
+        client.exists.assert_called_with("DEVICE_METADATA|localhost")
+
+        # DEVICE_METADATA|localhost is read again after a change of it
+        mock_cfg_inst.get_table.return_value = {"localhost": {"hwsku": "Mellanox-SN3800", "hostname": "sonic"}}
+        pubsub.get_message.side_effect = [{"type": "pmessage", "data": "hset"}, None]
+        assert device_info.get_hwsku() == "Mellanox-SN3800"
+        pubsub.get_message.side_effect = None
+        assert device_info.get_hwsku() == "Mellanox-SN3800"
+        assert mock_cfg_inst.get_table.call_count == 3
+
+        # Connection failure is not cached
+        mock_cfg_inst.get_table.side_effect = Exception("connection lost")
+        pubsub.get_message.side_effect = [{"type": "pmessage", "data": "hset"}, None]
+        assert device_info.get_hwsku() is None
+        mock_cfg_inst.get_table.side_effect = None
+        pubsub.get_message.side_effect = None
+        assert device_info.get_hwsku() == "Mellanox-SN3800"
+        assert mock_cfg_db.call_count == 2
+
+    @mock.patch("sonic_py_common.device_info.ConfigDBConnector")
+    def test_get_localhost_info_single_call(self, mock_cfg_db):
+        mock_cfg_inst = mock_cfg_db.return_value
+        mock_cfg_inst.get_table.return_value = {"localhost": {"hwsku": "Mellanox-SN2700"}}
+        assert device_info.get_hwsku() == "Mellanox-SN2700"
+        mock_cfg_inst.get_redis_client.assert_not_called()
+
+    @mock.patch("sonic_py_common.device_info.ConfigDBConnector")
+    def test_get_localhost_info_notification_in_flight(self, mock_cfg_db):
+        # Notifications become readable by the subscription only after a later round trip to redis
+        in_flight = []
+        readable = []
+        mock_cfg_inst = mock_cfg_db.return_value
+        mock_cfg_inst.get_table.return_value = {"localhost": {"hwsku": "Mellanox-SN2700"}}
+        client = mock_cfg_inst.get_redis_client.return_value
+        client.exists.side_effect = lambda key: readable.extend(in_flight) or in_flight.clear()
+        client.pubsub.return_value.get_message.side_effect = lambda: readable.pop(0) if readable else None
+        for _ in range(0, 3):
+            assert device_info.get_hwsku() == "Mellanox-SN2700"
+
+        mock_cfg_inst.get_table.return_value = {"localhost": {"hwsku": "Mellanox-SN3800"}}
+        in_flight.append({"type": "pmessage", "data": "hset"})
+        assert device_info.get_hwsku() == "Mellanox-SN3800"
+
+    @mock.patch("sonic_py_common.device_info.ConfigDBConnector")
+    def test_get_localhost_info_without_notification(self, mock_cfg_db):
+        mock_cfg_inst = mock_cfg_db.return_value
+        mock_cfg_inst.get_redis_client.side_effect = Exception("no pubsub")
+        mock_cfg_inst.get_table.return_value = {"localhost": {"hwsku": "Mellanox-SN2700"}}
+        for _ in range(0, 3):
+            assert device_info.get_hwsku() == "Mellanox-SN2700"
+        mock_cfg_db.assert_called_once()
+        assert mock_cfg_inst.get_table.call_count == 3
+
     @classmethod
     def teardown_class(cls):
         print("TEARDOWN")
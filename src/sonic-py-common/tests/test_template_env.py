@@ -0,0 +1,52 @@
+import os
+
+from sonic_py_common import template_env
+
+
+def write_templates(template_dir):
+    (template_dir / 'a.j2').write_text(u'{% for i in items %}\n{{ i | double }}\n{% endfor %}\n')
+    (template_dir / 'broken.j2').write_text(u'{% if %}\n')
+
+
+def test_create_environment(tmp_path):
+    template_dir = tmp_path / 'templates'
+    cache_dir = tmp_path / 'cache'
+    template_dir.mkdir()
+    write_templates(template_dir)
+
+    env = template_env.create_environment([str(template_dir)], filters={'double': lambda x: x * 2},
+                                          cache_dir=str(cache_dir), trim_blocks=True)
+    assert env.get_template('a.j2').render(items=[1, 2]) == '2\n4\n'
+    assert len(os.listdir(str(cache_dir))) == 1
+
+    # A new environment loads the cached bytecode and renders the same
+    env = template_env.create_environment([str(template_dir)], filters={'double': lambda x: x * 2},
+                                          cache_dir=str(cache_dir), trim_blocks=True)
+    assert env.get_template('a.j2').render(items=[1, 2]) == '2\n4\n'
+    assert len(os.listdir(str(cache_dir))) == 1
+
+    # Different options never share bytecode
+    env = template_env.create_environment([str(template_dir)], filters={'double': lambda x: x * 2},
+                                          cache_dir=str(cache_dir), trim_blocks=False)
+    assert env.get_template('a.j2').render(items=[1, 2]) == '\n2\n\n4\n'
+    assert len(os.listdir(str(cache_dir))) == 2
+
+
+def test_unusable_cache_dir(tmp_path):
+    cache_file = tmp_path / 'file'
+    cache_file.write_text(u'')
+    assert template_env.get_bytecode_cache(str(cache_file / 'cache')) is None
+    assert template_env.get_bytecode_cache(None) is None
+
+
+def test_precompile_templates(tmp_path):
+    template_dir = tmp_path / 'templates'
+    cache_dir = tmp_path / 'cache'
+    template_dir.mkdir()
+    write_templates(template_dir)
+
+    env = template_env.create_environment([str(template_dir)], filters={'double': lambda x: x * 2},
+                                          cache_dir=str(cache_dir))
+    failed = template_env.precompile_templates(env)
+    assert [name for name, _ in failed] == ['broken.j2']
+    assert len(os.listdir(str(cache_dir))) == 1